@@ -0,0 +1,168 @@
+import sqlite3
+
+import numpy as np
+
+STATUSES = ["Backlog", "Playing", "Completed"]
+BACKLOG, PLAYING, COMPLETED = range(len(STATUSES))
+
+# Default buckets (in days) for the backlog age distribution
+AGE_BUCKETS = [0, 30, 90, 180, 365, 730]
+
+
+# Comma separated tag column (genre / platform) factorized for vectorized grouping
+class TagIndex:
+    def __init__(self, values):
+        # Most rows share a handful of distinct strings, so only those get split
+        combos, self.row_combo = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+        self.combo_count = len(combos)
+        self.combo_ids = {combo: index for index, combo in enumerate(combos)}
+
+        tag_ids = {}
+        pair_combos = []
+        pair_tags = []
+        for combo_index, combo in enumerate(combos):
+            for tag in str(combo).split(","):
+                tag = tag.strip()
+                if tag:
+                    pair_combos.append(combo_index)
+                    pair_tags.append(tag_ids.setdefault(tag, len(tag_ids)))
+
+        self.names = list(tag_ids)
+        self.pair_combos = np.array(pair_combos, dtype=np.int64)
+        self.pair_tags = np.array(pair_tags, dtype=np.int64)
+
+    # Sum a per-row weight (or count rows) for every tag
+    def totals(self, weights=None):
+        per_combo = np.bincount(self.row_combo, weights=weights, minlength=self.combo_count)
+        per_tag = np.zeros(len(self.names), dtype=np.float64)
+        np.add.at(per_tag, self.pair_tags, per_combo[self.pair_combos])
+        return per_tag
+
+
+# Column arrays for the whole library, loaded once and shared by every metric
+class Library:
+    def __init__(self, ids, rating, playtime, year, status, age_days, genres, platforms):
+        self.ids = ids
+        self.rating = rating
+        self.playtime = playtime
+        self.year = year
+        self.status = status
+        self.age_days = age_days
+        self.genres = genres
+        self.platforms = platforms
+
+    def __len__(self):
+        return len(self.ids)
+
+
+# Load rating, playtime, release year, status and tags into NumPy arrays
+def load_library(db_path="games.db"):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Parsing and status coding happen inside SQLite so Python only sees numbers
+    cursor.execute("""SELECT id,
+                             COALESCE(rating, 0),
+                             COALESCE(playtime, 0),
+                             COALESCE(CAST(SUBSTR(release_date, 1, 4) AS INTEGER), 0),
+                             CASE status WHEN 'Backlog' THEN 0 WHEN 'Playing' THEN 1
+                                         WHEN 'Completed' THEN 2 ELSE -1 END,
+                             COALESCE(julianday('now') - julianday(date_added), -1)
+                      FROM games ORDER BY id""")
+    numeric = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 6)
+
+    cursor.execute("SELECT COALESCE(genre, ''), COALESCE(platform, '') FROM games ORDER BY id")
+    tags = cursor.fetchall()
+    conn.close()
+
+    genres = [row[0] for row in tags]
+    platforms = [row[1] for row in tags]
+
+    return Library(ids=numeric[:, 0].astype(np.int64),
+                   rating=numeric[:, 1],
+                   playtime=numeric[:, 2],
+                   year=numeric[:, 3].astype(np.int64),
+                   status=numeric[:, 4].astype(np.int8),
+                   age_days=numeric[:, 5],
+                   genres=TagIndex(genres),
+                   platforms=TagIndex(platforms))
+
+
+# Number of games per status, in STATUSES order
+def status_counts(library):
+    known = library.status[library.status >= 0]
+    return np.bincount(known, minlength=len(STATUSES))
+
+
+# Histogram of rated games (unrated games have rating 0)
+def rating_histogram(library, bins=10):
+    rated = library.rating[library.rating > 0]
+    return np.histogram(rated, bins=bins, range=(0.0, 5.0))
+
+
+# Games per release year, skipping rows without a parsable date
+def release_year_histogram(library):
+    years = library.year[library.year > 0]
+    return np.unique(years, return_counts=True)
+
+
+# Playtime percentiles over games that have been played at all
+def playtime_percentiles(library, percentiles=(25, 50, 75, 90, 99)):
+    played = library.playtime[library.playtime > 0]
+    if not len(played):
+        return dict.fromkeys(percentiles, 0.0)
+    return dict(zip(percentiles, np.percentile(played, percentiles)))
+
+
+# How long Backlog games have been waiting, bucketed by days since date_added
+def backlog_age_distribution(library, buckets=AGE_BUCKETS):
+    ages = library.age_days[(library.status == BACKLOG) & (library.age_days >= 0)]
+    edges = np.append(np.asarray(buckets, dtype=np.float64), np.inf)
+    counts, _ = np.histogram(ages, bins=edges)
+    return counts, edges
+
+
+# Per-tag totals and completion rates, sorted by number of games
+def completion_rates(tag_index, status):
+    totals = tag_index.totals()
+    completed = tag_index.totals((status == COMPLETED).astype(np.float64))
+    rates = np.divide(completed, totals, out=np.zeros_like(totals), where=totals > 0)
+
+    order = np.argsort(-totals, kind="stable")
+    return [(tag_index.names[i], int(totals[i]), int(completed[i]), float(rates[i])) for i in order]
+
+
+def genre_completion_rates(library):
+    return completion_rates(library.genres, library.status)
+
+
+def platform_completion_rates(library):
+    return completion_rates(library.platforms, library.status)
+
+
+# Id of the row with the highest value, or None for an empty library
+def top_id(library, column):
+    if not len(library):
+        return None
+    return int(library.ids[np.argmax(column)])
+
+
+# Every dashboard metric in one pass over the loaded arrays
+def summarize(library):
+    counts = status_counts(library)
+    rated = library.rating[library.rating > 0]
+
+    return {
+        "total": len(library),
+        "status_counts": dict(zip(STATUSES, counts.tolist())),
+        "total_playtime": float(library.playtime.sum()),
+        "average_rating": float(rated.mean()) if len(rated) else 0.0,
+        "top_rated_id": top_id(library, library.rating),
+        "most_played_id": top_id(library, library.playtime),
+        "rating_histogram": rating_histogram(library),
+        "release_years": release_year_histogram(library),
+        "playtime_percentiles": playtime_percentiles(library),
+        "backlog_age": backlog_age_distribution(library),
+        "genres": genre_completion_rates(library),
+        "platforms": platform_completion_rates(library),
+    }
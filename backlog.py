@@ -0,0 +1,177 @@
+import datetime
+import os
+
+import changelog
+import dedupe
+import image_store
+import rawg
+import refresh
+import sessions
+import summary
+
+# UI-free library operations shared by the Tk app (main.py) and the command line (cli.py)
+
+
+# A status filter reads only that status's rows, and save_game's name match
+# is a lookup. The list reads every matching row, so sorting them costs no
+# more than walking a (status, sort column) index, which would slow every
+# insert. Run query_plans.py after changing a query or these.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_games_rawg_id ON games (rawg_id)",
+    "CREATE INDEX IF NOT EXISTS idx_games_name_key ON games (LOWER(TRIM(name)))",
+    "CREATE INDEX IF NOT EXISTS idx_games_status ON games (status)",
+]
+
+
+# Database setup with expanded columns
+def init_db(conn):
+    cursor = conn.cursor()
+    cursor.execute('''CREATE TABLE IF NOT EXISTS games (
+                      id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      name TEXT,
+                      status TEXT,
+                      release_date TEXT,
+                      rating REAL,
+                      image_url TEXT,
+                      platform TEXT,
+                      genre TEXT,
+                      playtime INTEGER DEFAULT 0,
+                      notes TEXT,
+                      date_added TEXT,
+                      date_modified TEXT,
+                      rawg_id INTEGER,
+                      slug TEXT,
+                      name_key TEXT)''')
+
+    # Databases created before these columns existed get them added in place
+    existing_columns = {info[1] for info in cursor.execute("PRAGMA table_info(games)")}
+    for column, column_type in (("rawg_id", "INTEGER"), ("slug", "TEXT"), ("name_key", "TEXT")):
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE games ADD COLUMN {column} {column_type}")
+    for statement in INDEXES:
+        cursor.execute(statement)
+
+    dedupe.init_dedupe(conn)
+    sessions.init_sessions(conn)
+    changelog.init_changelog(conn)
+    image_store.init_images(conn)
+    refresh.init_refresh(conn)
+    summary.init_summary(conn)
+    conn.commit()
+
+
+# RAWG details for a name without asking the user: the exact match if there
+# is one, otherwise the best result. Returns None when nothing is found.
+def lookup_game(game_name, priority=rawg.INTERACTIVE):
+    games = rawg.search_games(game_name, priority=priority)
+    if not games:
+        return None
+    return rawg.parse_game(rawg.exact_match(games, game_name) or games[0])
+
+
+# Insert a game, or update the row with the same duplicate key, RAWG id or
+# name. Does not commit. Returns (game_id, created).
+def save_game(conn, game_data, status):
+    current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+    cursor = conn.cursor()
+
+    # Check if game already exists: first by the key the unique index enforces (normalized
+    # name and release year), since renaming any other row onto a taken key would fail;
+    # then by RAWG id, then by name (ignoring case). Separate index lookups: with OR,
+    # SQLite scans the table instead of using the indexes.
+    name_key = dedupe.name_key(game_data["name"])
+    cursor.execute(f"""SELECT id FROM (SELECT id, 2 AS priority FROM games WHERE name_key = ? AND {dedupe.YEAR_SQL} = ?
+                                       UNION ALL
+                                       SELECT id, 1 FROM games WHERE rawg_id = ?
+                                       UNION ALL
+                                       SELECT id, 0 FROM games WHERE LOWER(TRIM(name)) = LOWER(TRIM(?)))
+                       ORDER BY priority DESC LIMIT 1""",
+                   (name_key or None, dedupe.release_year(game_data["release_date"]), game_data["rawg_id"],
+                    game_data["name"]))
+    existing = cursor.fetchone()
+
+    if existing:
+        cursor.execute("""UPDATE games SET
+                        name = ?,
+                        name_key = ?,
+                        status = ?,
+                        release_date = ?,
+                        rating = ?,
+                        image_url = ?,
+                        platform = ?,
+                        genre = ?,
+                        rawg_id = ?,
+                        slug = ?,
+                        date_modified = ?
+                        WHERE id = ?""",
+                       (game_data["name"], name_key, status, game_data["release_date"], game_data["rating"],
+                        game_data["image_url"], game_data["platform"], game_data["genre"],
+                        game_data["rawg_id"], game_data["slug"], current_date, existing[0]))
+        return existing[0], False
+
+    cursor.execute("""INSERT INTO games
+                   (name, name_key, status, release_date, rating, image_url, platform, genre, rawg_id, slug,
+                    date_added, date_modified)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                   (game_data["name"], name_key, status, game_data["release_date"],
+                    game_data["rating"], game_data["image_url"], game_data["platform"],
+                    game_data["genre"], game_data["rawg_id"], game_data["slug"],
+                    current_date, current_date))
+    return cursor.lastrowid, True
+
+
+# Add a game known only by name, or set the status of the game that already
+# has that name (ignoring case, or by its normalized name) and leave its
+# details alone. Does not commit. Returns (game_id, created).
+def save_name(conn, name, status):
+    row = conn.execute("""SELECT id FROM (SELECT id, 1 AS priority FROM games WHERE LOWER(TRIM(name)) = LOWER(TRIM(?))
+                                         UNION ALL
+                                         SELECT id, 0 FROM games WHERE name_key = ?)
+                          ORDER BY priority DESC, id LIMIT 1""",
+                       (name, dedupe.name_key(name))).fetchone()
+    if row:
+        conn.execute("UPDATE games SET status = ?, date_modified = ? WHERE id = ?",
+                     (status, datetime.datetime.now().strftime("%Y-%m-%d"), row[0]))
+        return row[0], False
+
+    return save_game(conn, {"name": name, "release_date": "N/A", "rating": 0.0, "image_url": "", "platform": "",
+                            "genre": "", "rawg_id": None, "slug": None}, status)
+
+
+# Delete cover images whose game no longer exists; returns the number removed.
+# `cover_pack` is an optional cover_store.CoverStore to prune as well, and
+# `images` an image_store.ImageStore whose unreferenced blobs are collected.
+def prune_images(conn, image_dir="game_images", cover_pack=None, images=None):
+    game_ids = {str(row[0]) for row in conn.execute("SELECT id FROM games")}
+    removed = 0
+
+    if os.path.isdir(image_dir):
+        with os.scandir(image_dir) as entries:
+            for entry in entries:
+                game_id, extension = os.path.splitext(entry.name)
+                if extension == ".jpg" and game_id not in game_ids:
+                    os.remove(entry.path)
+                    removed += 1
+
+    if images:
+        removed += images.gc(conn)[0]
+
+    if cover_pack:
+        for key in cover_pack.keys():
+            if key not in game_ids and not key.startswith(image_store.PACK_PREFIX):
+                cover_pack.delete(key)
+                removed += 1
+        cover_pack.save_index()
+
+    return removed
+
+
+# Rebuild indexes, playtime rollups, the dashboard summary and cover reference
+# counts, and refresh the planner statistics
+def reindex(conn):
+    conn.execute("REINDEX")
+    sessions.rebuild_rollups(conn)
+    summary.rebuild_summary(conn)
+    image_store.rebuild_refs(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
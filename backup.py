@@ -0,0 +1,176 @@
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+BACKUP_DIR = "backups"
+BACKUP_PREFIX = "games-"
+
+
+# Copy a live database with the sqlite3 backup API. Copying `pages` pages per
+# step and sleeping between steps lets writers commit while the backup runs.
+def copy_database(source_path, target_path, pages=1024, sleep=0.005):
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target, pages=pages, sleep=sleep)
+    finally:
+        target.close()
+        source.close()
+
+
+# Raise ValueError unless path is an intact games database
+def check_integrity(path):
+    conn = sqlite3.connect(path)
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if result != "ok":
+            raise ValueError(f"Integrity check failed: {result}")
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'games'").fetchone():
+            raise ValueError("Backup does not contain a games table")
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"Not a valid database: {e}")
+    finally:
+        conn.close()
+
+
+# Backups in backup_dir, newest first
+def list_backups(backup_dir=BACKUP_DIR):
+    if not os.path.isdir(backup_dir):
+        return []
+    names = [name for name in os.listdir(backup_dir)
+             if name.startswith(BACKUP_PREFIX) and name.endswith((".db", ".db.gz"))]
+    return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+
+# Delete all but the newest `keep` backups
+def rotate_backups(backup_dir=BACKUP_DIR, keep=7):
+    removed = 0
+    for path in list_backups(backup_dir)[keep:]:
+        os.remove(path)
+        removed += 1
+    return removed
+
+
+# Take a timestamped backup of db_path, optionally gzip it, then rotate.
+# Returns the path of the new backup.
+def backup_database(db_path="games.db", backup_dir=BACKUP_DIR, compress=False, keep=7, pages=1024, sleep=0.005):
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    backup_path = os.path.join(backup_dir, f"{BACKUP_PREFIX}{stamp}.db")
+
+    # Write under a temporary name so a half-written backup is never listed
+    temp_path = backup_path + ".tmp"
+    copy_database(db_path, temp_path, pages, sleep)
+
+    if compress:
+        with open(temp_path, "rb") as source, gzip.open(backup_path + ".gz.tmp", "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.remove(temp_path)
+        temp_path = backup_path + ".gz.tmp"
+        backup_path += ".gz"
+
+    os.replace(temp_path, backup_path)
+    rotate_backups(backup_dir, keep)
+    return backup_path
+
+
+# Verify a backup, then copy it over db_path. The backup API writes into the
+# live database, so connections other parts of the app hold stay valid.
+def restore_backup(backup_path, db_path="games.db"):
+    temp_dir = None
+    source_path = backup_path
+    try:
+        if backup_path.endswith(".gz"):
+            temp_dir = tempfile.mkdtemp()
+            source_path = os.path.join(temp_dir, "restore.db")
+            with gzip.open(backup_path, "rb") as source, open(source_path, "wb") as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+
+        check_integrity(source_path)
+        copy_database(source_path, db_path, pages=-1, sleep=0)
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Takes a backup every `interval_hours` on a daemon thread
+class BackupScheduler:
+    def __init__(self, db_path="games.db", interval_hours=24, backup_dir=BACKUP_DIR, compress=True, keep=7):
+        self.db_path = db_path
+        self.interval = interval_hours * 3600
+        self.backup_dir = backup_dir
+        self.compress = compress
+        self.keep = keep
+        self.stopped = threading.Event()
+        self.thread = None
+
+    # Seconds until the next backup is due, based on the newest existing one
+    def _next_delay(self):
+        backups = list_backups(self.backup_dir)
+        if not backups:
+            return 0
+        age = time.time() - os.path.getmtime(backups[0])
+        return max(0, self.interval - age)
+
+    def _run(self):
+        while not self.stopped.wait(self._next_delay()):
+            try:
+                backup_database(self.db_path, self.backup_dir, self.compress, self.keep)
+            except Exception as e:
+                print(f"Error creating backup: {e}")
+                self.stopped.wait(60)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+
+# Time backups of a synthetic library: python backup.py [rows]
+def benchmark(rows=1_000_000):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(temp_dir, "games.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute('''CREATE TABLE games (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, status TEXT, release_date TEXT,
+                        rating REAL, image_url TEXT, platform TEXT, genre TEXT, playtime INTEGER DEFAULT 0,
+                        notes TEXT, date_added TEXT, date_modified TEXT)''')
+        statuses = ["Backlog", "Playing", "Completed"]
+        conn.executemany("""INSERT INTO games (name, status, release_date, rating, image_url, platform, genre,
+                                               playtime, notes, date_added, date_modified)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                         ((f"Game {i}", statuses[i % 3], f"{2000 + i % 25}-01-01", (i % 50) / 10,
+                           f"https://media.rawg.io/media/games/{i}.jpg", "PC, PlayStation 5", "Action, RPG",
+                           i % 200, "", "2024-01-01", "2024-01-01") for i in range(rows)))
+        conn.commit()
+        conn.close()
+        size_mb = os.path.getsize(db_path) / 1024 / 1024
+        print(f"{rows} rows, {size_mb:.1f} MB")
+
+        for pages, compress in ((-1, False), (1024, False), (1024, True)):
+            backup_dir = os.path.join(temp_dir, f"backups-{pages}-{compress}")
+            start = time.perf_counter()
+            backup_path = backup_database(db_path, backup_dir, compress=compress, pages=pages, sleep=0)
+            elapsed = time.perf_counter() - start
+            print(f"pages={pages:>5} compress={compress!s:<5} {elapsed:7.2f}s "
+                  f"{os.path.getsize(backup_path) / 1024 / 1024:8.1f} MB")
+
+        start = time.perf_counter()
+        restore_backup(backup_path, os.path.join(temp_dir, "restored.db"))
+        print(f"restore (with integrity check) {time.perf_counter() - start:7.2f}s")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
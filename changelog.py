@@ -0,0 +1,135 @@
+import csv
+import datetime
+import json
+
+import dedupe
+from transfer import EXPORT_COLUMNS
+
+# Every insert, update and delete on games is appended to game_changes with a
+# monotonically increasing seq and a millisecond timestamp. A checkpoint is
+# simply the last seq a target has seen.
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS game_changes (
+       seq INTEGER PRIMARY KEY AUTOINCREMENT,
+       game_id INTEGER NOT NULL,
+       op TEXT NOT NULL,
+       changed_at TEXT NOT NULL DEFAULT (STRFTIME('%Y-%m-%dT%H:%M:%f', 'now')))''',
+    '''CREATE TABLE IF NOT EXISTS export_checkpoints (
+       target TEXT PRIMARY KEY,
+       seq INTEGER NOT NULL,
+       exported_at TEXT)''',
+    '''CREATE TRIGGER IF NOT EXISTS games_log_insert AFTER INSERT ON games
+       BEGIN
+           INSERT INTO game_changes (game_id, op) VALUES (NEW.id, 'I');
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS games_log_update AFTER UPDATE ON games
+       BEGIN
+           INSERT INTO game_changes (game_id, op) VALUES (NEW.id, 'U');
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS games_log_delete AFTER DELETE ON games
+       BEGIN
+           INSERT INTO game_changes (game_id, op) VALUES (OLD.id, 'D');
+       END''',
+]
+
+
+# Create the change log, checkpoint table and triggers on an open connection
+def init_changelog(conn):
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+# Latest seq handed out; AUTOINCREMENT keeps it monotonic even after prune()
+def current_checkpoint(conn):
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'game_changes'").fetchone()
+    return row[0] if row else 0
+
+
+def get_checkpoint(conn, target="default"):
+    row = conn.execute("SELECT seq FROM export_checkpoints WHERE target = ?", (target,)).fetchone()
+    return row[0] if row else 0
+
+
+def save_checkpoint(conn, seq, target="default"):
+    with conn:
+        conn.execute("""INSERT INTO export_checkpoints (target, seq, exported_at) VALUES (?, ?, ?)
+                        ON CONFLICT (target) DO UPDATE SET seq = excluded.seq, exported_at = excluded.exported_at""",
+                     (target, seq, datetime.datetime.now().isoformat(timespec="seconds")))
+
+
+# Net change per game since a checkpoint, up to `until`: yields ("upsert", row_dict)
+# for rows that exist now and ("delete", {"id": game_id}) for rows that are gone
+def changes_since(conn, since, until):
+    cursor = conn.execute(f"""SELECT changed.game_id, {', '.join('g.' + column for column in EXPORT_COLUMNS)}
+                              FROM (SELECT DISTINCT game_id FROM game_changes WHERE seq > ? AND seq <= ?) AS changed
+                              LEFT JOIN games AS g ON g.id = changed.game_id
+                              ORDER BY changed.game_id""", (since, until))
+    for game_id, *row in cursor:
+        if row[0] is None:
+            yield "delete", {"id": game_id}
+        else:
+            yield "upsert", dict(zip(EXPORT_COLUMNS, row))
+
+
+# Write the rows inserted, updated or deleted since the target's last export.
+# JSON Lines by default, CSV with an extra "op" column for .csv paths.
+# Returns (number of changes, new checkpoint).
+def export_delta(conn, file_path, target="default", since=None):
+    since = get_checkpoint(conn, target) if since is None else since
+    until = current_checkpoint(conn)
+
+    count = 0
+    if file_path.lower().endswith(".csv"):
+        with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["op"] + EXPORT_COLUMNS)
+            for op, record in changes_since(conn, since, until):
+                writer.writerow([op] + [record.get(column) for column in EXPORT_COLUMNS])
+                count += 1
+    else:
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"op": "checkpoint", "since": since, "until": until}) + "\n")
+            for op, record in changes_since(conn, since, until):
+                file.write(json.dumps({"op": op, **record}, ensure_ascii=False) + "\n")
+                count += 1
+
+    save_checkpoint(conn, until, target)
+    return count, until
+
+
+# Replay a JSON Lines delta onto another copy of the library (device sync).
+# Upserts update the existing row in place rather than REPLACE it: the row
+# REPLACE deletes fires no DELETE trigger, so game_summary would count it twice.
+def apply_delta(conn, file_path):
+    columns = EXPORT_COLUMNS + ["name_key"]
+    placeholders = ", ".join("?" * len(columns))
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "id")
+    applied = 0
+
+    with conn, open(file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            op = record.pop("op")
+
+            if op == "upsert":
+                record["name_key"] = dedupe.name_key(record.get("name"))
+                conn.execute(f"""INSERT INTO games ({', '.join(columns)}) VALUES ({placeholders})
+                                 ON CONFLICT (id) DO UPDATE SET {updates}""",
+                             [record.get(column) for column in columns])
+                applied += 1
+            elif op == "delete":
+                conn.execute("DELETE FROM games WHERE id = ?", (record["id"],))
+                applied += 1
+
+    return applied
+
+
+# Drop log entries every export target has already seen
+def prune(conn):
+    with conn:
+        oldest = conn.execute("SELECT MIN(seq) FROM export_checkpoints").fetchone()[0]
+        if oldest is None:
+            return 0
+        return conn.execute("DELETE FROM game_changes WHERE seq <= ?", (oldest,)).rowcount
@@ -0,0 +1,391 @@
+import argparse
+import collections
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import backlog
+import dedupe
+import image_store
+import libraries
+import parallel_import
+import rawg
+import summary
+import transfer
+
+STATUSES = ["Backlog", "Playing", "Completed"]
+
+# Rows written per transaction by bulk-add
+COMMIT_EVERY = 100
+
+
+# Headless entry point for scripts and cron jobs; never imports Tk.
+#
+#   python cli.py add "Hades" --status Playing
+#   python cli.py bulk-add < names.txt
+#   python cli.py export - --format jsonl | gzip > games.jsonl.gz
+#   python cli.py --library alice stats --json
+
+
+def open_library(name):
+    registry = libraries.LibraryRegistry()
+    conn = sqlite3.connect(registry.path(name))
+    backlog.init_db(conn)
+    return conn, registry.folder(name)
+
+
+# Details for a name, or just the name when RAWG lookups are turned off
+def game_details(name, lookup=True, priority=rawg.INTERACTIVE):
+    if lookup:
+        return backlog.lookup_game(name, priority)
+    return {"name": name}
+
+
+# Save a game; without a lookup only the name is known, so a game already in
+# the library gets the new status instead of having its details blanked
+def save_details(conn, details, args):
+    if details is None:
+        return None
+    if args.no_lookup:
+        return backlog.save_name(conn, details["name"], args.status)
+    return backlog.save_game(conn, details, args.status)
+
+
+def print_result(name, result):
+    if result is None:
+        print(f"not found\t\t{name}")
+    else:
+        game_id, created = result
+        print(f"{'added' if created else 'updated'}\t{game_id}\t{name}")
+
+
+def command_add(conn, folder, args):
+    failed = 0
+    for name in args.names:
+        try:
+            details = game_details(name, not args.no_lookup)
+        except rawg.RawgError as e:
+            print(f"error\t\t{name}\t{e}", file=sys.stderr)
+            failed += 1
+            continue
+
+        result = save_details(conn, details, args)
+        conn.commit()
+        print_result(name, result)
+        failed += result is None
+    return 1 if failed else 0
+
+
+# One name per line on stdin. RAWG lookups run `workers` at a time in a
+# bounded window, so input is read only as fast as results are written.
+# They are enrichment requests: an interactive add elsewhere goes first.
+def command_bulk_add(conn, folder, args):
+    def lookup(name):
+        try:
+            return name, game_details(name, not args.no_lookup, rawg.ENRICHMENT), None
+        except Exception as e:
+            return name, None, e
+
+    failed = 0
+    written = 0
+    window = collections.deque()
+
+    def finish_oldest():
+        nonlocal failed, written
+        name, details, error = window.popleft().result()
+        if error:
+            print(f"error\t\t{name}\t{error}", file=sys.stderr)
+            failed += 1
+            return
+
+        result = save_details(conn, details, args)
+        print_result(name, result)
+        failed += result is None
+        written += 1
+        if written % COMMIT_EVERY == 0:
+            conn.commit()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for line in sys.stdin:
+            name = line.strip()
+            if not name:
+                continue
+            window.append(executor.submit(lookup, name))
+            if len(window) >= args.workers * 4:
+                finish_oldest()
+
+        while window:
+            finish_oldest()
+
+    conn.commit()
+    return 1 if failed else 0
+
+
+# Today's RAWG request count against the daily quota, plus this process's scheduler metrics
+def command_rawg_usage(conn, folder, args):
+    metrics = rawg.scheduler.metrics()
+    if args.json:
+        print(json.dumps(metrics, indent=2))
+        return 0
+
+    print(f"RAWG requests on {metrics['day']}: {metrics['used']}/{metrics['daily_quota']} "
+          f"({metrics['remaining']} remaining)")
+    return 0
+
+
+def command_import(conn, folder, args):
+    if args.file == "-":
+        parse = transfer.STREAM_FORMATS[args.format][1]
+        imported, skipped = transfer.import_records(conn, parse(sys.stdin))
+    elif args.workers is not None and args.file.lower().endswith(".csv"):
+        def report(line, message):
+            print(f"error\tline {line}\t{message}", file=sys.stderr)
+
+        imported, skipped = parallel_import.import_csv(conn, args.file, args.workers or None, report)
+    else:
+        imported, skipped = transfer.import_games(conn, args.file)
+    print(f"Imported {imported} games. Skipped {skipped} games (duplicates or invalid).", file=sys.stderr)
+    return 0
+
+
+def command_export(conn, folder, args):
+    if args.file == "-":
+        write = transfer.STREAM_FORMATS[args.format][0]
+        exported = write(conn, sys.stdout)
+    else:
+        exported = transfer.export_games(conn, args.file)
+    print(f"Exported {exported} games.", file=sys.stderr)
+    return 0
+
+
+def command_stats(conn, folder, args):
+    # NumPy is only needed for this command
+    import analytics
+
+    summary = analytics.summarize(analytics.load_library(libraries.LibraryRegistry().path(args.library)))
+    stats = {
+        "total": summary["total"],
+        "status_counts": summary["status_counts"],
+        "total_playtime": summary["total_playtime"],
+        "average_rating": round(summary["average_rating"], 2),
+        "playtime_percentiles": {f"p{p}": hours for p, hours in summary["playtime_percentiles"].items()},
+        "genres": [{"name": name, "total": total, "completed": completed, "rate": round(rate, 3)}
+                   for name, total, completed, rate in summary["genres"][:10]],
+        "platforms": [{"name": name, "total": total, "completed": completed, "rate": round(rate, 3)}
+                      for name, total, completed, rate in summary["platforms"][:10]],
+    }
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return 0
+
+    print(f"Total Games: {stats['total']}")
+    for status, count in stats["status_counts"].items():
+        print(f"{status}: {count}")
+    print(f"Total Playtime: {stats['total_playtime']:.1f} hours")
+    print(f"Average Rating: {stats['average_rating']:.2f}/5")
+    for label in ("genres", "platforms"):
+        for entry in stats[label][:3]:
+            print(f"{label[:-1].title()} {entry['name']}: {entry['completed']}/{entry['total']} completed "
+                  f"({entry['rate'] * 100:.1f}%)")
+    return 0
+
+
+def command_prune_images(conn, folder, args):
+    cover_dir = os.path.join(folder, "covers")
+    cover_pack = None
+    if os.path.exists(os.path.join(cover_dir, "covers.pack")):
+        import cover_store
+        cover_pack = cover_store.CoverStore(cover_dir)
+
+    try:
+        images = image_store.ImageStore(os.path.join(folder, "images"), cover_pack)
+        removed = backlog.prune_images(conn, os.path.join(folder, "game_images"), cover_pack, images)
+    finally:
+        if cover_pack:
+            cover_pack.close()
+    print(f"Removed {removed} orphaned images.", file=sys.stderr)
+    return 0
+
+
+# Content-addressed cover store: usage, legacy import and garbage collection
+def command_images(conn, folder, args):
+    images = image_store.ImageStore(os.path.join(folder, "images"))
+    if args.import_legacy:
+        imported = images.import_directory(conn, os.path.join(folder, "game_images"))
+        print(f"Imported {imported} legacy cover files.", file=sys.stderr)
+    if args.gc:
+        removed, freed = images.gc(conn)
+        print(f"Removed {removed} unreferenced covers ({freed / 1024:.0f} KB).", file=sys.stderr)
+
+    linked, blobs, stored = images.usage(conn)
+    print(f"{linked} games share {blobs} distinct covers ({stored / 1024:.0f} KB).")
+    return 0
+
+
+def command_reindex(conn, folder, args):
+    backlog.reindex(conn)
+    print("Rebuilt indexes, playtime rollups, the summary table and cover reference counts.", file=sys.stderr)
+    return 0
+
+
+# Check the trigger-maintained summary against the games table; --rebuild repairs it
+def command_summary(conn, folder, args):
+    if args.rebuild:
+        summary.rebuild_summary(conn)
+        print("Rebuilt the summary table.", file=sys.stderr)
+
+    mismatches = summary.verify_summary(conn)
+    for dimension, value, stored, expected in mismatches:
+        print(f"{dimension}\t{value}\tstored {stored}\texpected {expected}")
+    if mismatches:
+        print(f"{len(mismatches)} summary rows are out of date; run with --rebuild.", file=sys.stderr)
+        return 1
+    print("Summary table is exact.", file=sys.stderr)
+    return 0
+
+
+# Merge duplicate games and enforce uniqueness; --dry-run only lists the clusters
+def command_dedupe(conn, folder, args):
+    def report(game_ids):
+        if args.verbose or args.dry_run:
+            print("\t".join(str(game_id) for game_id in game_ids))
+
+    clusters, removed = dedupe.deduplicate(conn, dry_run=args.dry_run, report=report, enforce=not args.no_enforce)
+    verb = "Would merge" if args.dry_run else "Merged"
+    print(f"{verb} {clusters} groups of duplicates ({removed} rows).", file=sys.stderr)
+    return 0
+
+
+# Write a JPEG thumbnail of every locally stored cover into args.directory
+def command_thumbnails(conn, folder, args):
+    import image_pool
+
+    image_dir = os.path.join(folder, "game_images")
+    images = image_store.ImageStore(os.path.join(folder, "images"))
+    width, height = (int(value) for value in args.size.lower().split("x"))
+    os.makedirs(args.directory, exist_ok=True)
+
+    # Read lazily; the pool's back-pressure keeps only a few images in memory
+    def covers():
+        for game_id, digest in conn.execute("""SELECT g.id, c.hash FROM games AS g
+                                               LEFT JOIN game_covers AS c ON c.game_id = g.id
+                                               ORDER BY g.id"""):
+            data = images.read_blob(digest) if digest else None
+            path = os.path.join(image_dir, f"{game_id}.jpg")
+            if data is None and os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+            if data:
+                yield game_id, data
+
+    pool = image_pool.ImagePool(args.workers)
+    written = 0
+    try:
+        for game_id, thumbnail in pool.thumbnails(covers(), (width, height)):
+            if thumbnail:
+                with open(os.path.join(args.directory, f"{game_id}.jpg"), "wb") as f:
+                    f.write(thumbnail)
+                written += 1
+    finally:
+        pool.shutdown()
+    print(f"Wrote {written} thumbnails to {args.directory}.", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Manage a game backlog without the GUI.")
+    parser.add_argument("--library", default=libraries.DEFAULT_LIBRARY, help="library to work on")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="look up and add games by name")
+    add.add_argument("names", nargs="+")
+    add.add_argument("--status", choices=STATUSES, default="Backlog")
+    add.add_argument("--no-lookup", action="store_true", help="add the names without asking RAWG")
+    add.set_defaults(handler=command_add)
+
+    bulk_add = commands.add_parser("bulk-add", help="add one game per line read from stdin")
+    bulk_add.add_argument("--status", choices=STATUSES, default="Backlog")
+    bulk_add.add_argument("--no-lookup", action="store_true", help="add the names without asking RAWG")
+    bulk_add.add_argument("--workers", type=int, default=4, help="concurrent RAWG lookups")
+    bulk_add.set_defaults(handler=command_bulk_add)
+
+    usage = commands.add_parser("rawg-usage", help="show today's RAWG request count against the quota")
+    usage.add_argument("--json", action="store_true")
+    usage.set_defaults(handler=command_rawg_usage)
+
+    import_parser = commands.add_parser("import", help="import games from a file, or stdin with '-'")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--format", choices=sorted(transfer.STREAM_FORMATS), default="jsonl",
+                               help="format of stdin")
+    import_parser.add_argument("--workers", type=int, default=None,
+                               help="parse a CSV file in this many processes (0: one per core), "
+                                    "reporting invalid rows")
+    import_parser.set_defaults(handler=command_import)
+
+    export = commands.add_parser("export", help="export games to a file, or stdout with '-'")
+    export.add_argument("file")
+    export.add_argument("--format", choices=sorted(transfer.STREAM_FORMATS), default="jsonl",
+                        help="format of stdout")
+    export.set_defaults(handler=command_export)
+
+    stats = commands.add_parser("stats", help="print library statistics")
+    stats.add_argument("--json", action="store_true")
+    stats.set_defaults(handler=command_stats)
+
+    prune = commands.add_parser("prune-images", help="delete covers of games that no longer exist")
+    prune.set_defaults(handler=command_prune_images)
+
+    images = commands.add_parser("images", help="show cover storage, import legacy files or collect garbage")
+    images.add_argument("--import-legacy", action="store_true", help="move game_images/{id}.jpg into the store")
+    images.add_argument("--gc", action="store_true", help="delete covers no game uses any more")
+    images.set_defaults(handler=command_images)
+
+    reindex = commands.add_parser("reindex", help="rebuild indexes, rollups, the summary table and cover references")
+    reindex.set_defaults(handler=command_reindex)
+
+    summary_parser = commands.add_parser("summary", help="verify the dashboard summary table")
+    summary_parser.add_argument("--rebuild", action="store_true", help="recompute it from the games table first")
+    summary_parser.set_defaults(handler=command_summary)
+
+    dedupe_parser = commands.add_parser("dedupe", help="merge duplicate games (same name and release year)")
+    dedupe_parser.add_argument("--dry-run", action="store_true", help="list duplicate ids without merging")
+    dedupe_parser.add_argument("--no-enforce", action="store_true", help="do not add the unique index afterwards")
+    dedupe_parser.add_argument("--verbose", action="store_true", help="print the ids of every merged group")
+    dedupe_parser.set_defaults(handler=command_dedupe)
+
+    thumbnails = commands.add_parser("thumbnails", help="write cover thumbnails using every core")
+    thumbnails.add_argument("directory")
+    thumbnails.add_argument("--size", default="200x300")
+    thumbnails.add_argument("--workers", type=int, default=None)
+    thumbnails.set_defaults(handler=command_thumbnails)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        conn, folder = open_library(args.library)
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return 2
+
+    try:
+        return args.handler(conn, folder, args)
+    except (ValueError, sqlite3.Error, rawg.RawgError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Output piped into e.g. head, which exited; point stdout at devnull so the exit flush stays quiet
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
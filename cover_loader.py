@@ -0,0 +1,73 @@
+import itertools
+import queue
+import threading
+
+# Lower numbers load first
+CURRENT, NEIGHBOR = 0, 1
+
+
+# Prioritized cover loading pipeline. Worker threads run `load(key, url)`
+# (read or download, then decode) off the UI thread; deliver() hands the
+# results to their callbacks and must be called from the UI thread. Each
+# URL is loaded once no matter how many requests share it, and jobs from
+# an older generation (an earlier selection) are dropped unstarted.
+class CoverLoader:
+    def __init__(self, load, workers=2):
+        self.load = load
+        self.jobs = queue.PriorityQueue()
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
+        self.order = itertools.count()
+
+        self.generation = 0
+        self.callbacks = {}  # url -> [(generation, callback), ...]
+
+        for _ in range(workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    # Start a new generation; everything requested before it is now stale
+    def new_generation(self):
+        with self.lock:
+            self.generation += 1
+            return self.generation
+
+    def request(self, key, url, callback, priority=CURRENT):
+        with self.lock:
+            waiting = self.callbacks.setdefault(url, [])
+            waiting.append((self.generation, callback))
+            if len(waiting) > 1:
+                return  # Already queued or loading
+            self.jobs.put((priority, next(self.order), self.generation, key, url))
+
+    def _worker(self):
+        while True:
+            priority, _, generation, key, url = self.jobs.get()
+
+            with self.lock:
+                stale = generation != self.generation and not any(
+                    waiting_generation == self.generation for waiting_generation, _ in self.callbacks.get(url, []))
+                if stale:
+                    self.callbacks.pop(url, None)
+                    continue
+
+            try:
+                image = self.load(key, url)
+            except Exception as e:
+                print(f"Error loading image: {e}")
+                image = None
+            self.results.put((url, image))
+
+    # Run callbacks for finished loads; call from the UI thread
+    def deliver(self):
+        while True:
+            try:
+                url, image = self.results.get_nowait()
+            except queue.Empty:
+                return
+
+            with self.lock:
+                waiting = self.callbacks.pop(url, [])
+                current = self.generation
+            for generation, callback in waiting:
+                if generation == current:
+                    callback(image)
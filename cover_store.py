@@ -0,0 +1,262 @@
+import io
+import mmap
+import os
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+# Every pack record is self-describing: header, key, then the image bytes.
+# A tombstone record (FLAG_DELETED, no data) hides earlier records of the key.
+RECORD_HEADER = struct.Struct("<4sBHI")
+MAGIC = b"CVR1"
+FLAG_DELETED = 1
+
+
+# Read-only, seekable file object over a memoryview, so PIL can decode
+# straight out of the mapped pack without copying the image bytes
+class BlobReader(io.RawIOBase):
+    def __init__(self, view):
+        self.view = view
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self.view[self.position:self.position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+# Packed cover archive: one append-only blob file (covers.pack) plus an index
+# (covers.idx) mapping key -> (offset, length). The index is only a checkpoint;
+# records appended after it was saved are recovered by scanning the pack tail.
+class CoverStore:
+    def __init__(self, directory="covers"):
+        self.directory = directory
+        self.pack_path = os.path.join(directory, "covers.pack")
+        self.index_path = os.path.join(directory, "covers.idx")
+        self.lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.pack = open(self.pack_path, "ab+")
+        self.index = {}
+        self.map = None
+        self.mapped_size = 0
+
+        self._scan_pack(self._load_index())
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                covered = int(file.readline())
+                for line in file:
+                    key, offset, length = line.rstrip("\n").rsplit("\t", 2)
+                    self.index[key] = (int(offset), int(length))
+        except (OSError, ValueError):
+            self.index = {}
+            return 0
+
+        # An index claiming more than the pack holds is stale; rebuild it
+        if covered > os.path.getsize(self.pack_path):
+            self.index = {}
+            return 0
+        return covered
+
+    # Replay records from `offset` to the end of the pack into the index
+    def _scan_pack(self, offset):
+        size = os.path.getsize(self.pack_path)
+        with open(self.pack_path, "rb") as file:
+            while offset + RECORD_HEADER.size <= size:
+                file.seek(offset)
+                magic, flags, key_length, data_length = RECORD_HEADER.unpack(file.read(RECORD_HEADER.size))
+                end = offset + RECORD_HEADER.size + key_length + data_length
+                if magic != MAGIC or end > size:
+                    break  # Torn write at the tail; ignore it
+
+                key = file.read(key_length).decode("utf-8")
+                if flags & FLAG_DELETED:
+                    self.index.pop(key, None)
+                else:
+                    self.index[key] = (offset + RECORD_HEADER.size + key_length, data_length)
+                offset = end
+
+        # Drop a torn tail so the next append starts on a record boundary
+        if offset < size:
+            self.pack.truncate(offset)
+
+    # Persist the index checkpoint atomically
+    def save_index(self):
+        with self.lock:
+            self.pack.flush()
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(f"{os.path.getsize(self.pack_path)}\n")
+                for key, (offset, length) in self.index.items():
+                    file.write(f"{key}\t{offset}\t{length}\n")
+            os.replace(temp_path, self.index_path)
+
+    def _append(self, key, data, flags=0):
+        key_bytes = str(key).encode("utf-8")
+        self.pack.seek(0, os.SEEK_END)
+        offset = self.pack.tell()
+        self.pack.write(RECORD_HEADER.pack(MAGIC, flags, len(key_bytes), len(data)))
+        self.pack.write(key_bytes)
+        self.pack.write(data)
+        self.pack.flush()
+        return offset + RECORD_HEADER.size + len(key_bytes)
+
+    # Store (or replace) the cover for a key
+    def put(self, key, data):
+        with self.lock:
+            self.index[str(key)] = (self._append(key, data), len(data))
+
+    def delete(self, key):
+        with self.lock:
+            if self.index.pop(str(key), None) is not None:
+                self._append(key, b"", FLAG_DELETED)
+
+    def __contains__(self, key):
+        return str(key) in self.index
+
+    def keys(self):
+        return list(self.index)
+
+    # Zero-copy view of a cover's bytes, or None if the key is unknown
+    def get(self, key):
+        with self.lock:
+            entry = self.index.get(str(key))
+            if entry is None:
+                return None
+
+            offset, length = entry
+            if offset + length > self.mapped_size:
+                self._remap()
+            return memoryview(self.map)[offset:offset + length]
+
+    def _unmap(self):
+        if isinstance(self.map, mmap.mmap):
+            try:
+                self.map.close()
+            except BufferError:
+                pass  # Views are still exported; the map is released with them
+        self.map = None
+        self.mapped_size = 0
+
+    def _remap(self):
+        self._unmap()
+        self.pack.flush()
+        size = os.path.getsize(self.pack_path)
+        self.map = mmap.mmap(self.pack.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        self.mapped_size = size
+
+    # Decode a cover directly from the mapped pack
+    def open_image(self, key):
+        view = self.get(key)
+        if view is None:
+            return None
+        return Image.open(BlobReader(view))
+
+    # (live bytes, pack bytes); compaction pays off when they drift apart
+    def usage(self):
+        with self.lock:
+            live = sum(length for _, length in self.index.values())
+            return live, os.path.getsize(self.pack_path)
+
+    # Rewrite the pack with only live covers, then swap it in
+    def compact(self):
+        with self.lock:
+            temp_path = self.pack_path + ".tmp"
+            new_index = {}
+            with open(temp_path, "wb") as file:
+                for key in list(self.index):
+                    data = self.get(key)
+                    key_bytes = key.encode("utf-8")
+                    file.write(RECORD_HEADER.pack(MAGIC, 0, len(key_bytes), len(data)))
+                    file.write(key_bytes)
+                    new_index[key] = (file.tell(), len(data))
+                    file.write(data)
+                    data.release()
+                file.flush()
+                os.fsync(file.fileno())
+
+            self._unmap()
+            self.pack.close()
+            os.replace(temp_path, self.pack_path)
+
+            self.pack = open(self.pack_path, "ab+")
+            self.index = new_index
+            self.save_index()
+
+    # Import the legacy game_images/{id}.jpg layout, keyed by game id
+    def migrate_directory(self, directory="game_images", remove=False):
+        if not os.path.isdir(directory):
+            return 0
+
+        migrated = 0
+        with self.lock:
+            for entry in os.scandir(directory):
+                game_id, extension = os.path.splitext(entry.name)
+                if extension.lower() != ".jpg" or not entry.is_file():
+                    continue
+
+                with open(entry.path, "rb") as file:
+                    self.put(game_id, file.read())
+                migrated += 1
+
+            self.save_index()
+
+        if remove:
+            for key in self.keys():
+                path = os.path.join(directory, f"{key}.jpg")
+                if os.path.exists(path):
+                    os.remove(path)
+        return migrated
+
+    def close(self):
+        with self.lock:
+            self.save_index()
+            self._unmap()
+            self.pack.close()
+
+
+# Serve covers over HTTP at /covers/<key>, writing straight from the map
+def serve_covers(store, host="127.0.0.1", port=8765):
+    class CoverHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            prefix = "/covers/"
+            view = store.get(self.path[len(prefix):]) if self.path.startswith(prefix) else None
+            if view is None:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(view)))
+            self.send_header("Cache-Control", "max-age=86400")
+            self.end_headers()
+            self.wfile.write(view)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), CoverHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,205 @@
+import re
+import sqlite3
+import unicodedata
+
+import sessions
+
+# release_year() in SQL: the first four characters when they are all digits
+YEAR_SQL = """CASE WHEN SUBSTR(release_date, 1, 4) GLOB '[0-9]*' AND SUBSTR(release_date, 1, 4) NOT GLOB '*[^0-9]*'
+                   THEN SUBSTR(release_date, 1, 4) ELSE '' END"""
+
+# Enforced once duplicates are merged: the same (normalize_name, release_year)
+# key the clusters are built on. games.name_key holds normalize_name(name);
+# every writer that sets name sets it too (see name_key()), and init_dedupe
+# fills it in for rows written without it. Rows without a key are left out.
+UNIQUE_INDEX = f"""CREATE UNIQUE INDEX IF NOT EXISTS idx_games_unique_name_year
+                   ON games (name_key, {YEAR_SQL})
+                   WHERE name_key IS NOT NULL AND name_key != ''"""
+
+SCHEMA = [
+    "CREATE INDEX IF NOT EXISTS idx_games_name_norm ON games (name_key)",
+]
+
+MERGE_COLUMNS = ["id", "name", "status", "release_date", "rating", "image_url", "platform", "genre", "playtime",
+                 "notes", "date_added", "date_modified", "rawg_id", "slug"]
+
+# Filled from the first row (oldest first) that has a value
+FILL_COLUMNS = ["release_date", "rating", "image_url", "platform", "genre", "rawg_id", "slug"]
+EMPTY_VALUES = (None, "", "N/A", 0, 0.0)
+
+# A merged game keeps the furthest status any of its copies reached
+STATUS_RANK = {"Backlog": 0, "Playing": 1, "Completed": 2}
+
+# Clusters merged per transaction
+BATCH_SIZE = 500
+
+NON_WORD = re.compile(r"[\W_]+")
+
+
+# Duplicate-matching form of a name: symbols (TM, (R)) and accents dropped,
+# case folded, punctuation and runs of whitespace collapsed to one space
+def normalize_name(name):
+    text = "".join(ch for ch in name or "" if not unicodedata.category(ch).startswith("S"))
+    text = unicodedata.normalize("NFKD", text).casefold()
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(NON_WORD.sub(" ", text).split())
+
+
+# games.name_key for a name; None for rows without one
+def name_key(name):
+    return normalize_name(name) if name and name.strip() else None
+
+
+def release_year(release_date):
+    year = (release_date or "")[:4]
+    return year if year.isdigit() else ""
+
+
+def register_functions(conn):
+    conn.create_function("dedupe_name", 1, normalize_name, deterministic=True)
+    conn.create_function("dedupe_year", 1, release_year, deterministic=True)
+    conn.create_function("dedupe_name_key", 1, name_key, deterministic=True)
+
+
+# Index name_key, fill it in where it is missing, and move a unique index
+# from before name_key (LOWER(TRIM(name)) + year) over to it. A row whose
+# key is already taken keeps NULL until the next deduplicate() merges it;
+# so does the index when the weaker old one let such duplicates in.
+def init_dedupe(conn):
+    for statement in SCHEMA:
+        conn.execute(statement)
+    register_functions(conn)
+    conn.execute("""UPDATE OR IGNORE games SET name_key = dedupe_name_key(name)
+                    WHERE name_key IS NULL AND name IS NOT NULL AND TRIM(name) != ''""")
+
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_games_unique_name_year'"
+                       ).fetchone()
+    if row and "name_key" not in row[0]:
+        conn.execute("DROP INDEX idx_games_unique_name_year")
+        try:
+            conn.execute(UNIQUE_INDEX)
+        except sqlite3.IntegrityError:
+            print("Duplicate games found; run deduplicate again to merge them and enforce uniqueness")
+
+
+# Build temp.dedupe_candidates: (id, name_key, year) of every row whose key
+# is shared with another row. Keys are computed in one streaming pass and
+# grouped by SQLite, whose temp tables and sorter spill to disk, so memory
+# stays bounded however large the table is. Returns the number of rows.
+def _find_candidates(conn):
+    register_functions(conn)
+    conn.execute("DROP TABLE IF EXISTS temp.dedupe_keys")
+    conn.execute("DROP TABLE IF EXISTS temp.dedupe_candidates")
+    conn.execute("""CREATE TEMP TABLE dedupe_keys AS
+                    SELECT id, dedupe_name(name) AS name_key, dedupe_year(release_date) AS year
+                    FROM games WHERE name IS NOT NULL AND TRIM(name) != ''""")
+    conn.execute("CREATE INDEX temp.idx_dedupe_keys ON dedupe_keys (name_key, year, id)")
+    conn.execute("""CREATE TEMP TABLE dedupe_candidates AS
+                    SELECT k.id, k.name_key, k.year FROM dedupe_keys AS k
+                    JOIN (SELECT name_key, year FROM dedupe_keys WHERE name_key != ''
+                          GROUP BY name_key, year HAVING COUNT(*) > 1) AS d
+                      ON d.name_key = k.name_key AND d.year = k.year""")
+    conn.execute("DROP TABLE temp.dedupe_keys")
+    return conn.execute("SELECT COUNT(*) FROM temp.dedupe_candidates").fetchone()[0]
+
+
+# Yield clusters of duplicate ids, oldest first, one cluster in memory at a time
+def _clusters(conn):
+    cluster = []
+    current_key = None
+    for game_id, name_key, year in conn.execute("""SELECT id, name_key, year FROM temp.dedupe_candidates
+                                                   ORDER BY name_key, year, id"""):
+        if (name_key, year) != current_key and cluster:
+            yield cluster
+            cluster = []
+        current_key = (name_key, year)
+        cluster.append(game_id)
+    if cluster:
+        yield cluster
+
+
+# Combine the rows of one cluster (dicts, oldest first) into the surviving row
+def merge_rows(rows):
+    merged = dict(rows[0])
+    for column in FILL_COLUMNS:
+        if merged[column] in EMPTY_VALUES:
+            merged[column] = next((row[column] for row in rows if row[column] not in EMPTY_VALUES), merged[column])
+
+    merged["playtime"] = sum(row["playtime"] or 0 for row in rows)
+
+    notes = []
+    for row in rows:
+        note = (row["notes"] or "").strip()
+        if note and note not in notes:
+            notes.append(note)
+    merged["notes"] = "\n\n".join(notes)
+
+    merged["status"] = max((row["status"] for row in rows), key=lambda status: STATUS_RANK.get(status, -1))
+    dates_added = [row["date_added"] for row in rows if row["date_added"]]
+    dates_modified = [row["date_modified"] for row in rows if row["date_modified"]]
+    merged["date_added"] = min(dates_added) if dates_added else None
+    merged["date_modified"] = max(dates_modified) if dates_modified else None
+    return merged
+
+
+def _merge_cluster(conn, game_ids):
+    rows = [dict(zip(MERGE_COLUMNS, row)) for row in conn.execute(
+        f"SELECT {', '.join(MERGE_COLUMNS)} FROM games WHERE id IN ({', '.join('?' * len(game_ids))}) ORDER BY id",
+        game_ids)]
+    if len(rows) < 2:
+        return 0
+
+    merged = merge_rows(rows)
+    removed = [row["id"] for row in rows[1:]]
+
+    conn.executemany("DELETE FROM games WHERE id = ?", [(game_id,) for game_id in removed])
+    conn.execute(f"UPDATE games SET {', '.join(f'{column} = ?' for column in MERGE_COLUMNS[1:])} WHERE id = ?",
+                 [merged[column] for column in MERGE_COLUMNS[1:]] + [merged["id"]])
+    for game_id in removed:
+        sessions.merge_game(conn, game_id, merged["id"])
+    conn.executemany("DELETE FROM rawg_refresh WHERE game_id = ?", [(game_id,) for game_id in removed])
+    return len(removed)
+
+
+# Merge every cluster of duplicates (same normalized name and release year)
+# into its oldest row, then add the unique index. Returns
+# (clusters, rows_removed). Each cluster's ids are passed to `report`, if
+# given; with dry_run nothing is written.
+def deduplicate(conn, dry_run=False, report=None, enforce=True):
+    _find_candidates(conn)
+    clusters = 0
+    removed = 0
+    try:
+        if dry_run:
+            for game_ids in _clusters(conn):
+                clusters += 1
+                removed += len(game_ids) - 1
+                if report:
+                    report(game_ids)
+            return clusters, removed
+
+        conn.commit()
+        for game_ids in _clusters(conn):
+            removed += _merge_cluster(conn, game_ids)
+            clusters += 1
+            if report:
+                report(game_ids)
+            if clusters % BATCH_SIZE == 0:
+                conn.commit()
+        conn.commit()
+
+        # Names edited outside the app may have left stale keys; merged rows have no duplicates left
+        with conn:
+            conn.execute("""UPDATE games SET name_key = dedupe_name_key(name)
+                            WHERE name_key IS NOT dedupe_name_key(name)""")
+            if enforce:
+                conn.execute(UNIQUE_INDEX)
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.dedupe_candidates")
+    return clusters, removed
+
+
+# True once the unique index has been created
+def is_enforced(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_games_unique_name_year'"
+                        ).fetchone() is not None
@@ -0,0 +1,98 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+from PIL import Image
+
+COVER_SIZE = (200, 300)
+
+
+# Runs in a worker process: decode raw image bytes and resize them.
+# Returns (mode, size, pixels) ready for Image.frombytes, or the encoded
+# bytes when an output format such as "JPEG" is requested.
+def decode_and_resize(data, size=COVER_SIZE, output_format=None):
+    image = Image.open(BytesIO(data))
+    # Let the JPEG decoder downscale while decoding when the target is much smaller
+    image.draft("RGB", size)
+    image = image.convert("RGB").resize(size, Image.LANCZOS)
+
+    if output_format:
+        buffer = BytesIO()
+        image.save(buffer, output_format, quality=85)
+        return buffer.getvalue()
+    return image.mode, image.size, image.tobytes()
+
+
+# Rebuild a PIL image from a worker result in the calling process
+def to_image(result):
+    mode, size, pixels = result
+    return Image.frombytes(mode, size, pixels)
+
+
+# Decode/resize service backed by a process pool, so CPU-bound LANCZOS work
+# runs on every core instead of serializing on the GIL. At most `max_pending`
+# jobs are in flight; further submissions block (or are refused) until one
+# finishes.
+class ImagePool:
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.slots = threading.BoundedSemaphore(max_pending or self.workers * 2)
+        self.executor = None
+        self.lock = threading.Lock()
+
+    # Worker processes start on first use
+    def _executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self.executor
+
+    # Submit one job; returns a Future, or None when block=False and the pool is full
+    def submit(self, data, size=COVER_SIZE, output_format=None, block=True):
+        if not self.slots.acquire(blocking=block):
+            return None
+
+        try:
+            future = self._executor().submit(decode_and_resize, data, size, output_format)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    # Decode and resize in a worker, returning a PIL image
+    def resize(self, data, size=COVER_SIZE):
+        return to_image(self.submit(data, size).result())
+
+    # Encode thumbnails for many (key, data) pairs across all cores.
+    # Yields (key, thumbnail_bytes or None) as jobs complete; bad images yield None.
+    def thumbnails(self, items, size=COVER_SIZE, output_format="JPEG"):
+        in_flight = {}
+        for key, data in items:
+            # Back-pressure: drain finished jobs before queueing more than the pool allows
+            future = self.submit(data, size, output_format, block=False)
+            while future is None:
+                if in_flight:
+                    yield from self._drain(in_flight, wait_for_one=True)
+                future = self.submit(data, size, output_format, block=not in_flight)
+            in_flight[future] = key
+
+        yield from self._drain(in_flight)
+
+    def _drain(self, in_flight, wait_for_one=False):
+        for future in as_completed(list(in_flight)):
+            key = in_flight.pop(future)
+            try:
+                yield key, future.result()
+            except Exception as e:
+                print(f"Error creating thumbnail for {key}: {e}")
+                yield key, None
+            if wait_for_one:
+                return
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
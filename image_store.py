@@ -0,0 +1,195 @@
+import datetime
+import hashlib
+import os
+
+# Content-addressed covers: every distinct image is stored once under its
+# SHA-256. image_urls remembers which blob a URL downloaded to, so another
+# game (a duplicate row, a re-add, an edition sharing background_image)
+# links to it without a download. game_covers links games to blobs; triggers
+# keep image_blobs.refs equal to the number of linked games, and gc() deletes
+# blobs nobody links to any more.
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS image_blobs (
+       hash TEXT PRIMARY KEY,
+       size INTEGER NOT NULL,
+       refs INTEGER NOT NULL DEFAULT 0,
+       stored_at TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS image_urls (
+       url TEXT PRIMARY KEY,
+       hash TEXT NOT NULL)''',
+    '''CREATE INDEX IF NOT EXISTS idx_image_urls_hash ON image_urls (hash)''',
+    '''CREATE TABLE IF NOT EXISTS game_covers (
+       game_id INTEGER PRIMARY KEY,
+       hash TEXT NOT NULL)''',
+    '''CREATE INDEX IF NOT EXISTS idx_game_covers_hash ON game_covers (hash)''',
+    '''CREATE TRIGGER IF NOT EXISTS game_covers_ref AFTER INSERT ON game_covers
+       BEGIN
+           UPDATE image_blobs SET refs = refs + 1 WHERE hash = NEW.hash;
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS game_covers_reref AFTER UPDATE OF hash ON game_covers
+       BEGIN
+           UPDATE image_blobs SET refs = refs - 1 WHERE hash = OLD.hash;
+           UPDATE image_blobs SET refs = refs + 1 WHERE hash = NEW.hash;
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS game_covers_unref AFTER DELETE ON game_covers
+       BEGIN
+           UPDATE image_blobs SET refs = refs - 1 WHERE hash = OLD.hash;
+       END''',
+    # Deleted (or merged away) games let go of their cover
+    '''CREATE TRIGGER IF NOT EXISTS games_drop_cover AFTER DELETE ON games
+       BEGIN
+           DELETE FROM game_covers WHERE game_id = OLD.id;
+       END''',
+]
+
+# Key prefix of blobs kept in a cover_store.CoverStore, apart from its per-game keys
+PACK_PREFIX = "sha256:"
+
+
+# Create the blob, URL and cover link tables on an open connection
+def init_images(conn):
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+# Recount blob references from game_covers (repair after manual edits)
+def rebuild_refs(conn):
+    with conn:
+        conn.execute("""UPDATE image_blobs SET refs = (SELECT COUNT(*) FROM game_covers AS c
+                                                       WHERE c.hash = image_blobs.hash)""")
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# Blob side of the store: files under `directory` (images/ab/abcd....jpg),
+# or records in `pack` (a cover_store.CoverStore) when covers are packed.
+# The link tables live in the library database; every method that touches
+# them takes its connection and leaves committing to the caller.
+class ImageStore:
+    def __init__(self, directory="images", pack=None):
+        self.directory = directory
+        self.pack = pack
+
+    def blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest + ".jpg")
+
+    def _write_blob(self, digest, data):
+        if self.pack:
+            if PACK_PREFIX + digest not in self.pack:
+                self.pack.put(PACK_PREFIX + digest, data)
+            return
+
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    # Bytes of a blob, or None if it is missing
+    def read_blob(self, digest):
+        if self.pack:
+            view = self.pack.get(PACK_PREFIX + digest)
+            return bytes(view) if view is not None else None
+        try:
+            with open(self.blob_path(digest), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _delete_blob(self, digest):
+        if self.pack:
+            self.pack.delete(PACK_PREFIX + digest)
+            return
+        try:
+            os.remove(self.blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _link(self, conn, game_id, digest):
+        conn.execute("""INSERT INTO game_covers (game_id, hash) VALUES (?, ?)
+                        ON CONFLICT (game_id) DO UPDATE SET hash = excluded.hash WHERE hash != excluded.hash""",
+                     (int(game_id), digest))
+
+    # Store a cover's bytes (once per distinct image) and link the game and URL to it
+    def put(self, conn, game_id, url, data):
+        digest = content_hash(data)
+        self._write_blob(digest, data)
+        conn.execute("""INSERT INTO image_blobs (hash, size, stored_at) VALUES (?, ?, ?)
+                        ON CONFLICT (hash) DO NOTHING""",
+                     (digest, len(data), datetime.datetime.now().isoformat(timespec="seconds")))
+        if url:
+            conn.execute("INSERT OR REPLACE INTO image_urls (url, hash) VALUES (?, ?)", (url, digest))
+        if game_id is not None:
+            self._link(conn, game_id, digest)
+        return digest
+
+    # Link a game to the cover already downloaded for `url`; returns the hash,
+    # or None when the URL has not been stored (or its blob went missing)
+    def link_url(self, conn, game_id, url):
+        row = conn.execute("SELECT hash FROM image_urls WHERE url = ?", (url,)).fetchone()
+        if row is None or self.read_blob(row[0]) is None:
+            return None
+        self._link(conn, game_id, row[0])
+        return row[0]
+
+    # Drop a game's cover link (its image URL was cleared)
+    def unlink(self, conn, game_id):
+        conn.execute("DELETE FROM game_covers WHERE game_id = ?", (int(game_id),))
+
+    # A game's cover bytes. With `url`, the stored copy of that URL: the
+    # game's own link may still point at the cover of an earlier image_url,
+    # and None sends the caller to download (and put) the new one. Without
+    # it, whatever the game links to.
+    def read(self, conn, game_id, url=None):
+        if url:
+            row = conn.execute("SELECT hash FROM image_urls WHERE url = ?", (url,)).fetchone()
+        else:
+            row = conn.execute("SELECT hash FROM game_covers WHERE game_id = ?", (int(game_id),)).fetchone()
+        return self.read_blob(row[0]) if row else None
+
+    # Delete blobs no game links to, and the URLs that pointed at them.
+    # Commits; returns (blobs removed, bytes freed).
+    def gc(self, conn):
+        with conn:
+            conn.execute("DELETE FROM game_covers WHERE game_id NOT IN (SELECT id FROM games)")
+            unused = conn.execute("SELECT hash, size FROM image_blobs WHERE refs <= 0").fetchall()
+            for digest, _size in unused:
+                self._delete_blob(digest)
+            conn.executemany("DELETE FROM image_urls WHERE hash = ?", [(digest,) for digest, _ in unused])
+            conn.executemany("DELETE FROM image_blobs WHERE hash = ?", [(digest,) for digest, _ in unused])
+        if self.pack and unused:
+            self.pack.save_index()
+        return len(unused), sum(size for _, size in unused)
+
+    # Move legacy game_images/{id}.jpg files into the store; returns the number imported
+    def import_directory(self, conn, directory="game_images", remove=True):
+        if not os.path.isdir(directory):
+            return 0
+
+        game_ids = {str(row[0]): row[1] for row in conn.execute("SELECT id, image_url FROM games")}
+        imported = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                game_id, extension = os.path.splitext(entry.name)
+                if extension.lower() != ".jpg" or game_id not in game_ids or not entry.is_file():
+                    continue
+                with open(entry.path, "rb") as f:
+                    self.put(conn, game_id, game_ids[game_id], f.read())
+                imported.append(entry.path)
+        conn.commit()
+
+        if remove:
+            for path in imported:
+                os.remove(path)
+        return len(imported)
+
+    # (games with a cover, distinct blobs, bytes stored)
+    def usage(self, conn):
+        linked = conn.execute("SELECT COUNT(*) FROM game_covers").fetchone()[0]
+        blobs, stored = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM image_blobs").fetchone()
+        return linked, blobs, stored
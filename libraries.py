@@ -0,0 +1,218 @@
+import datetime
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import query_plans
+
+# The registry itself is a tiny database next to the default library
+REGISTRY_PATH = "libraries.db"
+LIBRARY_DIR = "libraries"
+
+# The default library keeps the original games.db, images and backups
+DEFAULT_LIBRARY = "default"
+DEFAULT_PATH = "games.db"
+
+# SQLite allows 10 attached databases by default
+ATTACH_LIMIT = 10
+
+LIBRARY_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+SCHEMA = '''CREATE TABLE IF NOT EXISTS libraries (
+            name TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            created_at TEXT)'''
+
+
+# A cached connection; close() hands it back to the registry instead of closing it
+class PooledConnection:
+    def __init__(self, registry, name, conn):
+        self._registry = registry
+        self._name = name
+        self._conn = conn
+
+    def __getattr__(self, attribute):
+        return getattr(self._conn, attribute)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
+
+    def close(self):
+        if self._conn is not None:
+            self._registry._release(self._name, self._conn)
+            self._conn = None
+
+
+# Maps library names to their own SQLite files and hands out connections to
+# them. Idle connections are kept in an LRU cache bounded by max_connections,
+# so switching between many libraries never holds more than that many open.
+class LibraryRegistry:
+    def __init__(self, registry_path=REGISTRY_PATH, directory=LIBRARY_DIR, max_connections=8):
+        self.registry_path = registry_path
+        self.directory = directory
+        self.max_connections = max_connections
+
+        self.lock = threading.Lock()
+        self.idle = OrderedDict()  # name -> [connection, ...], least recently used first
+        self.idle_count = 0
+
+        conn = sqlite3.connect(self.registry_path)
+        with conn:
+            conn.execute(SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO libraries (name, path, created_at) VALUES (?, ?, ?)",
+                         (DEFAULT_LIBRARY, DEFAULT_PATH, datetime.datetime.now().strftime("%Y-%m-%d")))
+        conn.close()
+
+    def names(self):
+        conn = sqlite3.connect(self.registry_path)
+        try:
+            return [row[0] for row in conn.execute("SELECT name FROM libraries ORDER BY name != ?, name",
+                                                   (DEFAULT_LIBRARY,))]
+        finally:
+            conn.close()
+
+    # Database file of a library; raises KeyError for unknown names
+    def path(self, name):
+        conn = sqlite3.connect(self.registry_path)
+        try:
+            row = conn.execute("SELECT path FROM libraries WHERE name = ?", (name,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise KeyError(f"Unknown library: {name}")
+        return row[0]
+
+    # Folder for a library's images, covers and backups ("" for the default library)
+    def folder(self, name):
+        return os.path.dirname(self.path(name))
+
+    # Register a new library in its own folder and return its database path
+    def create(self, name):
+        if not LIBRARY_NAME.match(name):
+            raise ValueError("Library names may only contain letters, digits, '-' and '_'")
+
+        folder = os.path.join(self.directory, name)
+        path = os.path.join(folder, "games.db")
+        conn = sqlite3.connect(self.registry_path)
+        try:
+            with conn:
+                conn.execute("INSERT INTO libraries (name, path, created_at) VALUES (?, ?, ?)",
+                             (name, path, datetime.datetime.now().strftime("%Y-%m-%d")))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Library already exists: {name}")
+        finally:
+            conn.close()
+
+        os.makedirs(folder, exist_ok=True)
+        return path
+
+    # Unregister a library, optionally deleting its folder
+    def remove(self, name, delete_files=False):
+        if name == DEFAULT_LIBRARY:
+            raise ValueError("The default library cannot be removed")
+
+        folder = self.folder(name)
+        self.evict(name)
+        conn = sqlite3.connect(self.registry_path)
+        with conn:
+            conn.execute("DELETE FROM libraries WHERE name = ?", (name,))
+        conn.close()
+
+        if delete_files:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    # Connection to a library's database, reused from the cache when possible.
+    # Call close() when done, as with sqlite3.connect().
+    def connect(self, name):
+        with self.lock:
+            waiting = self.idle.get(name)
+            if waiting:
+                conn = waiting.pop()
+                self.idle_count -= 1
+                if not waiting:
+                    del self.idle[name]
+                return PooledConnection(self, name, conn)
+
+        # Connections are handed to one thread at a time, but not always the one that opened them
+        return PooledConnection(self, name, sqlite3.connect(self.path(name), check_same_thread=False,
+                                                            factory=query_plans.LoggingConnection))
+
+    def _release(self, name, conn):
+        if conn.in_transaction:
+            conn.rollback()
+
+        evicted = []
+        with self.lock:
+            self.idle.setdefault(name, []).append(conn)
+            self.idle.move_to_end(name)
+            self.idle_count += 1
+            while self.idle_count > self.max_connections:
+                oldest = next(iter(self.idle))
+                waiting = self.idle[oldest]
+                evicted.append(waiting.pop(0))
+                self.idle_count -= 1
+                if not waiting:
+                    del self.idle[oldest]
+
+        for conn in evicted:
+            conn.close()
+
+    # Close the cached connections of one library
+    def evict(self, name):
+        with self.lock:
+            waiting = self.idle.pop(name, [])
+            self.idle_count -= len(waiting)
+        for conn in waiting:
+            conn.close()
+
+    def close(self):
+        with self.lock:
+            waiting = [conn for connections in self.idle.values() for conn in connections]
+            self.idle.clear()
+            self.idle_count = 0
+        for conn in waiting:
+            conn.close()
+
+    # Run `sql` against every library (or `names`) and return the rows, each
+    # prefixed with its library name. `sql` refers to a library's tables as
+    # {db}.games; libraries are ATTACHed in batches of ATTACH_LIMIT.
+    def query_all(self, sql, params=(), names=None):
+        libraries = [(name, self.path(name)) for name in (names or self.names())]
+        libraries = [(name, path) for name, path in libraries if os.path.exists(path)]
+
+        conn = sqlite3.connect(":memory:")
+        rows = []
+        try:
+            for start in range(0, len(libraries), ATTACH_LIMIT):
+                batch = libraries[start:start + ATTACH_LIMIT]
+                for index, (_, path) in enumerate(batch):
+                    conn.execute(f"ATTACH DATABASE ? AS lib{index}", (path,))
+                try:
+                    union = " UNION ALL ".join(f"SELECT ? AS library, * FROM ({sql.format(db=f'lib{index}')})"
+                                               for index in range(len(batch)))
+                    batch_params = []
+                    for name, _ in batch:
+                        batch_params += [name, *params]
+                    rows += conn.execute(union, batch_params).fetchall()
+                finally:
+                    for index in range(len(batch)):
+                        conn.execute(f"DETACH DATABASE lib{index}")
+        finally:
+            conn.close()
+        return rows
+
+    # Per-library game counts and hours: [(library, total, backlog, playing, completed, hours), ...]
+    def summaries(self, names=None):
+        return self.query_all("""SELECT COUNT(*),
+                                        COALESCE(SUM(status = 'Backlog'), 0),
+                                        COALESCE(SUM(status = 'Playing'), 0),
+                                        COALESCE(SUM(status = 'Completed'), 0),
+                                        COALESCE(SUM(playtime), 0)
+                                 FROM {db}.games""", names=names)
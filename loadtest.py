@@ -0,0 +1,239 @@
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import backlog
+import backup
+import query_cache
+import rawg
+import sessions
+import summary
+import transfer
+
+DEFAULT_MIX = "list=30,search=25,stats=5,status=20,playtime=15,import=5"
+
+STATUSES = ["Backlog", "Playing", "Completed"]
+SEARCH_TERMS = ["a", "the", "game 1", "rpg", "pc", "action", "ze", "99"]
+
+
+# Simulates concurrent clients against a games database: N threads or
+# processes each run a weighted mix of list, search, stats, status change,
+# playtime, import (and, with --rawg-stub, RAWG-enriched add) operations on
+# their own connection, then report throughput, latency percentiles and how
+# often SQLite answered "database is locked".
+#
+#   python loadtest.py --workers 8 --duration 20
+#   python loadtest.py --processes --workers 4 --mix status=50,playtime=50 --wal
+#   python loadtest.py --rawg-stub --mix add=20,list=80
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# Fill a fresh database with `rows` synthetic games
+def seed_database(db_path, rows, seed=0):
+    pick = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    backlog.init_db(conn)
+    genres = ["Action", "RPG", "Puzzle", "Shooter", "Indie", "Strategy"]
+    platforms = ["PC", "PlayStation 5", "Xbox Series S/X", "Nintendo Switch"]
+    with conn:
+        conn.executemany("""INSERT INTO games (name, name_key, status, release_date, rating, image_url, platform,
+                                               genre, playtime, notes, date_added, date_modified)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                         ((f"Game {i}", f"game {i}", pick.choice(STATUSES), f"{pick.randint(1995, 2026)}-01-01",
+                           round(pick.uniform(0, 5), 2), "", ", ".join(pick.sample(platforms, 2)),
+                           ", ".join(pick.sample(genres, 2)), pick.randint(0, 200), "", "2024-01-01", "2024-01-01")
+                          for i in range(rows)))
+    conn.close()
+
+
+# Operations: each gets (conn, pick, state) and does one unit of work
+
+def op_list(conn, pick, state):
+    query, params = query_cache.build_list_query(pick.choice(["All"] + STATUSES),
+                                                 pick.choice(list(query_cache.SORT_ORDERS)))
+    conn.execute(query, params).fetchall()
+
+
+def op_search(conn, pick, state):
+    query, params = query_cache.build_list_query("All", "Name (A-Z)", pick.choice(SEARCH_TERMS))
+    conn.execute(query, params).fetchall()
+
+
+# The same reads the status bar and statistics window make
+def op_stats(conn, pick, state):
+    summary.status_counts(conn)
+    summary.totals(conn)
+    summary.top_tags(conn, "genre", 3)
+    sessions.hours_last_days(conn, 7)
+
+
+def op_status(conn, pick, state):
+    with conn:
+        conn.execute("UPDATE games SET status = ?, date_modified = date('now') WHERE id = ?",
+                     (pick.choice(STATUSES), pick.randint(1, state["rows"])))
+
+
+# Mirrors a write-behind flush: playtime bump and session row in one transaction
+def op_playtime(conn, pick, state):
+    game_id = pick.randint(1, state["rows"])
+    hours = pick.choice([0.5, 1, 2])
+    with conn:
+        conn.execute("UPDATE games SET playtime = COALESCE(playtime, 0) + ?, date_modified = date('now') WHERE id = ?",
+                     (hours, game_id))
+        sessions.log_session(conn, game_id, hours)
+
+
+def op_import(conn, pick, state):
+    state["imports"] += 1
+    records = [{"name": f"Imported {state['worker']}-{state['imports']}-{i}", "status": "Backlog"}
+               for i in range(state["import_size"])]
+    transfer.import_records(conn, records)
+
+
+# Look a name up on RAWG (the stub under --rawg-stub) and store it
+def op_add(conn, pick, state):
+    details = backlog.lookup_game(f"Load Title {pick.randint(1, 5000)}")
+    if details:
+        backlog.save_game(conn, details, "Backlog")
+        conn.commit()
+
+
+OPERATIONS = {"list": op_list, "search": op_search, "stats": op_stats, "status": op_status,
+              "playtime": op_playtime, "import": op_import, "add": op_add}
+
+
+def is_lock_error(error):
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in str(error) or "busy" in str(error))
+
+
+# One simulated client; returns {operation: (latencies, errors, lock_errors)}
+def run_worker(worker, config):
+    if config["rawg_url"]:
+        rawg.configure(base_url=config["rawg_url"])
+
+    pick = random.Random(config["seed"] + worker)
+    names = list(config["mix"])
+    weights = [config["mix"][name] for name in names]
+    state = {"worker": worker, "rows": config["rows"], "imports": 0, "import_size": config["import_size"]}
+    results = {name: ([], 0, 0) for name in names}
+
+    conn = sqlite3.connect(config["db_path"], timeout=config["busy_timeout"])
+    try:
+        deadline = time.perf_counter() + config["duration"]
+        while time.perf_counter() < deadline:
+            name = pick.choices(names, weights)[0]
+            latencies, errors, lock_errors = results[name]
+            start = time.perf_counter()
+            try:
+                OPERATIONS[name](conn, pick, state)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                results[name] = (latencies, errors + 1, lock_errors + is_lock_error(e))
+    finally:
+        conn.close()
+    return results
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))]
+
+
+def report(results, elapsed, out=sys.stdout):
+    merged = {}
+    for worker_results in results:
+        for name, (latencies, errors, lock_errors) in worker_results.items():
+            total_latencies, total_errors, total_locks = merged.get(name, ([], 0, 0))
+            merged[name] = (total_latencies + latencies, total_errors + errors, total_locks + lock_errors)
+
+    print(f"{'operation':<10}{'ok':>8}{'ops/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'errors':>8}{'locked':>8}", file=out)
+    totals = [0, 0, 0]
+    for name, (latencies, errors, lock_errors) in sorted(merged.items()):
+        latencies.sort()
+        print(f"{name:<10}{len(latencies):>8}{len(latencies) / elapsed:>9.1f}"
+              + "".join(f"{percentile(latencies, p) * 1000:>9.2f}" for p in (50, 90, 99, 100))
+              + f"{errors:>8}{lock_errors:>8}", file=out)
+        totals = [totals[0] + len(latencies), totals[1] + errors, totals[2] + lock_errors]
+    print(f"{'total':<10}{totals[0]:>8}{totals[0] / elapsed:>9.1f}{'':>36}{totals[1]:>8}{totals[2]:>8}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent clients against a games database.")
+    parser.add_argument("--db", help="database to copy and test against (default: a seeded synthetic one)")
+    parser.add_argument("--rows", type=int, default=20_000, help="rows to seed the temporary database with")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--processes", action="store_true", help="use processes instead of threads")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per worker")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted operations, e.g. list=30,status=20")
+    parser.add_argument("--import-size", type=int, default=50, help="rows per import operation")
+    parser.add_argument("--busy-timeout", type=float, default=5.0, help="sqlite3 connect timeout in seconds")
+    parser.add_argument("--wal", action="store_true", help="switch the database to WAL journal mode first")
+    parser.add_argument("--rawg-stub", action="store_true", help="serve RAWG lookups from a local rawg_stub")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    # Always work on a throwaway database; the test writes freely
+    temp_dir = tempfile.mkdtemp()
+    stub = None
+    try:
+        db_path = os.path.join(temp_dir, "games.db")
+        if args.db:
+            backup.copy_database(args.db, db_path)
+            conn = sqlite3.connect(db_path)
+            backlog.init_db(conn)
+            conn.close()
+        else:
+            seed_database(db_path, args.rows, args.seed)
+
+        conn = sqlite3.connect(db_path)
+        if args.wal:
+            conn.execute("PRAGMA journal_mode = WAL")
+        rows = conn.execute("SELECT COALESCE(MAX(id), 0) FROM games").fetchone()[0]
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+
+        rawg_url = None
+        if args.rawg_stub or "add" in mix:
+            import rawg_stub
+            stub = rawg_stub.RawgStub(port=0, seed=args.seed)
+            rawg_url = stub.start()
+
+        config = {"db_path": db_path, "rows": max(rows, 1), "mix": mix, "duration": args.duration,
+                  "import_size": args.import_size, "busy_timeout": args.busy_timeout, "seed": args.seed,
+                  "rawg_url": rawg_url}
+
+        print(f"{args.workers} {'processes' if args.processes else 'threads'}, {args.duration:g}s, "
+              f"{rows} rows, journal_mode={journal_mode}, busy timeout {args.busy_timeout:g}s")
+        executor_type = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+        start = time.perf_counter()
+        with executor_type(max_workers=args.workers) as executor:
+            results = list(executor.map(run_worker, range(args.workers), [config] * args.workers))
+        report(results, time.perf_counter() - start)
+    finally:
+        if stub:
+            stub.stop()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
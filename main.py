@@ -1,119 +1,201 @@
-import csv
 import tkinter as tk
-from tkinter import messagebox, ttk, filedialog
+from tkinter import messagebox, ttk, filedialog, simpledialog
 from tkinter.ttk import Treeview
 
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import sqlite3
-import requests
-from io import BytesIO
 import os
 import datetime
 import threading
-import time
-
+import queue
+
+import analytics
+import backlog
+import backup
+import changelog
+import cover_loader
+import cover_store
+import dedupe
+import image_pool
+import image_store
+import libraries
+import parallel_import
+import query_cache
+import rawg
+import recommend
+import refresh
+import sessions
+import summary
+import transfer
+import write_queue
 from rapidfuzz.fuzz import imported
 
-# RAWG API Key (replace with your own from rawg.io)
-API_KEY = "X"
-BASE_URL = "https://api.rawg.io/api/games"
+# Each library is its own SQLite file; the registry hands out cached connections
+library_registry = libraries.LibraryRegistry()
+current_library = libraries.DEFAULT_LIBRARY
+DB_PATH = library_registry.path(current_library)
+
+# Per-library folders (the default library keeps the original locations)
+IMAGE_DIR = "game_images"
+COVER_DIR = "covers"
+BACKUP_DIR = backup.BACKUP_DIR
+
+# Keep covers in one packed, memory-mapped archive instead of game_images/{id}.jpg
+USE_PACKED_COVERS = False
+cover_pack = None
+
+# Covers stored once per distinct image (see image_store.py); blobs go to the pack when it is enabled
+IMAGE_STORE_DIR = "images"
+cover_images = None
+
+# Snapshot of the list view used for instant cold starts (see snapshot.py)
+LIST_SNAPSHOT = "list.snapshot"
 
+# CSV files at least this big are parsed across worker processes on import
+PARALLEL_IMPORT_BYTES = 16 * 1024 * 1024
 
-# Database setup with expanded columns
+
+# Connection to the open library's database
+def connect():
+    return library_registry.connect(current_library)
+
+
+# Create or migrate the open library's schema
 def init_db():
-    conn = sqlite3.connect("games.db")
-    cursor = conn.cursor()
-    cursor.execute('''CREATE TABLE IF NOT EXISTS games (
-                      id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      name TEXT,
-                      status TEXT,
-                      release_date TEXT,
-                      rating REAL,
-                      image_url TEXT,
-                      platform TEXT,
-                      genre TEXT,
-                      playtime INTEGER DEFAULT 0,
-                      notes TEXT,
-                      date_added TEXT,
-                      date_modified TEXT)''')
-    conn.commit()
-    conn.close()
+    conn = connect()
+    try:
+        backlog.init_db(conn)
+    finally:
+        conn.close()
 
 
 # Cache for images
 image_cache = {}
 
+# Decoding and resizing run in worker processes, off the GIL
+image_workers = image_pool.ImagePool()
 
-def get_cached_image(url, size=(200, 300)):
-    if url in image_cache:
-        return image_cache[url]
 
+# Read a cover (stored copy first, then legacy files, then download) and decode it; runs on loader threads
+def load_cover(game_id, url, size=(200, 300)):
+    local_path = os.path.join(IMAGE_DIR, f"{game_id}.jpg")
+
+    conn = connect()
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            img_data = Image.open(BytesIO(response.content))
-            img_data = img_data.resize(size, Image.LANCZOS)
-            img = ImageTk.PhotoImage(img_data)
-            image_cache[url] = img
-            return img
-    except Exception as e:
-        print(f"Error loading image: {e}")
-    return None
+        data = cover_images.read(conn, game_id, url)
+        if data is None:
+            if cover_pack and game_id in cover_pack:
+                data = bytes(cover_pack.get(game_id))
+            elif os.path.exists(local_path):
+                with open(local_path, "rb") as f:
+                    data = f.read()
+            else:
+                data = rawg.get_image(url)
+                if data:
+                    # Keep the download; every row sharing this cover reuses it
+                    cover_images.put(conn, game_id, url, data)
+                    conn.commit()
+    finally:
+        conn.close()
 
+    return image_workers.resize(data, size) if data else None
+
+
+# Covers load off the UI thread: current selection first, then its neighbours
+covers = cover_loader.CoverLoader(load_cover)
+
+
+# Turn a loaded cover into a PhotoImage on the Tk thread and cache it
+def cache_cover(url, image):
+    if image is not None and url not in image_cache:
+        image_cache[url] = ImageTk.PhotoImage(image)
+    return image_cache.get(url)
+
+
+# Show a loaded cover if its game is still the one selected
+def show_cover(game_id, url, image):
+    img = cache_cover(url, image)
+    selected = listbox.selection()
+    if not selected or selected[0] != game_id:
+        return
+
+    if img:
+        game_image_label.config(image=img, text="")
+        game_image_label.image = img  # Keep a reference
+    else:
+        game_image_label.config(image='', text="Image not available")
+
+
+# Prefetch covers of the games next to the selection in the list
+def prefetch_neighbour_covers(game_id, count=2):
+    neighbours = []
+    previous_id = next_id = game_id
+    for _ in range(count):
+        next_id = listbox.next(next_id) if next_id else ""
+        previous_id = listbox.prev(previous_id) if previous_id else ""
+        neighbours += [item for item in (next_id, previous_id) if item]
+
+    if not neighbours:
+        return
+
+    conn = connect()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT id, image_url FROM games WHERE id IN ({', '.join('?' * len(neighbours))})", neighbours)
+    rows = cursor.fetchall()
+    conn.close()
+
+    for neighbour_id, url in rows:
+        if url and url not in image_cache:
+            covers.request(str(neighbour_id), url, lambda image, url=url: cache_cover(url, image),
+                           cover_loader.NEIGHBOR)
 
-# Save local copies of images for offline use
-def save_image_locally(url, game_id):
-    if not os.path.exists("game_images"):
-        os.makedirs("game_images")
 
+# Hand finished cover loads to the UI
+def poll_covers():
+    covers.deliver()
+    root.after(50, poll_covers)
+
+
+# Save local copies of images for offline use; returns the cover's content hash.
+# A URL already stored for any game is linked instead of downloaded again.
+def save_image_locally(url, game_id):
+    conn = connect()
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            file_path = f"game_images/{game_id}.jpg"
-            with open(file_path, "wb") as f:
-                f.write(response.content)
-            return file_path
+        digest = cover_images.link_url(conn, game_id, url)
+        if digest is None:
+            data = rawg.get_image(url)
+            if not data:
+                return None
+            digest = cover_images.put(conn, game_id, url, data)
+        conn.commit()
+        return digest
     except Exception as e:
         print(f"Error saving image: {e}")
+    finally:
+        conn.close()
     return None
 
 
 # Enhanced API fetch with more details
 def fetch_game_details(game_name):
     try:
-        params = {"key": API_KEY, "search": game_name, "page_size": 10}
-        response = requests.get(BASE_URL, params=params)
-
-        if response.status_code == 200:
-            data = response.json()
-            if "results" in data and data["results"]:
-                games = data["results"]
-
-                # If multiple games, show selection dialog
-                if len(games) > 1:
-                    selected_game = game_selection_dialog(games)
-                    if not selected_game:
-                        return None  # User canceled selection
-                    game = selected_game
-                else:
-                    game = games[0]
-
-                # Get platforms and genres
-                platforms = ", ".join([p['platform']['name'] for p in game.get('platforms', []) if 'platform' in p][:3])
-                genres = ", ".join([g['name'] for g in game.get('genres', [])][:3])
-
-                return {
-                    "name": game["name"],
-                    "release_date": game.get("released", "N/A"),
-                    "rating": game.get("rating", 0.0),
-                    "image_url": game.get("background_image", ""),
-                    "platform": platforms,
-                    "genre": genres
-                }
+        games = rawg.search_games(game_name)
+
+        if games:
+            # If multiple games, show selection dialog
+            if len(games) > 1:
+                selected_game = game_selection_dialog(games)
+                if not selected_game:
+                    return None  # User canceled selection
+                game = selected_game
             else:
-                messagebox.showinfo("API Result", "No games found with that name.")
+                game = games[0]
+
+            return rawg.parse_game(game)
         else:
-            messagebox.showerror("API Error", f"Error {response.status_code}: Could not connect to game database")
+            messagebox.showinfo("API Result", "No games found with that name.")
+    except rawg.RawgError as e:
+        messagebox.showerror("API Error", str(e))
     except Exception as e:
         messagebox.showerror("Connection Error", f"Failed to connect to game database: {e}")
 
@@ -187,51 +269,25 @@ def add_game():
         game_data = fetch_game_details(game_name)
 
         if game_data:
-            # Get current date in YYYY-MM-DD format
-            current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-
-            conn = sqlite3.connect("games.db")
-            cursor = conn.cursor()
-
-            # Check if game already exists
-            cursor.execute("SELECT id FROM games WHERE name = ?", (game_data["name"],))
-            existing = cursor.fetchone()
-
-            if existing:
-                # Update existing game
-                cursor.execute("""UPDATE games SET 
-                                status = ?, 
-                                release_date = ?, 
-                                rating = ?, 
-                                image_url = ?,
-                                platform = ?,
-                                genre = ?,
-                                date_modified = ?
-                                WHERE name = ?""",
-                               (status, game_data["release_date"], game_data["rating"],
-                                game_data["image_url"], game_data["platform"], game_data["genre"],
-                                current_date, game_data["name"]))
-                messagebox.showinfo("Success", f"{game_data['name']} updated in your backlog!")
-            else:
-                # Insert new game
-                cursor.execute("""INSERT INTO games 
-                               (name, status, release_date, rating, image_url, platform, genre, date_added, date_modified) 
-                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                               (game_data["name"], status, game_data["release_date"],
-                                game_data["rating"], game_data["image_url"], game_data["platform"],
-                                game_data["genre"], current_date, current_date))
-
-                # Get the ID of the newly inserted game
-                game_id = cursor.lastrowid
+            conn = connect()
+            try:
+                game_id, created = backlog.save_game(conn, game_data, status)
+                conn.commit()
+            except sqlite3.IntegrityError:
+                messagebox.showwarning("Duplicate Game", "Another game with this name and release year already exists.")
+                status_label.config(text="")
+                return
+            finally:
+                conn.close()
 
-                # Save image locally in the background
-                if game_data["image_url"]:
-                    threading.Thread(target=lambda: save_image_locally(game_data["image_url"], game_id)).start()
+            # Save image locally in the background; an updated row may have a new cover
+            if game_data["image_url"]:
+                threading.Thread(target=lambda: save_image_locally(game_data["image_url"], game_id)).start()
 
+            if created:
                 messagebox.showinfo("Success", f"{game_data['name']} added to your backlog!")
-
-            conn.commit()
-            conn.close()
+            else:
+                messagebox.showinfo("Success", f"{game_data['name']} updated in your backlog!")
 
             # Reset UI elements
             entry_name.delete(0, tk.END)
@@ -246,92 +302,129 @@ def add_game():
     threading.Thread(target=fetch_and_add).start()
 
 
-# Update the listbox with games from database
-def update_list(listbox):
-    # Clear existing items
-    listbox.delete(0, tk.END)  # This is how you clear a Listbox
+# Format a games row for display in the list
+def format_list_row(row):
+    game_id, name, status, release_date, rating, platform, genre = row
 
-    # Connect to database and fetch games
-    conn = sqlite3.connect("games.db")
+    # Format release date
+    if release_date and release_date != "N/A":
+        try:
+            date_obj = datetime.datetime.strptime(release_date, "%Y-%m-%d")
+            release_date = date_obj.strftime("%b %d, %Y")
+        except:
+            pass
+
+    # Format rating
+    if rating:
+        rating = f"{rating:.1f}/5.0"
+    else:
+        rating = "N/A"
 
-    for item in listbox.get_children():
-        listbox.delete(item)
+    return name, status, release_date, rating, platform
 
-    # Connect to database and fetch games
-    conn = sqlite3.connect("games.db")
-    cursor = conn.cursor()
 
-    # Get filter values
-    status_filter = filter_status_var.get()
-    sort_by = sort_var.get()
-
-    # Build query based on filters
-    query = "SELECT id, name, status, release_date, rating, platform, genre FROM games"
-    params = []
-
-    if status_filter != "All":
-        query += " WHERE status = ?"
-        params.append(status_filter)
-
-    # Add sorting
-    if sort_by == "Name (A-Z)":
-        query += " ORDER BY name ASC"
-    elif sort_by == "Name (Z-A)":
-        query += " ORDER BY name DESC"
-    elif sort_by == "Rating (High-Low)":
-        query += " ORDER BY rating DESC"
-    elif sort_by == "Release Date (New-Old)":
-        query += " ORDER BY release_date DESC"
-    elif sort_by == "Release Date (Old-New)":
-        query += " ORDER BY release_date ASC"
-    elif sort_by == "Recently Added":
-        query += " ORDER BY date_added DESC"
-
-    cursor.execute(query, params)
+# Replace the list contents with [(id, values), ...]
+def populate_list(rows):
+    # Clear existing items
+    listbox.delete(*listbox.get_children())
 
     # Insert games into listbox
-    for row in cursor.fetchall():
-        game_id, name, status, release_date, rating, platform, genre = row
-
-        # Format release date
-        if release_date and release_date != "N/A":
-            try:
-                date_obj = datetime.datetime.strptime(release_date, "%Y-%m-%d")
-                release_date = date_obj.strftime("%b %d, %Y")
-            except:
-                pass
-
-        # Format rating
-        if rating:
-            rating = f"{rating:.1f}/5.0"
-        else:
-            rating = "N/A"
+    for game_id, values in rows:
+        listbox.insert("", tk.END, iid=str(game_id), values=values)
 
-        listbox.insert("", tk.END, iid=str(game_id), values=(name, status, release_date, rating, platform))
 
-    conn.close()
+# Update the listbox with games from database
+def update_list():
+    # Repeated filter/sort/search combinations are served from the cache
+    populate_list(list_cache.get(filter_status_var.get(), sort_var.get(), search_entry.get().lower()))
 
     # Update status bar
     update_status_bar()
 
 
-# Status bar updates
-def update_status_bar():
-    conn = sqlite3.connect("games.db")
-    cursor = conn.cursor()
+# Typeahead search: keystrokes are debounced, answered from memory when the
+# term extends a cached one, and otherwise queried on a worker thread whose
+# result is dropped (and whose query is interrupted) once a newer term arrives
+SEARCH_DEBOUNCE_MS = 150
+search_after_id = None
+search_generation = 0
+search_results = queue.Queue()
+
+
+def on_search_key(event):
+    global search_after_id
+    if search_after_id:
+        root.after_cancel(search_after_id)
+    search_after_id = root.after(SEARCH_DEBOUNCE_MS, run_live_search)
+
+
+def run_live_search():
+    global search_after_id, search_generation
+    search_after_id = None
+    search_generation += 1
+    generation = search_generation
+
+    view = (filter_status_var.get(), sort_var.get(), search_entry.get().lower())
+    list_cache.cancel()
+
+    rows = list_cache.peek(*view)
+    if rows is not None:
+        populate_list(rows)
+        return
+
+    def query_thread():
+        try:
+            search_results.put((generation, list_cache.get(*view)))
+        except sqlite3.OperationalError:
+            pass  # Interrupted by a newer search
+
+    threading.Thread(target=query_thread, daemon=True).start()
+    root.after(16, lambda: poll_search_results(generation))
+
+
+# Pick up worker results on the Tk thread, ignoring superseded ones
+def poll_search_results(generation):
+    while True:
+        try:
+            result_generation, rows = search_results.get_nowait()
+        except queue.Empty:
+            break
+        if result_generation == search_generation:
+            populate_list(rows)
+            return
+
+    # A newer search polls for itself (or was answered from memory)
+    if generation == search_generation:
+        root.after(16, lambda: poll_search_results(generation))
+
+
+# Prefetch RAWG suggestions while a name is typed, so Add Game can skip the request
+RAWG_PREFETCH_MS = 400
+prefetch_after_id = None
 
-    # Count games by status
-    cursor.execute("SELECT COUNT(*) FROM games WHERE status='Backlog'")
-    backlog_count = cursor.fetchone()[0]
 
-    cursor.execute("SELECT COUNT(*) FROM games WHERE status='Playing'")
-    playing_count = cursor.fetchone()[0]
+def on_name_key(event):
+    global prefetch_after_id
+    if prefetch_after_id:
+        root.after_cancel(prefetch_after_id)
 
-    cursor.execute("SELECT COUNT(*) FROM games WHERE status='Completed'")
-    completed_count = cursor.fetchone()[0]
+    game_name = entry_name.get().strip()
+    if len(game_name) >= 3:
+        prefetch_after_id = root.after(RAWG_PREFETCH_MS, lambda: rawg.prefetch_search(game_name))
+    else:
+        prefetch_after_id = None
+
+
+# Status bar updates
+def update_status_bar():
+    conn = connect()
 
-    cursor.execute("SELECT COUNT(*) FROM games")
-    total_count = cursor.fetchone()[0]
+    # Count games by status (kept current by triggers, see summary.py)
+    status_counts = summary.status_counts(conn)
+    backlog_count = status_counts["Backlog"]
+    playing_count = status_counts["Playing"]
+    completed_count = status_counts["Completed"]
+    total_count = summary.totals(conn)["games"]
 
     conn.close()
 
@@ -344,11 +437,14 @@ def show_game_details(event):
     selected = listbox.selection()
     if selected:
         game_id = selected[0]
+        metadata_refresher.note_viewed(game_id)
 
-        conn = sqlite3.connect("games.db")
+        conn = connect()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM games WHERE id = ?", (game_id,))
+        cursor.execute("""SELECT id, name, status, release_date, rating, image_url, platform, genre, playtime,
+                          notes, date_added, date_modified FROM games WHERE id = ?""", (game_id,))
         result = cursor.fetchone()
+        _, session_count, last_played = sessions.game_totals(conn, game_id)
         conn.close()
 
         if result:
@@ -371,6 +467,8 @@ def show_game_details(event):
             details_text += f"Platform: {platform}\n"
             details_text += f"Genre: {genre}\n"
             details_text += f"Playtime: {playtime} hours\n"
+            if session_count:
+                details_text += f"Sessions: {session_count} (last played {last_played[:10]})\n"
 
             if notes:
                 details_text += f"\nNotes: {notes}"
@@ -380,28 +478,22 @@ def show_game_details(event):
             # Show edit button
             edit_button.pack(side=tk.RIGHT, padx=5)
 
-            # Handle image
+            # Handle image; requests for the previous selection are now stale
+            covers.new_generation()
             if image_url:
-                img = get_cached_image(image_url)
+                img = image_cache.get(image_url)
                 if img:
-                    game_image_label.config(image=img)
+                    game_image_label.config(image=img, text="")
                     game_image_label.image = img  # Keep a reference
                 else:
                     game_image_label.config(image='', text="Loading image...")
-
-                    # Try to load the image in a separate thread
-                    def load_image_thread():
-                        img = get_cached_image(image_url)
-                        if img:
-                            game_image_label.config(image=img, text="")
-                            game_image_label.image = img
-                        else:
-                            game_image_label.config(text="Image not available")
-
-                    threading.Thread(target=load_image_thread).start()
+                    covers.request(game_id, image_url,
+                                   lambda image, url=image_url: show_cover(game_id, url, image))
             else:
                 game_image_label.config(image='', text="No image available")
 
+            prefetch_neighbour_covers(game_id)
+
         # Enable add playtime button
         add_playtime_button.config(state=tk.NORMAL)
     else:
@@ -412,33 +504,37 @@ def show_game_details(event):
         edit_button.pack_forget()
 
 
-# Delete selected game
+# Delete selected games
 def delete_game():
     selected = listbox.selection()
     if selected:
-        game_id = selected[0]
-
         # Get game name for confirmation message
-        conn = sqlite3.connect("games.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM games WHERE id = ?", (game_id,))
-        game_name = cursor.fetchone()[0]
-        conn.close()
+        if len(selected) == 1:
+            conn = connect()
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM games WHERE id = ?", (selected[0],))
+            prompt = f"Delete '{cursor.fetchone()[0]}' from your backlog?"
+            conn.close()
+        else:
+            prompt = f"Delete {len(selected)} games from your backlog?"
 
-        if messagebox.askyesno("Confirm", f"Delete '{game_name}' from your backlog?"):
-            conn = sqlite3.connect("games.db")
+        if messagebox.askyesno("Confirm", prompt):
+            conn = connect()
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM games WHERE id = ?", (game_id,))
+            cursor.executemany("DELETE FROM games WHERE id = ?", [(game_id,) for game_id in selected])
             conn.commit()
             conn.close()
 
-            # Delete local image if exists
-            image_path = f"game_images/{game_id}.jpg"
-            if os.path.exists(image_path):
-                try:
-                    os.remove(image_path)
-                except:
-                    pass
+            # Delete local images if they exist
+            for game_id in selected:
+                if cover_pack:
+                    cover_pack.delete(game_id)
+                image_path = os.path.join(IMAGE_DIR, f"{game_id}.jpg")
+                if os.path.exists(image_path):
+                    try:
+                        os.remove(image_path)
+                    except:
+                        pass
 
             update_list()
 
@@ -448,47 +544,54 @@ def delete_game():
             edit_button.pack_forget()
 
 
-# Change game status
-def change_status(new_status):
-    selected = listbox.selection()
-    if selected:
-        game_id = selected[0]
-
-        conn = sqlite3.connect("games.db")
-        cursor = conn.cursor()
-        cursor.execute("UPDATE games SET status = ?, date_modified = ? WHERE id = ?",
-                       (new_status, datetime.datetime.now().strftime("%Y-%m-%d"), game_id))
-        conn.commit()
-        conn.close()
-
+# Refresh the list and details once queued writes are committed
+def refresh_after_write(game_ids):
+    try:
+        selected = listbox.selection()
         update_list()
 
-        # Re-select the game to update the details panel
-        listbox.selection_set(game_id)
+        # Re-select the games to update the details panel
+        for game_id in selected:
+            if listbox.exists(game_id):
+                listbox.selection_add(game_id)
         show_game_details(None)
+    except tk.TclError:
+        pass  # Window already closed (final flush at exit)
 
 
-# Log playtime for a game
+# Change status of the selected games
+def change_status(new_status):
+    selected = listbox.selection()
+    if selected:
+        # Queued so that rapid or bulk retagging is committed in one transaction
+        pending_writes.set_fields(selected, status=new_status)
+
+
+# Log playtime for the selected games
 def add_playtime():
     selected = listbox.selection()
     if selected:
         game_id = selected[0]
 
-        # Get current playtime
-        conn = sqlite3.connect("games.db")
+        # Get current playtime, including hours not yet written
+        conn = connect()
         cursor = conn.cursor()
         cursor.execute("SELECT name, playtime FROM games WHERE id = ?", (game_id,))
         game_name, current_playtime = cursor.fetchone()
         conn.close()
+        current_playtime = (current_playtime or 0) + pending_writes.pending_playtime(game_id)
 
         # Create dialog for entering playtime
         dialog = tk.Toplevel(root)
-        dialog.title(f"Add Playtime - {game_name}")
+        dialog.title(f"Add Playtime - {game_name if len(selected) == 1 else f'{len(selected)} games'}")
         dialog.geometry("300x150")
         dialog.transient(root)
         dialog.grab_set()
 
-        tk.Label(dialog, text=f"Current playtime: {current_playtime} hours").pack(pady=(10, 5))
+        if len(selected) == 1:
+            tk.Label(dialog, text=f"Current playtime: {current_playtime} hours").pack(pady=(10, 5))
+        else:
+            tk.Label(dialog, text=f"Hours are added to each of {len(selected)} games").pack(pady=(10, 5))
         tk.Label(dialog, text="Add hours:").pack()
 
         hours_entry = tk.Entry(dialog, width=10)
@@ -502,20 +605,11 @@ def add_playtime():
                     messagebox.showwarning("Invalid Input", "Please enter a positive number.")
                     return
 
-                new_playtime = current_playtime + hours
-
-                conn = sqlite3.connect("games.db")
-                cursor = conn.cursor()
-                cursor.execute("UPDATE games SET playtime = ?, date_modified = ? WHERE id = ?",
-                               (new_playtime, datetime.datetime.now().strftime("%Y-%m-%d"), game_id))
-                conn.commit()
-                conn.close()
+                # Coalesced with other playtime edits; details refresh after the flush
+                pending_writes.add_playtime(selected, hours)
 
                 dialog.destroy()
 
-                # Update the details display
-                show_game_details(None)
-
             except ValueError:
                 messagebox.showwarning("Invalid Input", "Please enter a valid number.")
 
@@ -535,9 +629,10 @@ def edit_game_details():
     game_id = selected[0]
 
     # Fetch current game data
-    conn = sqlite3.connect("games.db")
+    conn = connect()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM games WHERE id = ?", (game_id,))
+    cursor.execute("""SELECT id, name, status, release_date, rating, image_url, platform, genre, playtime,
+                      notes, date_added, date_modified FROM games WHERE id = ?""", (game_id,))
     game_data = cursor.fetchone()
     conn.close()
 
@@ -642,20 +737,29 @@ def edit_game_details():
             new_notes = notes_text.get("1.0", tk.END).strip()
             new_image_url = image_entry.get()
 
+            # Queued edits must land before this one so they cannot overwrite it
+            pending_writes.flush()
+
             # Update database
-            conn = sqlite3.connect("games.db")
+            conn = connect()
             cursor = conn.cursor()
             cursor.execute("""UPDATE games SET 
-                           name = ?, status = ?, release_date = ?, rating = ?, 
+                           name = ?, name_key = ?, status = ?, release_date = ?, rating = ?, 
                            image_url = ?, platform = ?, genre = ?, playtime = ?, 
                            notes = ?, date_modified = ? 
                            WHERE id = ?""",
-                           (new_name, new_status, new_release_date, new_rating,
+                           (new_name, dedupe.name_key(new_name), new_status, new_release_date, new_rating,
                             new_image_url, new_platform, new_genre, new_playtime,
                             new_notes, datetime.datetime.now().strftime("%Y-%m-%d"), game_id))
+            if image_url and not new_image_url:
+                cover_images.unlink(conn, game_id)
             conn.commit()
             conn.close()
 
+            # Link (or download) the new cover in the background
+            if new_image_url and new_image_url != image_url:
+                threading.Thread(target=lambda: save_image_locally(new_image_url, game_id)).start()
+
             dialog.destroy()
             update_list()
 
@@ -663,6 +767,8 @@ def edit_game_details():
             listbox.selection_set(game_id)
             show_game_details(None)
 
+        except sqlite3.IntegrityError:
+            messagebox.showwarning("Duplicate Game", "Another game with this name and release year already exists.")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
 
@@ -676,96 +782,70 @@ def edit_game_details():
 
 # Search functionality
 def search_games():
-    search_term = search_entry.get().lower()
-
-    if not search_term:
-        update_list()  # If search is cleared, show all games
-        return
-
-    # Clear existing items
-    for item in listbox.get_children():
-        listbox.delete(item)
-
-    # Connect to database and search
-    conn = sqlite3.connect("games.db")
-    cursor = conn.cursor()
-
-    # Search in multiple columns
-    cursor.execute("""SELECT id, name, status, release_date, rating, platform, genre FROM games 
-                   WHERE LOWER(name) LIKE ? OR LOWER(platform) LIKE ? OR LOWER(genre) LIKE ?""",
-                   (f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"))
-
-    # Insert matching games into listbox
-    for row in cursor.fetchall():
-        game_id, name, status, release_date, rating, platform, genre = row
-
-        # Format release date
-        if release_date and release_date != "N/A":
-            try:
-                date_obj = datetime.datetime.strptime(release_date, "%Y-%m-%d")
-                release_date = date_obj.strftime("%b %d, %Y")
-            except:
-                pass
-
-        # Format rating
-        if rating:
-            rating = f"{rating:.1f}/5.0"
-        else:
-            rating = "N/A"
-
-        listbox.insert("", tk.END, iid=str(game_id), values=(name, status, release_date, rating, platform))
-
-    conn.close()
+    # The search term is part of the list cache key, so an empty term shows all games
+    update_list()
 
 
 # Export functionality
 def export_games():
-    # Ask for file location
+    # Ask for file location; the extension picks the format
     file_path = filedialog.asksaveasfilename(
         defaultextension=".csv",
-        filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+        filetypes=transfer.filetypes(export=True),
         title="Export Game List"
     )
 
     if not file_path:
         return  # User canceled
 
+    # Make sure queued edits are part of the export
+    pending_writes.flush()
+
     try:
-        # Connect to database
-        conn = sqlite3.connect("games.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM games")
-        rows = cursor.fetchall()
+        conn = connect()
+        try:
+            exported = transfer.export_games(conn, file_path)
+        finally:
+            conn.close()
 
-        # Get column names
-        cursor.execute("PRAGMA table_info(games)")
-        columns = [info[1] for info in cursor.fetchall()]
+        messagebox.showinfo("Export Successful", f"Exported {exported} games to {file_path}")
 
-        conn.close()
+    except Exception as e:
+        messagebox.showerror("Export Error", f"Failed to export games: {e}")
 
-        # Write to CSV
-        with open(file_path, 'w', newline='') as csvfile:
-            import csv
-            writer = csv.writer(csvfile)
 
-            # Write header
-            writer.writerow(columns)
+# Export only the games added, changed or deleted since the previous delta export
+def export_changes():
+    file_path = filedialog.asksaveasfilename(
+        defaultextension=".jsonl",
+        filetypes=[("JSON Lines", "*.jsonl"), ("CSV Files", "*.csv"), ("All Files", "*.*")],
+        title="Export Changes"
+    )
 
-            # Write data
-            for row in rows:
-                writer.writerow(row)
+    if not file_path:
+        return  # User canceled
+
+    pending_writes.flush()
+
+    try:
+        conn = connect()
+        try:
+            exported, checkpoint = changelog.export_delta(conn, file_path)
+            changelog.prune(conn)
+        finally:
+            conn.close()
 
-        messagebox.showinfo("Export Successful", f"Exported {len(rows)} games to {file_path}")
+        messagebox.showinfo("Export Successful", f"Exported {exported} changed games (checkpoint {checkpoint}).")
 
     except Exception as e:
-        messagebox.showerror("Export Error", f"Failed to export games: {e}")
+        messagebox.showerror("Export Error", f"Failed to export changes: {e}")
 
 
 # Import functionality
 def import_games():
-    # Ask for file location
+    # Ask for file location; CSV, JSON Lines, Parquet or another games.db
     file_path = filedialog.askopenfilename(
-        filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+        filetypes=transfer.filetypes(),
         title="Import Game List"
     )
 
@@ -773,235 +853,197 @@ def import_games():
         return  # User canceled
 
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            reader = csv.reader(file)
+        errors = []
+        conn = connect()
+        try:
+            if file_path.lower().endswith(".csv") and os.path.getsize(file_path) >= PARALLEL_IMPORT_BYTES:
+                imported, skipped = parallel_import.import_csv(
+                    conn, file_path, report=lambda line, message: errors.append(f"Line {line}: {message}"))
+            else:
+                imported, skipped = transfer.import_games(conn, file_path)
+        finally:
+            conn.close()
 
-            # Get header row
-            try:
-                header = next(reader)
-            except StopIteration:
-                messagebox.showerror("Import Error", "CSV file is empty")
-                return
+        update_list()
+        message = f"Imported {imported} games. Skipped {skipped} games (duplicates or invalid)."
+        if errors:
+            message += f"\n\n{len(errors)} invalid rows:\n" + "\n".join(errors[:10])
+            if len(errors) > 10:
+                message += f"\n... and {len(errors) - 10} more"
+        messagebox.showinfo("Import Successful", message)
+    except Exception as e:
+        messagebox.showerror("Import Error", f"Failed to import games: {e}")
 
-            # Convert header to lowercase for case-insensitive matching
-            header = [col.lower() for col in header]
 
-            # Get column indices
-            column_indices = {}
-            for i, column in enumerate(header):
-                column_indices[column] = i
+# Take a backup right away, without blocking writers. The paged copy and
+# gzip run on a worker thread (like BackupScheduler's) so the UI stays
+# responsive; the result is picked up on the Tk thread.
+backup_running = False
+backup_results = queue.Queue()
 
-            # Check required columns
-            required_columns = ["name", "status"]
-            for column in required_columns:
-                if column not in column_indices:
-                    messagebox.showerror("Import Error", f"Required column '{column}' not found in CSV file")
-                    return
 
-            # Optional columns
-            optional_columns = ["release_date", "rating", "image_url", "platform", "genre", "playtime", "notes"]
+def backup_now():
+    global backup_running
+    if backup_running:
+        messagebox.showinfo("Backup", "A backup is already running.")
+        return
 
-            # Connect to database
-            conn = sqlite3.connect("games.db")
-            cursor = conn.cursor()
+    pending_writes.flush()
+    backup_running = True
+    status_label.config(text="Backing up...")
 
-            # Import each row
-            imported = 0
-            skipped = 0
-            current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+    def backup_thread():
+        try:
+            backup_results.put((backup.backup_database(DB_PATH, BACKUP_DIR, compress=True), None))
+        except Exception as e:
+            backup_results.put((None, e))
 
-            try:
-                for row in reader:
-                    # Skip if row is too short
-                    if len(row) < len(required_columns):
-                        skipped += 1
-                        continue
-
-                    # Get required values
-                    name = row[column_indices["name"]]
-                    status = row[column_indices["status"]]
-
-                    # Skip if name is empty
-                    if not name:
-                        skipped += 1
-                        continue
-
-                    # Check if game already exists
-                    cursor.execute("SELECT id FROM games WHERE name = ?", (name,))
-                    existing = cursor.fetchone()
-                    if existing:
-                        # Skip existing games
-                        skipped += 1
-                        continue
-
-                    # Get optional values with defaults
-                    release_date = row[column_indices["release_date"]] if "release_date" in column_indices and len(
-                        row) > column_indices["release_date"] else "N/A"
-                    rating = row[column_indices["rating"]] if "rating" in column_indices and len(row) > column_indices[
-                        "rating"] else 0.0
-                    image_url = row[column_indices["image_url"]] if "image_url" in column_indices and len(row) > \
-                                                                    column_indices["image_url"] else ""
-                    platform = row[column_indices["platform"]] if "platform" in column_indices and len(row) > \
-                                                                  column_indices["platform"] else ""
-                    genre = row[column_indices["genre"]] if "genre" in column_indices and len(row) > column_indices[
-                        "genre"] else ""
-                    playtime = row[column_indices["playtime"]] if "playtime" in column_indices and len(row) > \
-                                                                  column_indices["playtime"] else 0
-                    notes = row[column_indices["notes"]] if "notes" in column_indices and len(row) > column_indices[
-                        "notes"] else ""
-
-                    # Convert rating to float
-                    try:
-                        rating = float(rating)
-                    except:
-                        rating = 0.0
+    threading.Thread(target=backup_thread, daemon=True).start()
+    root.after(100, poll_backup)
 
-                    # Convert playtime to float
-                    try:
-                        playtime = float(playtime)
-                    except:
-                        playtime = 0.0
 
-                    # Insert into database
-                    cursor.execute("""INSERT INTO games 
-                                      (name, status, release_date, rating, image_url, platform, genre, playtime, notes, date_added, date_modified) 
-                                      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                                   (name, status, release_date, rating, image_url, platform, genre, playtime, notes,
-                                    current_date, current_date))
-                    imported += 1
+def poll_backup():
+    global backup_running
+    try:
+        backup_path, error = backup_results.get_nowait()
+    except queue.Empty:
+        root.after(100, poll_backup)
+        return
 
-                conn.commit()
-                update_list()
-                messagebox.showinfo("Import Successful",
-                                    f"Imported {imported} games. Skipped {skipped} games (duplicates or invalid).")
-            except Exception as e:
-                messagebox.showerror("Import Error", f"Failed to import games: {e}")
-            finally:
-                conn.close()
-    except Exception as e:
-        messagebox.showerror("Import Error", f"Failed to open CSV file: {e}")
-    # Get required values
-    name = row[column_indices["name"]]
-    status = row[column_indices["status"]]
+    backup_running = False
+    status_label.config(text="")
+    if error:
+        messagebox.showerror("Backup Error", f"Failed to back up games: {error}")
+    else:
+        messagebox.showinfo("Backup Complete", f"Backup saved to {backup_path}")
 
-    # Skip if name is empty
-    if not name:
-        skipped += 1
-        # continue
-
-    # Check if game already exists
-    cursor.execute("SELECT id FROM games WHERE name = ?", (name,))
-    existing = cursor.fetchone()
-
-    if existing:
-        # Skip existing games
-        skipped += 1
-        # continue
-
-    # Get optional values with defaults
-    release_date = row[column_indices["release_date"]] if "release_date" in column_indices and len(row) > \
-                                                          column_indices["release_date"] else "N/A"
-    rating = row[column_indices["rating"]] if "rating" in column_indices and len(row) > column_indices[
-        "rating"] else 0.0
-    image_url = row[column_indices["image_url"]] if "image_url" in column_indices and len(row) > column_indices[
-        "image_url"] else ""
-    platform = row[column_indices["platform"]] if "platform" in column_indices and len(row) > column_indices[
-        "platform"] else ""
-    genre = row[column_indices["genre"]] if "genre" in column_indices and len(row) > column_indices["genre"] else ""
-    playtime = row[column_indices["playtime"]] if "playtime" in column_indices and len(row) > column_indices[
-        "playtime"] else 0
-    notes = row[column_indices["notes"]] if "notes" in column_indices and len(row) > column_indices["notes"] else ""
-
-    # Convert rating to float
-    try:
-        rating = float(rating)
-    except:
-        rating = 0.0
 
-    # Convert playtime to float
-    try:
-        playtime = float(playtime)
-    except:
-        playtime = 0.0
-
-    # Insert into database
-    cursor.execute("""INSERT INTO games 
-                                   (name, status, release_date, rating, image_url, platform, genre, playtime, notes, date_added, date_modified) 
-                                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                   (name, status, release_date, rating, image_url, platform, genre, playtime, notes, current_date,
-                    current_date))
-
-    imported += 1
-    conn.commit()
-    conn.close()
+# Restore the library from a verified backup
+def restore_games():
+    file_path = filedialog.askopenfilename(
+        initialdir=BACKUP_DIR,
+        filetypes=[("Backups", "*.db *.db.gz"), ("All Files", "*.*")],
+        title="Restore Backup"
+    )
 
+    if not file_path:
+        return  # User canceled
 
-# Update the list
-update_list(listbox=Treeview)
+    if not messagebox.askyesno("Confirm", "Replace your current library with this backup?"):
+        return
 
-try:
-    messagebox.showinfo("Import Successful", f"Imported {imported} games. Skipped {skipped} games (duplicates or invalid).")
-except Exception as e:
-    messagebox.showerror("Import Error", f"Failed to import games: {e}")
+    pending_writes.flush()
+    try:
+        backup.restore_backup(file_path, DB_PATH)
+        # Backups from older versions lack the newer tables, triggers and indexes
+        init_db()
+        list_cache.invalidate()
+        recommender.invalidate()
+        update_list()
+        update_progress()
+        messagebox.showinfo("Restore Complete", f"Library restored from {file_path}")
+    except Exception as e:
+        messagebox.showerror("Restore Error", f"Failed to restore backup: {e}")
 
-# Generate statistics
-def show_statistics():
-    # Connect to database
-    conn = sqlite3.connect("games.db")
-    cursor = conn.cursor()
 
-    # Get statistics
-    cursor.execute("SELECT COUNT(*) FROM games")
-    total_games = cursor.fetchone()[0]
+# Move game_images/{id}.jpg into the packed cover archive and compact it
+def pack_cover_images():
+    try:
+        store = cover_pack or cover_store.CoverStore(COVER_DIR)
+        # The loose files are only removed once the app actually reads from the pack
+        migrated = store.migrate_directory(IMAGE_DIR, remove=USE_PACKED_COVERS)
+        store.compact()
+        live_bytes, pack_bytes = store.usage()
+        if store is not cover_pack:
+            store.close()
+        messagebox.showinfo("Covers Packed", f"Packed {migrated} images ({pack_bytes / 1024:.0f} KB archive).")
+    except Exception as e:
+        messagebox.showerror("Pack Error", f"Failed to pack cover images: {e}")
 
-    cursor.execute("SELECT COUNT(*) FROM games WHERE status='Backlog'")
-    backlog_count = cursor.fetchone()[0]
 
-    cursor.execute("SELECT COUNT(*) FROM games WHERE status='Playing'")
-    playing_count = cursor.fetchone()[0]
+# Merge duplicate games and stop new ones from being added
+def merge_duplicates():
+    pending_writes.flush()
+    conn = connect()
+    try:
+        clusters, removed = dedupe.deduplicate(conn, dry_run=True)
+        if not clusters:
+            dedupe.deduplicate(conn)
+            messagebox.showinfo("Merge Duplicates", "No duplicate games found.")
+            return
+
+        if not messagebox.askyesno("Merge Duplicates",
+                                   f"Merge {removed + clusters} games into {clusters}? "
+                                   "Playtime and notes are combined."):
+            return
+        clusters, removed = dedupe.deduplicate(conn)
+    except Exception as e:
+        messagebox.showerror("Merge Error", f"Failed to merge duplicates: {e}")
+        return
+    finally:
+        conn.close()
 
-    cursor.execute("SELECT COUNT(*) FROM games WHERE status='Completed'")
-    completed_count = cursor.fetchone()[0]
+    list_cache.invalidate()
+    recommender.invalidate()
+    update_list()
+    update_progress()
+    messagebox.showinfo("Merge Duplicates", f"Merged {clusters} groups of duplicates ({removed} games removed).")
 
-    cursor.execute("SELECT SUM(playtime) FROM games")
-    total_playtime = cursor.fetchone()[0] or 0
 
-    cursor.execute("SELECT AVG(rating) FROM games WHERE rating > 0")
-    avg_rating = cursor.fetchone()[0] or 0
+# Generate statistics
+def show_statistics():
+    # Counts, totals and tag rankings are lookups in the trigger-kept summary table
+    conn = connect()
+    status_counts = summary.status_counts(conn)
+    totals = summary.totals(conn)
+    genres = summary.top_tags(conn, "genre", 3)
+    platforms = summary.top_tags(conn, "platform", 3)
+
+    total_games = totals["games"]
+    backlog_count = status_counts["Backlog"]
+    playing_count = status_counts["Playing"]
+    completed_count = status_counts["Completed"]
+    total_playtime = totals["playtime"]
+    avg_rating = summary.average_rating(conn)
+
+    # Top games and distributions come from the library loaded into arrays once
+    library = analytics.load_library(DB_PATH)
+    distributions = analytics.summarize(library)
+
+    # Only the names of the top games still come from SQLite
+    cursor = conn.cursor()
 
-    cursor.execute("SELECT name, rating FROM games WHERE rating = (SELECT MAX(rating) FROM games) LIMIT 1")
+    cursor.execute("SELECT name, rating FROM games WHERE id = ?", (distributions["top_rated_id"],))
     top_rated = cursor.fetchone()
     top_rated_game = top_rated[0] if top_rated else "None"
     top_rating = top_rated[1] if top_rated else 0
 
-    cursor.execute("SELECT name, playtime FROM games WHERE playtime = (SELECT MAX(playtime) FROM games) LIMIT 1")
+    cursor.execute("SELECT name, playtime FROM games WHERE id = ?", (distributions["most_played_id"],))
     most_played = cursor.fetchone()
     most_played_game = most_played[0] if most_played else "None"
     most_played_time = most_played[1] if most_played else 0
 
-    cursor.execute("SELECT genre, COUNT(*) FROM games WHERE genre != '' GROUP BY genre ORDER BY COUNT(*) DESC LIMIT 1")
-    top_genre = cursor.fetchone()
-    top_genre_name = top_genre[0] if top_genre else "None"
-    top_genre_count = top_genre[1] if top_genre else 0
+    # Recent trends come from the daily rollup of the session log
+    hours_month = sessions.hours_this_month(conn)
+    hours_week = sessions.hours_last_days(conn, 7)
 
-    cursor.execute(
-        "SELECT platform, COUNT(*) FROM games WHERE platform != '' GROUP BY platform ORDER BY COUNT(*) DESC LIMIT 1")
-    top_platform = cursor.fetchone()
-    top_platform_name = top_platform[0] if top_platform else "None"
-    top_platform_count = top_platform[1] if top_platform else 0
+    conn.close()
 
-    cursor.execute(
-        "SELECT SUBSTR(release_date, 1, 4) as year, COUNT(*) FROM games WHERE release_date != 'N/A' GROUP BY year ORDER BY COUNT(*) DESC LIMIT 1")
-    top_year = cursor.fetchone()
-    top_year_value = top_year[0] if top_year else "None"
-    top_year_count = top_year[1] if top_year else 0
+    top_genre_name, top_genre_count = genres[0][:2] if genres else ("None", 0)
+    top_platform_name, top_platform_count = platforms[0][:2] if platforms else ("None", 0)
 
-    conn.close()
+    years, year_counts = distributions["release_years"]
+    if len(years):
+        top_year_value = int(years[year_counts.argmax()])
+        top_year_count = int(year_counts.max())
+    else:
+        top_year_value = "None"
+        top_year_count = 0
 
     # Create statistics window
     stats_window = tk.Toplevel(root)
     stats_window.title("Backlog Statistics")
-    stats_window.geometry("400x500")
+    stats_window.geometry("450x800")
     stats_window.transient(root)
 
     # Main frame
@@ -1039,6 +1081,8 @@ def show_statistics():
              fg="white", bg="#2c3e50", anchor="w").pack(fill=tk.X)
     tk.Label(playtime_frame, text=f"Most Played Game: {most_played_game} ({most_played_time:.1f} hours)",
              fg="white", bg="#2c3e50", anchor="w").pack(fill=tk.X)
+    tk.Label(playtime_frame, text=f"Hours This Month: {hours_month:.1f} | Last 7 Days: {hours_week:.1f}",
+             fg="white", bg="#2c3e50", anchor="w").pack(fill=tk.X)
 
     # Ratings statistics
     ratings_frame = tk.LabelFrame(main_frame, text="Ratings", padx=10, pady=10, fg="white", bg="#2c3e50")
@@ -1060,23 +1104,137 @@ def show_statistics():
     tk.Label(trends_frame, text=f"Most Common Release Year: {top_year_value} ({top_year_count} games)",
              fg="white", bg="#2c3e50", anchor="w").pack(fill=tk.X)
 
+    # Distributions
+    distribution_frame = tk.LabelFrame(main_frame, text="Distributions", padx=10, pady=10, fg="white", bg="#2c3e50")
+    distribution_frame.pack(fill=tk.X, pady=5)
+
+    percentiles = distributions["playtime_percentiles"]
+    percentile_text = " | ".join(f"p{p}: {hours:.1f}h" for p, hours in percentiles.items())
+    tk.Label(distribution_frame, text=f"Playtime Percentiles: {percentile_text}",
+             fg="white", bg="#2c3e50", anchor="w").pack(fill=tk.X)
+
+    rating_counts, rating_edges = distributions["rating_histogram"]
+    rating_text = " ".join(f"{rating_edges[i]:.1f}+:{count}" for i, count in enumerate(rating_counts) if count)
+    tk.Label(distribution_frame, text=f"Ratings: {rating_text or 'None'}",
+             fg="white", bg="#2c3e50", anchor="w", wraplength=380, justify=tk.LEFT).pack(fill=tk.X)
+
+    age_counts, age_edges = distributions["backlog_age"]
+    age_text = " | ".join(f"{int(age_edges[i])}+ days: {count}" for i, count in enumerate(age_counts) if count)
+    tk.Label(distribution_frame, text=f"Backlog Age: {age_text or 'None'}",
+             fg="white", bg="#2c3e50", anchor="w", wraplength=380, justify=tk.LEFT).pack(fill=tk.X)
+
+    # Completion rates for the most common genres and platforms
+    completion_frame = tk.LabelFrame(main_frame, text="Completion Rates", padx=10, pady=10, fg="white", bg="#2c3e50")
+    completion_frame.pack(fill=tk.X, pady=5)
+
+    for label, rates in (("Genre", genres), ("Platform", platforms)):
+        for name, total, completed, rate in rates:
+            tk.Label(completion_frame, text=f"{label} {name}: {completed}/{total} completed ({rate * 100:.1f}%)",
+                     fg="white", bg="#2c3e50", anchor="w").pack(fill=tk.X)
+
     # Close button
     tk.Button(main_frame, text="Close", command=stats_window.destroy, bg="#e74c3c", fg="white", width=15).pack(pady=15)
 
 
-# Progress calculation
-def calculate_completion_rate():
-    conn = sqlite3.connect("games.db")
+# RAWG requests made today against the daily quota, and how each class fared in this session
+def show_rawg_usage():
+    metrics = rawg.scheduler.metrics()
+
+    window = tk.Toplevel(root)
+    window.title("RAWG Usage")
+    window.geometry("520x300")
+    window.transient(root)
+
+    main_frame = tk.Frame(window, padx=15, pady=15, bg="#34495e")
+    main_frame.pack(fill=tk.BOTH, expand=True)
+
+    tk.Label(main_frame,
+             text=f"Requests today: {metrics['used']}/{metrics['daily_quota']} ({metrics['remaining']} remaining)",
+             fg="white", bg="#34495e", anchor="w").pack(fill=tk.X)
+    throttle_text = f"Rate limited by RAWG: {metrics['throttled']} times"
+    if metrics["blocked_for"]:
+        throttle_text += f" (paused for {metrics['blocked_for']:.0f}s)"
+    tk.Label(main_frame, text=throttle_text, fg="white", bg="#34495e", anchor="w").pack(fill=tk.X, pady=(0, 10))
+
+    columns = ("Class", "Requests", "Refused", "Avg Wait", "Max Wait")
+    usage = ttk.Treeview(main_frame, columns=columns, show="headings", height=4)
+    for column in columns:
+        usage.heading(column, text=column)
+        usage.column(column, width=90)
+    usage.pack(fill=tk.BOTH, expand=True)
+
+    for name, counts in metrics["classes"].items():
+        average = counts["waited"] / counts["requests"] if counts["requests"] else 0.0
+        usage.insert("", tk.END, values=(name.title(), counts["requests"], counts["rejected"], f"{average:.2f}s",
+                                         f"{counts['max_wait']:.2f}s"))
+
+    tk.Button(main_frame, text="Close", command=window.destroy, bg="#e74c3c", fg="white", width=15).pack(pady=15)
+
+
+# Backlog games most similar to what the user finished and enjoyed
+def show_recommendations():
+    pending_writes.flush()
+    try:
+        ranked = recommender.rank(15)
+    except Exception as e:
+        messagebox.showerror("Error", f"Could not compute recommendations: {e}")
+        return
+
+    if not ranked:
+        messagebox.showinfo("What to Play Next",
+                            "Complete a few games and keep some in your backlog to get suggestions.")
+        return
+
+    conn = connect()
     cursor = conn.cursor()
+    cursor.execute(f"SELECT id, name, genre, platform FROM games WHERE id IN ({', '.join('?' * len(ranked))})",
+                   [game_id for game_id, _ in ranked])
+    games = {row[0]: row[1:] for row in cursor.fetchall()}
+    conn.close()
+
+    window = tk.Toplevel(root)
+    window.title("What to Play Next")
+    window.geometry("600x420")
+    window.transient(root)
 
-    cursor.execute("SELECT COUNT(*) FROM games")
-    total = cursor.fetchone()[0]
+    main_frame = tk.Frame(window, padx=15, pady=15, bg="#34495e")
+    main_frame.pack(fill=tk.BOTH, expand=True)
+
+    tk.Label(main_frame, text="Suggested From Your Backlog", font=("Arial", 16, "bold"), fg="white",
+             bg="#34495e").pack(pady=(0, 15))
+
+    suggestions = ttk.Treeview(main_frame, columns=("Name", "Genre", "Platform", "Match"), show="headings", height=12)
+    for column, width in (("Name", 180), ("Genre", 150), ("Platform", 150), ("Match", 60)):
+        suggestions.heading(column, text=column)
+        suggestions.column(column, width=width)
+    suggestions.pack(fill=tk.BOTH, expand=True)
+
+    for game_id, score in ranked:
+        if game_id in games:
+            name, genre, platform = games[game_id]
+            suggestions.insert("", tk.END, iid=str(game_id), values=(name, genre, platform, f"{score * 100:.0f}%"))
+
+    # Double-click shows the game in the main list
+    def select_game(event):
+        selected = suggestions.selection()
+        if selected and listbox.exists(selected[0]):
+            listbox.selection_set(selected[0])
+            listbox.see(selected[0])
 
-    cursor.execute("SELECT COUNT(*) FROM games WHERE status='Completed'")
-    completed = cursor.fetchone()[0]
+    suggestions.bind("<Double-1>", select_game)
 
+    tk.Button(main_frame, text="Close", command=window.destroy, bg="#e74c3c", fg="white", width=15).pack(pady=15)
+
+
+# Progress calculation
+def calculate_completion_rate():
+    conn = connect()
+    totals = summary.totals(conn)
     conn.close()
 
+    total = totals["games"]
+    completed = totals["completed"]
+
     if total > 0:
         return completed / total * 100
     return 0
@@ -1089,203 +1247,363 @@ def update_progress():
     progress_label.config(text=f"Completion Rate: {completion_rate:.1f}%")
 
 
-# GUI Setup
-root = tk.Tk()
-root.title("Advanced Gaming Backlog Tracker")
-root.geometry("950x650")
-root.configure(bg="#2c3e50")
-
-# Create a menu bar
-menu_bar = tk.Menu(root)
-root.config(menu=menu_bar)
-
-# File menu
-file_menu = tk.Menu(menu_bar, tearoff=0)
-menu_bar.add_cascade(label="File", menu=file_menu)
-file_menu.add_command(label="Export Games", command=export_games)
-file_menu.add_command(label="Import Games", command=import_games)
-file_menu.add_separator()
-file_menu.add_command(label="Exit", command=root.quit)
-
-# View menu
-view_menu = tk.Menu(menu_bar, tearoff=0)
-menu_bar.add_cascade(label="View", menu=view_menu)
-view_menu.add_command(label="Statistics", command=show_statistics)
-view_menu.add_command(label="Refresh", command=update_list)
-
-# Main container
-main_container = tk.Frame(root, bg="#34495e")
-main_container.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
-
-# Left side - Game entry and filters
-left_frame = tk.Frame(main_container, bg="#34495e", width=300)
-left_frame.pack(side=tk.LEFT, padx=10, pady=10, fill=tk.Y)
-
-# Game entry section
-entry_frame = tk.LabelFrame(left_frame, text="Add Game", padx=10, pady=10, fg="white", bg="#34495e")
-entry_frame.pack(fill=tk.X, pady=(0, 10))
-
-tk.Label(entry_frame, text="Game Name:", fg="white", bg="#34495e").grid(row=0, column=0, sticky=tk.W, pady=5)
-entry_name = tk.Entry(entry_frame, width=25)
-entry_name.grid(row=0, column=1, pady=5)
-
-tk.Label(entry_frame, text="Status:", fg="white", bg="#34495e").grid(row=1, column=0, sticky=tk.W, pady=5)
-status_var = tk.StringVar()
-status_var.set("Backlog")
-status_menu = ttk.Combobox(entry_frame, textvariable=status_var, values=["Backlog", "Playing", "Completed"], width=22)
-status_menu.grid(row=1, column=1, pady=5)
-
-add_button = tk.Button(entry_frame, text="Add Game", command=add_game, bg="#1abc9c", fg="white")
-add_button.grid(row=2, column=0, columnspan=2, pady=10, sticky=tk.EW)
-
-# Status indicator
-status_label = tk.Label(entry_frame, text="", fg="white", bg="#34495e")
-status_label.grid(row=3, column=0, columnspan=2, pady=5, sticky=tk.W)
-
-# Filters section
-filter_frame = tk.LabelFrame(left_frame, text="Filters", padx=10, pady=10, fg="white", bg="#34495e")
-filter_frame.pack(fill=tk.X, pady=10)
-
-tk.Label(filter_frame, text="Status:", fg="white", bg="#34495e").grid(row=0, column=0, sticky=tk.W, pady=5)
-filter_status_var = tk.StringVar()
-filter_status_var.set("All")
-filter_status_menu = ttk.Combobox(filter_frame, textvariable=filter_status_var,
-                                  values=["All", "Backlog", "Playing", "Completed"], width=22)
-filter_status_menu.grid(row=0, column=1, pady=5)
-
-tk.Label(filter_frame, text="Sort By:", fg="white", bg="#34495e").grid(row=1, column=0, sticky=tk.W, pady=5)
-sort_var = tk.StringVar()
-sort_var.set("Name (A-Z)")
-sort_menu = ttk.Combobox(filter_frame, textvariable=sort_var,
-                         values=["Name (A-Z)", "Name (Z-A)", "Rating (High-Low)",
-                                 "Release Date (New-Old)", "Release Date (Old-New)", "Recently Added"], width=22)
-sort_menu.grid(row=1, column=1, pady=5)
-
-apply_button = tk.Button(filter_frame, text="Apply Filters", command=update_list, bg="#3498db", fg="white")
-apply_button.grid(row=2, column=0, columnspan=2, pady=10, sticky=tk.EW)
-
-# Search section
-search_frame = tk.LabelFrame(left_frame, text="Search", padx=10, pady=10, fg="white", bg="#34495e")
-search_frame.pack(fill=tk.X, pady=10)
-
-search_entry = tk.Entry(search_frame, width=25)
-search_entry.pack(fill=tk.X, pady=5)
-
-search_button = tk.Button(search_frame, text="Search", command=search_games, bg="#9b59b6", fg="white")
-search_button.pack(fill=tk.X, pady=5)
-
-# Progress section
-progress_frame = tk.LabelFrame(left_frame, text="Progress", padx=10, pady=10, fg="white", bg="#34495e")
-progress_frame.pack(fill=tk.X, pady=10)
-
-progress_bar = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL, length=100, mode='determinate')
-progress_bar.pack(fill=tk.X, pady=5)
-
-progress_label = tk.Label(progress_frame, text="Completion Rate: 0.0%", fg="white", bg="#34495e")
-progress_label.pack(pady=5)
-
-# Right side - Game list and details
-right_frame = tk.Frame(main_container, bg="#34495e")
-right_frame.pack(side=tk.LEFT, padx=10, pady=10, fill=tk.BOTH, expand=True)
-
-# Game list
-list_frame = tk.Frame(right_frame, bg="#34495e")
-list_frame.pack(fill=tk.BOTH, expand=True)
-
-# Create Treeview with scrollbar
-tree_frame = tk.Frame(list_frame)
-tree_frame.pack(fill=tk.BOTH, expand=True)
-
-tree_scroll = tk.Scrollbar(tree_frame)
-tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-
-listbox: Treeview = ttk.Treeview(tree_frame, columns=("Name", "Status", "Release Date", "Rating", "Platform"), show="headings",
-                       yscrollcommand=tree_scroll.set)
-listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-tree_scroll.config(command=listbox.yview)
-
-# Define column widths
-listbox.column("Name", width=150)
-listbox.column("Status", width=80)
-listbox.column("Release Date", width=100)
-listbox.column("Rating", width=80)
-listbox.column("Platform", width=120)
-
-# Add column headings
-listbox.heading("Name", text="Game Name")
-listbox.heading("Status", text="Status")
-listbox.heading("Release Date", text="Release Date")
-listbox.heading("Rating", text="Rating")
-listbox.heading("Platform", text="Platform")
-
-# Bind selection event
-listbox.bind("<<TreeviewSelect>>", show_game_details)
-
-# Button frame
-button_frame = tk.Frame(list_frame, bg="#34495e")
-button_frame.pack(fill=tk.X, pady=5)
-
-# Action buttons
-delete_button = tk.Button(button_frame, text="Delete", command=delete_game, bg="#e74c3c", fg="white")
-delete_button.pack(side=tk.LEFT, padx=5)
-
-backlog_button = tk.Button(button_frame, text="Set as Backlog", command=lambda: change_status("Backlog"), bg="#f39c12",
-                           fg="white")
-backlog_button.pack(side=tk.LEFT, padx=5)
-
-playing_button = tk.Button(button_frame, text="Set as Playing", command=lambda: change_status("Playing"), bg="#2ecc71",
-                           fg="white")
-playing_button.pack(side=tk.LEFT, padx=5)
-
-completed_button = tk.Button(button_frame, text="Set as Completed", command=lambda: change_status("Completed"),
-                             bg="#3498db", fg="white")
-completed_button.pack(side=tk.LEFT, padx=5)
-
-add_playtime_button = tk.Button(button_frame, text="Log Playtime", command=add_playtime, bg="#9b59b6", fg="white",
-                                state=tk.DISABLED)
-add_playtime_button.pack(side=tk.LEFT, padx=5)
-
-edit_button = tk.Button(button_frame, text="Edit Details", command=edit_game_details, bg="#16a085", fg="white")
-# Don't pack the edit button yet - we'll show it only when a game is selected
-
-# Game details section
-details_frame = tk.Frame(right_frame, bg="#34495e", height=200)
-details_frame.pack(fill=tk.X, pady=10)
-
-# Game image on the left
-game_image_label = tk.Label(details_frame, bg="#2c3e50", width=25, height=15)
-game_image_label.pack(side=tk.LEFT, padx=10, pady=10)
-
-# Game details on the right
-game_details_label = tk.Label(details_frame, text="", fg="white", bg="#2c3e50", justify=tk.LEFT, anchor="nw", padx=10,
-                              pady=10)
-game_details_label.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-# Status bar
-status_bar = tk.Label(root, text="", bd=1, relief=tk.SUNKEN, anchor=tk.W, bg="#2c3e50", fg="white")
-status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-# Initialization
-init_db()
-update_list()
-update_progress()
+# Flush pending writes before the window goes away
+def close_app():
+    close_library()
+    image_workers.shutdown()
+    library_registry.close()
+    root.destroy()
+
+
+# Stop the open library's background jobs and write out anything queued
+def close_library():
+    metadata_refresher.stop()
+    backup_scheduler.stop()
+    pending_writes.flush()
+    list_cache.close()
+
+    # Covers of games deleted or merged away this session
+    conn = connect()
+    try:
+        cover_images.gc(conn)
+    except Exception as e:
+        print(f"Error collecting covers: {e}")
+    finally:
+        conn.close()
+    if cover_pack:
+        cover_pack.close()
+
+
+# Point the whole app (list, writes, covers, background jobs) at one library
+def open_library(name):
+    global current_library, DB_PATH, IMAGE_DIR, COVER_DIR, BACKUP_DIR, cover_pack, cover_images
+    global pending_writes, list_cache, recommender, metadata_refresher, backup_scheduler
+
+    current_library = name
+    DB_PATH = library_registry.path(name)
+    folder = library_registry.folder(name)
+    IMAGE_DIR = os.path.join(folder, "game_images")
+    COVER_DIR = os.path.join(folder, "covers")
+    BACKUP_DIR = os.path.join(folder, backup.BACKUP_DIR)
+    cover_pack = cover_store.CoverStore(COVER_DIR) if USE_PACKED_COVERS else None
+    cover_images = image_store.ImageStore(os.path.join(folder, IMAGE_STORE_DIR), cover_pack)
+
+    init_db()
+
+    # Queued status/playtime writes, flushed on the Tk event loop
+    pending_writes = write_queue.WriteBehindQueue(DB_PATH, schedule=root.after, on_flush=refresh_after_write)
+    # The list paints from last session's snapshot until the games table changes
+    list_cache = query_cache.QueryCache(DB_PATH, format_row=format_list_row,
+                                        snapshot_path=os.path.join(folder, LIST_SNAPSHOT))
+    recommender = recommend.Recommender(DB_PATH)
+
+    # Refresh stale RAWG metadata in the background, within a request budget
+    metadata_refresher = refresh.RefreshScheduler(
+        DB_PATH, on_image_changed=lambda game_id, url: save_image_locally(url, game_id))
+    metadata_refresher.start()
+
+    # Daily compressed backups, taken in the background
+    backup_scheduler = backup.BackupScheduler(DB_PATH, interval_hours=24, backup_dir=BACKUP_DIR)
+    backup_scheduler.start()
+
+    root.title(f"Advanced Gaming Backlog Tracker - {name}" if name != libraries.DEFAULT_LIBRARY
+               else "Advanced Gaming Backlog Tracker")
+
+
+# Switch to another library from the Library menu
+def switch_library(name):
+    if name == current_library:
+        return
+
+    close_library()
+    covers.new_generation()
+    open_library(name)
+
+    game_image_label.config(image='', text="")
+    game_details_label.config(text="")
+    edit_button.pack_forget()
+    update_list()
+    update_progress()
+    update_library_menu()
+
+
+# Create a library and switch to it
+def new_library():
+    name = simpledialog.askstring("New Library", "Library name (letters, digits, '-' and '_'):", parent=root)
+    if not name:
+        return
+
+    try:
+        library_registry.create(name.strip())
+    except ValueError as e:
+        messagebox.showerror("Library Error", str(e))
+        return
+    switch_library(name.strip())
+
+
+# Game counts of every library side by side, gathered with one ATTACHed query per batch
+def show_library_overview():
+    pending_writes.flush()
+    try:
+        summaries = library_registry.summaries()
+    except Exception as e:
+        messagebox.showerror("Error", f"Could not read libraries: {e}")
+        return
+
+    window = tk.Toplevel(root)
+    window.title("All Libraries")
+    window.geometry("560x360")
+    window.transient(root)
+
+    main_frame = tk.Frame(window, padx=15, pady=15, bg="#34495e")
+    main_frame.pack(fill=tk.BOTH, expand=True)
 
-# Add bindings to automatically refresh when filters change
-filter_status_menu.bind("<<ComboboxSelected>>", lambda e: update_list())
-sort_menu.bind("<<ComboboxSelected>>", lambda e: update_list())
-search_entry.bind("<Return>", lambda e: search_games())
-
-# Set up keyboard shortcuts
-root.bind("<Control-a>", lambda e: add_game())
-root.bind("<Delete>", lambda e: delete_game())
-root.bind("<Control-f>", lambda e: search_entry.focus_set())
-
-# Configure style for ttk elements
-style = ttk.Style()
-style.configure("Treeview", background="#2c3e50", fieldbackground="#2c3e50", foreground="white")
-style.configure("Treeview.Heading", background="#34495e", foreground="white", font=('Arial', 9, 'bold'))
-style.map('Treeview', background=[('selected', '#3498db')])
-
-# Start the main loop
-root.mainloop()
\ No newline at end of file
+    columns = ("Library", "Games", "Backlog", "Playing", "Completed", "Hours")
+    overview = ttk.Treeview(main_frame, columns=columns, show="headings", height=10)
+    for column in columns:
+        overview.heading(column, text=column)
+        overview.column(column, width=85)
+    overview.pack(fill=tk.BOTH, expand=True)
+
+    for row in summaries:
+        overview.insert("", tk.END, values=row)
+    totals = [sum(row[i] for row in summaries) for i in range(1, len(columns))]
+    overview.insert("", tk.END, values=("All", *totals))
+
+    tk.Button(main_frame, text="Close", command=window.destroy, bg="#e74c3c", fg="white", width=15).pack(pady=15)
+
+
+# Rebuild the Library menu's list of libraries
+def update_library_menu():
+    library_menu.delete(0, tk.END)
+    selected_library.set(current_library)
+    for name in library_registry.names():
+        library_menu.add_radiobutton(label=name, variable=selected_library, value=name,
+                                     command=lambda name=name: switch_library(name))
+    library_menu.add_separator()
+    library_menu.add_command(label="New Library...", command=new_library)
+    library_menu.add_command(label="All Libraries", command=show_library_overview)
+
+
+# The GUI only starts when run directly, so worker processes can import this module safely
+if __name__ == "__main__":
+    # GUI Setup
+    root = tk.Tk()
+    root.title("Advanced Gaming Backlog Tracker")
+    root.geometry("950x650")
+    root.configure(bg="#2c3e50")
+    root.protocol("WM_DELETE_WINDOW", close_app)
+
+    # Create a menu bar
+    menu_bar = tk.Menu(root)
+    root.config(menu=menu_bar)
+
+    # File menu
+    file_menu = tk.Menu(menu_bar, tearoff=0)
+    menu_bar.add_cascade(label="File", menu=file_menu)
+    file_menu.add_command(label="Export Games", command=export_games)
+    file_menu.add_command(label="Export Changes", command=export_changes)
+    file_menu.add_command(label="Import Games", command=import_games)
+    file_menu.add_command(label="Pack Cover Images", command=pack_cover_images)
+    file_menu.add_command(label="Merge Duplicates", command=merge_duplicates)
+    file_menu.add_separator()
+    file_menu.add_command(label="Backup Now", command=backup_now)
+    file_menu.add_command(label="Restore Backup", command=restore_games)
+    file_menu.add_separator()
+    file_menu.add_command(label="Exit", command=close_app)
+
+    # View menu
+    view_menu = tk.Menu(menu_bar, tearoff=0)
+    menu_bar.add_cascade(label="View", menu=view_menu)
+    view_menu.add_command(label="Statistics", command=show_statistics)
+    view_menu.add_command(label="What to Play Next", command=show_recommendations)
+    view_menu.add_command(label="RAWG Usage", command=show_rawg_usage)
+    view_menu.add_command(label="Refresh", command=update_list)
+
+    # Library menu
+    library_menu = tk.Menu(menu_bar, tearoff=0)
+    menu_bar.add_cascade(label="Library", menu=library_menu)
+    selected_library = tk.StringVar()
+
+    # Main container
+    main_container = tk.Frame(root, bg="#34495e")
+    main_container.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+    # Left side - Game entry and filters
+    left_frame = tk.Frame(main_container, bg="#34495e", width=300)
+    left_frame.pack(side=tk.LEFT, padx=10, pady=10, fill=tk.Y)
+
+    # Game entry section
+    entry_frame = tk.LabelFrame(left_frame, text="Add Game", padx=10, pady=10, fg="white", bg="#34495e")
+    entry_frame.pack(fill=tk.X, pady=(0, 10))
+
+    tk.Label(entry_frame, text="Game Name:", fg="white", bg="#34495e").grid(row=0, column=0, sticky=tk.W, pady=5)
+    entry_name = tk.Entry(entry_frame, width=25)
+    entry_name.grid(row=0, column=1, pady=5)
+
+    tk.Label(entry_frame, text="Status:", fg="white", bg="#34495e").grid(row=1, column=0, sticky=tk.W, pady=5)
+    status_var = tk.StringVar()
+    status_var.set("Backlog")
+    status_menu = ttk.Combobox(entry_frame, textvariable=status_var, values=["Backlog", "Playing", "Completed"], width=22)
+    status_menu.grid(row=1, column=1, pady=5)
+
+    add_button = tk.Button(entry_frame, text="Add Game", command=add_game, bg="#1abc9c", fg="white")
+    add_button.grid(row=2, column=0, columnspan=2, pady=10, sticky=tk.EW)
+
+    # Status indicator
+    status_label = tk.Label(entry_frame, text="", fg="white", bg="#34495e")
+    status_label.grid(row=3, column=0, columnspan=2, pady=5, sticky=tk.W)
+
+    # Filters section
+    filter_frame = tk.LabelFrame(left_frame, text="Filters", padx=10, pady=10, fg="white", bg="#34495e")
+    filter_frame.pack(fill=tk.X, pady=10)
+
+    tk.Label(filter_frame, text="Status:", fg="white", bg="#34495e").grid(row=0, column=0, sticky=tk.W, pady=5)
+    filter_status_var = tk.StringVar()
+    filter_status_var.set("All")
+    filter_status_menu = ttk.Combobox(filter_frame, textvariable=filter_status_var,
+                                      values=["All", "Backlog", "Playing", "Completed"], width=22)
+    filter_status_menu.grid(row=0, column=1, pady=5)
+
+    tk.Label(filter_frame, text="Sort By:", fg="white", bg="#34495e").grid(row=1, column=0, sticky=tk.W, pady=5)
+    sort_var = tk.StringVar()
+    sort_var.set("Name (A-Z)")
+    sort_menu = ttk.Combobox(filter_frame, textvariable=sort_var,
+                             values=["Name (A-Z)", "Name (Z-A)", "Rating (High-Low)",
+                                     "Release Date (New-Old)", "Release Date (Old-New)", "Recently Added"], width=22)
+    sort_menu.grid(row=1, column=1, pady=5)
+
+    apply_button = tk.Button(filter_frame, text="Apply Filters", command=update_list, bg="#3498db", fg="white")
+    apply_button.grid(row=2, column=0, columnspan=2, pady=10, sticky=tk.EW)
+
+    # Search section
+    search_frame = tk.LabelFrame(left_frame, text="Search", padx=10, pady=10, fg="white", bg="#34495e")
+    search_frame.pack(fill=tk.X, pady=10)
+
+    search_entry = tk.Entry(search_frame, width=25)
+    search_entry.pack(fill=tk.X, pady=5)
+
+    search_button = tk.Button(search_frame, text="Search", command=search_games, bg="#9b59b6", fg="white")
+    search_button.pack(fill=tk.X, pady=5)
+
+    # Progress section
+    progress_frame = tk.LabelFrame(left_frame, text="Progress", padx=10, pady=10, fg="white", bg="#34495e")
+    progress_frame.pack(fill=tk.X, pady=10)
+
+    progress_bar = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL, length=100, mode='determinate')
+    progress_bar.pack(fill=tk.X, pady=5)
+
+    progress_label = tk.Label(progress_frame, text="Completion Rate: 0.0%", fg="white", bg="#34495e")
+    progress_label.pack(pady=5)
+
+    # Right side - Game list and details
+    right_frame = tk.Frame(main_container, bg="#34495e")
+    right_frame.pack(side=tk.LEFT, padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+    # Game list
+    list_frame = tk.Frame(right_frame, bg="#34495e")
+    list_frame.pack(fill=tk.BOTH, expand=True)
+
+    # Create Treeview with scrollbar
+    tree_frame = tk.Frame(list_frame)
+    tree_frame.pack(fill=tk.BOTH, expand=True)
+
+    tree_scroll = tk.Scrollbar(tree_frame)
+    tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+    listbox: Treeview = ttk.Treeview(tree_frame, columns=("Name", "Status", "Release Date", "Rating", "Platform"), show="headings",
+                           yscrollcommand=tree_scroll.set)
+    listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    tree_scroll.config(command=listbox.yview)
+
+    # Define column widths
+    listbox.column("Name", width=150)
+    listbox.column("Status", width=80)
+    listbox.column("Release Date", width=100)
+    listbox.column("Rating", width=80)
+    listbox.column("Platform", width=120)
+
+    # Add column headings
+    listbox.heading("Name", text="Game Name")
+    listbox.heading("Status", text="Status")
+    listbox.heading("Release Date", text="Release Date")
+    listbox.heading("Rating", text="Rating")
+    listbox.heading("Platform", text="Platform")
+
+    # Bind selection event
+    listbox.bind("<<TreeviewSelect>>", show_game_details)
+
+    # Button frame
+    button_frame = tk.Frame(list_frame, bg="#34495e")
+    button_frame.pack(fill=tk.X, pady=5)
+
+    # Action buttons
+    delete_button = tk.Button(button_frame, text="Delete", command=delete_game, bg="#e74c3c", fg="white")
+    delete_button.pack(side=tk.LEFT, padx=5)
+
+    backlog_button = tk.Button(button_frame, text="Set as Backlog", command=lambda: change_status("Backlog"), bg="#f39c12",
+                               fg="white")
+    backlog_button.pack(side=tk.LEFT, padx=5)
+
+    playing_button = tk.Button(button_frame, text="Set as Playing", command=lambda: change_status("Playing"), bg="#2ecc71",
+                               fg="white")
+    playing_button.pack(side=tk.LEFT, padx=5)
+
+    completed_button = tk.Button(button_frame, text="Set as Completed", command=lambda: change_status("Completed"),
+                                 bg="#3498db", fg="white")
+    completed_button.pack(side=tk.LEFT, padx=5)
+
+    add_playtime_button = tk.Button(button_frame, text="Log Playtime", command=add_playtime, bg="#9b59b6", fg="white",
+                                    state=tk.DISABLED)
+    add_playtime_button.pack(side=tk.LEFT, padx=5)
+
+    edit_button = tk.Button(button_frame, text="Edit Details", command=edit_game_details, bg="#16a085", fg="white")
+    # Don't pack the edit button yet - we'll show it only when a game is selected
+
+    # Game details section
+    details_frame = tk.Frame(right_frame, bg="#34495e", height=200)
+    details_frame.pack(fill=tk.X, pady=10)
+
+    # Game image on the left
+    game_image_label = tk.Label(details_frame, bg="#2c3e50", width=25, height=15)
+    game_image_label.pack(side=tk.LEFT, padx=10, pady=10)
+
+    # Game details on the right
+    game_details_label = tk.Label(details_frame, text="", fg="white", bg="#2c3e50", justify=tk.LEFT, anchor="nw", padx=10,
+                                  pady=10)
+    game_details_label.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    # Status bar
+    status_bar = tk.Label(root, text="", bd=1, relief=tk.SUNKEN, anchor=tk.W, bg="#2c3e50", fg="white")
+    status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+    # Initialization
+    open_library(current_library)
+    update_library_menu()
+    update_list()
+    update_progress()
+
+    # Deliver loaded covers on the Tk event loop
+    poll_covers()
+
+    # Add bindings to automatically refresh when filters change
+    filter_status_menu.bind("<<ComboboxSelected>>", lambda e: update_list())
+    sort_menu.bind("<<ComboboxSelected>>", lambda e: update_list())
+    search_entry.bind("<Return>", lambda e: search_games())
+    search_entry.bind("<KeyRelease>", on_search_key)
+    entry_name.bind("<KeyRelease>", on_name_key)
+
+    # Set up keyboard shortcuts
+    root.bind("<Control-a>", lambda e: add_game())
+    root.bind("<Delete>", lambda e: delete_game())
+    root.bind("<Control-f>", lambda e: search_entry.focus_set())
+
+    # Configure style for ttk elements
+    style = ttk.Style()
+    style.configure("Treeview", background="#2c3e50", fieldbackground="#2c3e50", foreground="white")
+    style.configure("Treeview.Heading", background="#34495e", foreground="white", font=('Arial', 9, 'bold'))
+    style.map('Treeview', background=[('selected', '#3498db')])
+
+    # Start the main loop
+    root.mainloop()
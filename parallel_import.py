@@ -0,0 +1,184 @@
+import csv
+import datetime
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import summary
+import transfer
+
+# Target size of one parse job; small enough that the writer starts early
+# and only a few chunks of parsed rows are held in memory at a time
+CHUNK_BYTES = 4 * 1024 * 1024
+# Bytes counted per step while looking for chunk boundaries
+SCAN_BYTES = 16 * 1024 * 1024
+
+NUMERIC_COLUMNS = {"rating": float, "playtime": float, "rawg_id": int}
+
+
+# Number of double quotes in map[start:end], read in bounded steps
+def _count_quotes(file_map, start, end):
+    count = 0
+    for offset in range(start, end, SCAN_BYTES):
+        count += file_map[offset:min(offset + SCAN_BYTES, end)].count(b'"')
+    return count
+
+
+# Offset just past the first newline at or after `position` that ends a
+# record: one preceded by an even number of quotes. Quoted fields may hold
+# newlines (notes); RFC 4180 escapes quotes by doubling them, so the parity
+# of the quotes before a newline tells whether it is inside a field.
+def _record_end(file_map, position, quotes):
+    while True:
+        newline = file_map.find(b"\n", position)
+        if newline == -1:
+            return len(file_map), quotes
+        quotes += _count_quotes(file_map, position, newline + 1)
+        position = newline + 1
+        if quotes % 2 == 0:
+            return position, quotes
+
+
+# Split a CSV file into (start, end) byte ranges of whole records after the
+# header; returns (header bytes, ranges)
+def split_ranges(file_path, chunk_bytes=CHUNK_BYTES, chunks=1):
+    size = os.path.getsize(file_path)
+    if size == 0:
+        raise ValueError("CSV file is empty")
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file_map:
+        header_end, quotes = _record_end(file_map, 0, 0)
+        header = file_map[:header_end]
+
+        chunks = max(chunks, -(-(size - header_end) // chunk_bytes))
+        step = max(1, (size - header_end) // chunks)
+        boundaries = [header_end]
+        position = header_end
+        for target in range(header_end + step, size, step):
+            if target <= boundaries[-1]:
+                continue
+            quotes += _count_quotes(file_map, position, target)
+            position, quotes = _record_end(file_map, target, quotes)
+            if position >= size:
+                break
+            boundaries.append(position)
+        boundaries.append(size)
+
+    return header, [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+# Column names of the header record; raises ValueError without the required ones
+def parse_header(header):
+    try:
+        columns = [column.lower() for column in next(csv.reader(io.StringIO(header.decode("utf-8"), newline="")))]
+    except StopIteration:
+        raise ValueError("CSV file is empty")
+    transfer._check_columns(columns)
+    return columns
+
+
+# Runs in a worker process: parse file_path[start:end] into normalized rows
+# (transfer.normalize_record layout). Returns (rows, errors, lines), where
+# errors are (line within the chunk, message) for rows left out and lines is
+# the number of lines the chunk spans.
+def parse_chunk(file_path, start, end, columns, current_date):
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+
+    rows = []
+    errors = []
+    reader = csv.reader(io.StringIO(text, newline=""))
+    line = 0
+    for fields in reader:
+        first_line, line = line + 1, reader.line_num
+        if not any(fields):
+            continue  # Blank line
+        if len(fields) != len(columns):
+            errors.append((first_line, f"expected {len(columns)} fields, found {len(fields)}"))
+            continue
+
+        record = dict(zip(columns, fields))
+        if not record["name"].strip():
+            errors.append((first_line, "missing name"))
+            continue
+
+        invalid = None
+        for column, convert in NUMERIC_COLUMNS.items():
+            value = record.get(column, "").strip()
+            if value:
+                try:
+                    convert(value)
+                except ValueError:
+                    invalid = f"{column} {value!r} is not a number"
+                    break
+        if invalid:
+            errors.append((first_line, invalid))
+            continue
+
+        rows.append(transfer.normalize_record(record, current_date))
+
+    return rows, errors, reader.line_num
+
+
+# Import a large CSV file across worker processes. The file is split into
+# byte ranges on record boundaries, each range is parsed and validated in
+# the pool, and this process is the only writer: it takes the chunks in
+# file order, drops names already in the library (first one in the file
+# wins, as with import_records) and inserts them in one transaction.
+# Rows that fail validation are skipped and passed to `report` as
+# (line number, message). The summary table is updated once for the whole
+# import instead of by its per-row trigger. Returns (imported, skipped).
+def import_csv(conn, file_path, workers=None, report=None, chunk_bytes=CHUNK_BYTES):
+    workers = workers or os.cpu_count() or 1
+    header, ranges = split_ranges(file_path, chunk_bytes, workers)
+    columns = parse_header(header)
+    header_lines = header.count(b"\n")
+    current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+
+    existing = transfer.existing_names(conn)
+    imported = 0
+    skipped = 0
+    line = header_lines
+
+    def write_chunk(result):
+        nonlocal imported, skipped, line
+        rows, errors, lines = result
+        for chunk_line, message in errors:
+            if report:
+                report(line + chunk_line, message)
+        skipped += len(errors)
+        line += lines
+
+        batch = []
+        for row in rows:
+            if row[0] in existing:
+                skipped += 1
+                continue
+            existing.add(row[0])
+            batch.append(row)
+        if batch:
+            inserted = transfer.insert_rows(conn, batch)
+            imported += inserted
+            skipped += len(batch) - inserted
+
+    with conn, summary.bulk_insert(conn):
+        # Not worth starting processes for one chunk
+        if workers == 1 or len(ranges) == 1:
+            for start, end in ranges:
+                write_chunk(parse_chunk(file_path, start, end, columns, current_date))
+            return imported, skipped
+
+        window = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for start, end in ranges:
+                window.append(executor.submit(parse_chunk, file_path, start, end, columns, current_date))
+                # Back-pressure: keep every worker busy without parsing far ahead of the writer
+                if len(window) >= workers * 2:
+                    write_chunk(window.popleft().result())
+            while window:
+                write_chunk(window.popleft().result())
+
+    return imported, skipped
@@ -0,0 +1,204 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import changelog
+import query_plans
+import snapshot
+import summary
+
+# ORDER BY clause for each option of the sort combobox
+SORT_ORDERS = {
+    "Name (A-Z)": "name ASC",
+    "Name (Z-A)": "name DESC",
+    "Rating (High-Low)": "rating DESC",
+    "Release Date (New-Old)": "release_date DESC",
+    "Release Date (Old-New)": "release_date ASC",
+    "Recently Added": "date_added DESC",
+}
+
+LIST_COLUMNS = "id, name, status, release_date, rating, platform, genre"
+
+
+# Build the list query for a filter/sort/search combination
+def build_list_query(status_filter, sort_by, search_term=""):
+    query = f"SELECT {LIST_COLUMNS} FROM games"
+    conditions = []
+    params = []
+
+    if status_filter != "All":
+        conditions.append("status = ?")
+        params.append(status_filter)
+
+    if search_term:
+        # Match the term literally, the same way the in-memory narrowing does
+        pattern = "%" + search_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions.append("(LOWER(name) LIKE ? ESCAPE '\\' OR LOWER(platform) LIKE ? ESCAPE '\\'"
+                          " OR LOWER(genre) LIKE ? ESCAPE '\\')")
+        params.extend([pattern] * 3)
+
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    if sort_by in SORT_ORDERS:
+        query += " ORDER BY " + SORT_ORDERS[sort_by]
+
+    return query, params
+
+
+# Lowercased text a search term is matched against
+def search_text(row):
+    return "\t".join(str(value or "") for value in (row[1], row[5], row[6])).lower()
+
+
+# Caches list results as id orderings, keyed by (filter, sort, search term).
+# Entries stay valid until the games table changes: writes from any other
+# connection bump PRAGMA data_version on our long-lived connection, and
+# invalidate() covers anything the pragma cannot see. A term that extends a
+# cached term is answered by filtering that result in memory.
+#
+# With a snapshot_path, the unfiltered views and their formatted rows are
+# written there on close() and served from it on the next start while the
+# games table is unchanged (see snapshot.py), so a cold start runs no SQL.
+class QueryCache:
+    def __init__(self, db_path="games.db", format_row=None, max_entries=32, snapshot_path=None):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, factory=query_plans.LoggingConnection)
+        self.format_row = format_row or (lambda row: row[1:])
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        self.generation = 0
+        self.cached_generation = None
+        self.data_version = None
+
+        self.orderings = OrderedDict()
+        self.rows = {}
+        self.search_texts = {}
+        self.querying = False
+
+        self.snapshot_path = snapshot_path
+        self.snapshot = None
+        if snapshot_path:
+            # data_version first: a commit after it is caught by _check_current
+            self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            self.cached_generation = self.generation
+            self.snapshot = snapshot.load(snapshot_path, *self._table_state())
+
+    # Drop every cached result on the next lookup
+    def invalidate(self):
+        with self.lock:
+            self.generation += 1
+
+    # (changelog checkpoint, game count): changes whenever games does, across sessions
+    def _table_state(self):
+        return changelog.current_checkpoint(self.conn), summary.totals(self.conn)["games"]
+
+    def _check_current(self):
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self.data_version or self.generation != self.cached_generation:
+            self.orderings.clear()
+            self.rows.clear()
+            self.search_texts.clear()
+            if self.snapshot:
+                self.snapshot.close()
+                self.snapshot = None
+            self.data_version = data_version
+            self.cached_generation = self.generation
+
+    def _store(self, key, ids):
+        self.orderings[key] = ids
+        self.orderings.move_to_end(key)
+        if len(self.orderings) > self.max_entries:
+            self.orderings.popitem(last=False)
+
+    # Cached ids for a view, narrowing the longest cached prefix term in memory
+    def _lookup(self, key):
+        self._check_current()
+
+        ids = self.orderings.get(key)
+        if ids is not None:
+            self.orderings.move_to_end(key)
+            return ids
+
+        if self.snapshot:
+            ids = self.snapshot.load_view(key, self.rows, self.search_texts)
+            if ids is not None:
+                self._store(key, ids)
+                return ids
+
+        status_filter, sort_by, search_term = key
+        base = None
+        for (cached_filter, cached_sort, cached_term), cached_ids in self.orderings.items():
+            if (cached_filter, cached_sort) == (status_filter, sort_by) and search_term.startswith(cached_term):
+                if base is None or len(cached_term) > len(base[0]):
+                    base = (cached_term, cached_ids)
+        if base is None:
+            return None
+
+        ids = [game_id for game_id in base[1] if search_term in self.search_texts[game_id]]
+        self._store(key, ids)
+        return ids
+
+    # Return [(id, formatted_row), ...] for a view, querying only on a miss
+    def get(self, status_filter, sort_by, search_term=""):
+        key = (status_filter, sort_by, search_term)
+
+        with self.lock:
+            ids = self._lookup(key)
+            if ids is None:
+                query, params = build_list_query(status_filter, sort_by, search_term)
+                ids = []
+                self.querying = True
+                start = time.perf_counter()
+                try:
+                    for row in self.conn.execute(query, params):
+                        game_id = row[0]
+                        if game_id not in self.rows:
+                            self.rows[game_id] = self.format_row(row)
+                            self.search_texts[game_id] = search_text(row)
+                        ids.append(game_id)
+                finally:
+                    self.querying = False
+                # execute() only times the first row; this covers reading them all
+                query_plans.report_slow(self.conn, query, params, time.perf_counter() - start)
+                self._store(key, ids)
+
+            return [(game_id, self.rows[game_id]) for game_id in ids]
+
+    # Like get(), but only answers from memory; returns None when SQL would be needed
+    def peek(self, status_filter, sort_by, search_term="", timeout=0.005):
+        if not self.lock.acquire(timeout=timeout):
+            return None
+        try:
+            ids = self._lookup((status_filter, sort_by, search_term))
+            return None if ids is None else [(game_id, self.rows[game_id]) for game_id in ids]
+        finally:
+            self.lock.release()
+
+    # Abort a query running on another thread; its get() raises sqlite3.OperationalError
+    def cancel(self):
+        if self.querying:
+            self.conn.interrupt()
+
+    # Write the unfiltered views to snapshot_path when they are current, cover
+    # every game and differ from the snapshot already there
+    def save_snapshot(self):
+        with self.lock:
+            checkpoint, games = self._table_state()
+            self._check_current()
+            if self.snapshot and self.snapshot.matches(checkpoint, games):
+                return
+            views = {key: ids for key, ids in self.orderings.items() if not key[2]}
+            if views and self.rows and len(self.rows) == games:
+                snapshot.save(self.snapshot_path, self.rows, self.search_texts, views, checkpoint, games)
+
+    def close(self):
+        if self.snapshot_path:
+            try:
+                self.save_snapshot()
+            except (OSError, ValueError, sqlite3.Error):
+                pass  # The next start simply queries
+            if self.snapshot:
+                self.snapshot.close()
+        self.conn.close()
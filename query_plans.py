@@ -0,0 +1,260 @@
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+# Statements slower than this many milliseconds are printed with their query
+# plan, once per statement text; 0 turns it off
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+
+# Statements EXPLAIN QUERY PLAN says something useful about
+PLANNED = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+logged_statements = set()
+logged_lock = threading.Lock()
+
+
+# Plan lines of a statement, e.g. ["SEARCH games USING INDEX idx_games_status_name (status=?)"]
+def explain(conn, sql, params=()):
+    return [row[3] for row in sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+# Print a statement that took longer than SLOW_QUERY_MS, with its plan
+def report_slow(conn, sql, params, elapsed):
+    if not SLOW_QUERY_MS or elapsed * 1000 < SLOW_QUERY_MS or not sql.lstrip().upper().startswith(PLANNED):
+        return
+    with logged_lock:
+        if sql in logged_statements:
+            return
+        logged_statements.add(sql)
+
+    try:
+        plan = explain(conn, sql, params)
+    except sqlite3.Error as e:
+        plan = [f"(no plan: {e})"]
+    print(f"Slow query ({elapsed * 1000:.0f} ms): {' '.join(sql.split())}", file=sys.stderr)
+    for line in plan:
+        print(f"    {line}", file=sys.stderr)
+
+
+# Cursor that times each execute() (up to the first row) and reports slow ones
+class LoggingCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        report_slow(self.connection, sql, parameters, time.perf_counter() - start)
+        return self
+
+
+# sqlite3.connect(path, factory=LoggingConnection) logs slow statements run
+# through conn.execute() and conn.cursor()
+class LoggingConnection(sqlite3.Connection):
+    def cursor(self, factory=LoggingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+
+# Tables small by construction (one row per AUTOINCREMENT table)
+SMALL_TABLES = ("sqlite_sequence",)
+
+
+# Plan lines that read a whole table or index, or sort in a temporary
+# B-tree. `allow` may hold "scan" (any full scan), "index scan" (walking a
+# whole index, which is how an ORDER BY over every row avoids sorting) and
+# "sort". Scans of a subquery's own rows (CO-ROUTINE / MATERIALIZE) are not
+# table scans.
+def plan_problems(plan, allow=()):
+    subqueries = {line.split(" ", 1)[1] for line in plan if line.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+    problems = []
+    for line in plan:
+        if line.startswith("SCAN ") and "scan" not in allow:
+            target = line[len("SCAN "):]
+            if (target in subqueries or target in SMALL_TABLES or "VIRTUAL TABLE" in target
+                    or target.startswith(("(subquery", "CONSTANT ROW"))):
+                continue
+            if " USING " not in target:
+                problems.append(f"full table scan: {line}")
+            elif "index scan" not in allow:
+                problems.append(f"full index scan: {line}")
+        elif line.startswith("USE TEMP B-TREE") and "sort" not in allow:
+            problems.append(f"temp B-tree: {line}")
+    return problems
+
+
+# Guardrail suite: run every generated query shape against a large synthetic
+# database (or a copy of a real one), and fail when a statement's plan scans
+# a table or sorts in a temp B-tree, or when it runs over its latency budget.
+#
+#   python query_plans.py --rows 200000
+#   python query_plans.py --db libraries/default/games.db --verbose
+#
+# Every statement a check runs is captured with set_trace_callback, so the
+# plans checked are those of the SQL the app actually builds. Budgets are
+# in milliseconds at the default row count; scale them with --budget-scale.
+LIST_BUDGET_MS = 750
+LOOKUP_BUDGET_MS = 20
+BACKGROUND_BUDGET_MS = 1000
+
+SEARCH_TERMS = ["", "ze"]
+
+
+def _sample_game(rawg_id, name):
+    return {"name": name, "release_date": "2020-01-01", "rating": 4.0, "image_url": "", "platform": "PC",
+            "genre": "RPG", "rawg_id": rawg_id, "slug": ""}
+
+
+# [(label, run(conn), allowed plan problems, budget in ms), ...]
+def build_checks():
+    # Only the suite needs these (and NumPy, through query_cache)
+    import backlog
+    import changelog
+    import query_cache
+    import refresh
+    import sessions
+    import summary
+
+    checks = []
+    for status_filter in ["All"] + summary.STATUSES:
+        for sort_by in query_cache.SORT_ORDERS:
+            for term in SEARCH_TERMS:
+                query, params = query_cache.build_list_query(status_filter, sort_by, term)
+                # Every matching row is read and sorted; "All" reads the whole table
+                checks.append((f"list {status_filter} / {sort_by} / {term!r}",
+                               lambda conn, query=query, params=params: conn.execute(query, params).fetchall(),
+                               ("scan", "sort") if status_filter == "All" else ("sort",), LIST_BUDGET_MS))
+
+    # save_game and save_name sort their few matches to prefer the strongest one
+    checks.append(("save_game new", lambda conn: backlog.save_game(conn, _sample_game(-1, "Plan Check"), "Backlog"),
+                   ("sort",), LOOKUP_BUDGET_MS))
+    checks.append(("save_game existing", lambda conn: backlog.save_game(conn, _sample_game(None, "game 42"), "Playing"),
+                   ("sort",), LOOKUP_BUDGET_MS))
+    checks.append(("save_name existing", lambda conn: backlog.save_name(conn, "Game 42", "Playing"),
+                   ("sort",), LOOKUP_BUDGET_MS))
+
+    def statistics(conn):
+        summary.status_counts(conn)
+        summary.totals(conn)
+        summary.average_rating(conn)
+        summary.top_tags(conn, "genre", 3)
+        summary.top_tags(conn, "platform", 3)
+
+    # The summary table holds one row per tag; sorting it is cheap
+    checks.append(("status bar and statistics", statistics, ("sort",), LOOKUP_BUDGET_MS))
+
+    def trends(conn):
+        sessions.hours_this_month(conn)
+        sessions.hours_last_days(conn, 7)
+        sessions.daily_series(conn, 30)
+        sessions.game_totals(conn, 42)
+
+    checks.append(("playtime trends", trends, (), LOOKUP_BUDGET_MS))
+
+    def changes(conn):
+        checkpoint = changelog.current_checkpoint(conn)
+        list(changelog.changes_since(conn, max(0, checkpoint - 100), checkpoint))
+
+    # DISTINCT and ORDER BY over the game ids changed in a bounded range of seqs
+    checks.append(("changelog", changes, ("sort",), LOOKUP_BUDGET_MS))
+
+    # Ranks every game by staleness: a scan and sort by design, run in the background
+    checks.append(("refresh candidates",
+                   lambda conn: refresh.RefreshScheduler(":memory:").pick_candidates(conn, 20),
+                   ("scan", "sort"), BACKGROUND_BUDGET_MS))
+    return checks
+
+
+# Statements a check runs, with their parameters filled in
+def capture(conn, run):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        start = time.perf_counter()
+        run(conn)
+        elapsed = time.perf_counter() - start
+    finally:
+        conn.set_trace_callback(None)
+        if conn.in_transaction:
+            conn.rollback()
+    return [sql for sql in statements if sql.lstrip().upper().startswith(PLANNED)], elapsed
+
+
+# Run every check; returns the number that failed
+def run_checks(conn, repeat=3, budget_scale=1.0, verbose=False):
+    failures = 0
+    for label, run, allow, budget_ms in build_checks():
+        statements, elapsed = capture(conn, run)
+        for _ in range(repeat - 1):
+            elapsed = min(elapsed, capture(conn, run)[1])
+
+        plans = [(sql, explain(conn, sql)) for sql in dict.fromkeys(statements)]
+        problems = [problem for _, plan in plans for problem in plan_problems(plan, allow)]
+        budget = budget_ms * budget_scale
+        if elapsed * 1000 > budget:
+            problems.append(f"took {elapsed * 1000:.1f} ms, budget {budget:.0f} ms")
+
+        failures += bool(problems)
+        print(f"{'FAIL' if problems else 'ok':<5}{elapsed * 1000:9.1f} ms  {label}")
+        for problem in problems:
+            print(f"        {problem}")
+        if problems or verbose:
+            for sql, plan in plans:
+                print(f"        {' '.join(sql.split())[:120]}")
+                for line in plan:
+                    print(f"            {line}")
+    return failures
+
+
+# Seeded library plus play sessions, so the rollup tables are not empty
+def seed_database(db_path, rows, seed=0):
+    import loadtest
+    import sessions
+
+    loadtest.seed_database(db_path, rows, seed)
+    pick = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        for _ in range(min(rows, 5000)):
+            sessions.log_session(conn, pick.randint(1, rows), pick.choice([0.5, 1, 2]))
+    conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check query plans and latency of every generated query shape.")
+    parser.add_argument("--db", help="database to copy and check (default: a seeded synthetic one)")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to seed the temporary database with")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per check; the fastest counts")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every latency budget")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only failing ones")
+    args = parser.parse_args(argv)
+
+    import backlog
+
+    work_dir = tempfile.mkdtemp(prefix="query_plans_")
+    db_path = os.path.join(work_dir, "games.db")
+    try:
+        if args.db:
+            shutil.copy(args.db, db_path)
+        else:
+            print(f"Seeding {args.rows} games...", file=sys.stderr)
+            seed_database(db_path, args.rows)
+
+        conn = sqlite3.connect(db_path)
+        backlog.init_db(conn)  # Indexes a copied database may not have yet
+        failures = run_checks(conn, args.repeat, args.budget_scale, args.verbose)
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{failures} checks failed." if failures else "All checks passed.", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import datetime
+import json
+import os
+import threading
+import time
+
+# Request classes, most urgent first
+INTERACTIVE, ENRICHMENT, REFRESH = range(3)
+PRIORITIES = ["interactive", "enrichment", "refresh"]
+
+quota_file_lock = threading.Lock()
+
+
+class Rejected(Exception):
+    pass
+
+
+def _today():
+    return datetime.date.today().isoformat()
+
+
+# Token bucket shared by every outgoing RAWG API request. Tokens refill at
+# `rate` per second up to `burst`. A class only takes a token while no more
+# urgent request is waiting and while more than its `reserve` would be left,
+# so background work soaks up spare capacity and an interactive lookup
+# always finds one ready. The daily count is kept in `quota_path` under
+# `quota_key` (shared by every process using the same API key); each class
+# stops at its share of `daily_quota`, so refresh runs out well before a
+# user's add would.
+class RequestScheduler:
+    def __init__(self, rate=5.0, burst=10, daily_quota=1000, quota_path=None, quota_key="default",
+                 reserve=(0, 2, 4), quota_share=(1.0, 0.9, 0.75), max_wait=(15, 300, 300)):
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.quota_path = quota_path
+        self.quota_key = quota_key
+        self.reserve = reserve
+        self.quota_share = quota_share
+        self.max_wait = max_wait
+
+        self.condition = threading.Condition()
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # Set by a 429; nobody sends before it
+        self.waiting = [0] * len(PRIORITIES)
+
+        self.day, self.used = self._load_quota()
+        self.unsaved = 0
+        self.saved_at = time.monotonic()
+
+        self.counts = {name: {"requests": 0, "rejected": 0, "waited": 0.0, "max_wait": 0.0} for name in PRIORITIES}
+        self.throttled = 0
+
+    # {quota_key: {"day": ..., "used": ...}} from quota_path
+    def _read_quota_file(self):
+        try:
+            with open(self.quota_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _load_quota(self):
+        day = _today()
+        if self.quota_path:
+            entry = self._read_quota_file().get(self.quota_key)
+            if isinstance(entry, dict) and entry.get("day") == day:
+                return day, int(entry.get("used", 0))
+        return day, 0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _roll_day(self):
+        day = _today()
+        if day != self.day:
+            self.day, self.used, self.unsaved = day, 0, 0
+
+    def _reject(self, priority, message):
+        self.counts[PRIORITIES[priority]]["rejected"] += 1
+        raise Rejected(message)
+
+    # Block until a request of this class may be sent and count it against the
+    # quota. Raises Rejected when the class's quota share is used up or no slot
+    # frees up within its max_wait.
+    def acquire(self, priority=INTERACTIVE):
+        start = time.monotonic()
+        deadline = start + self.max_wait[priority]
+        needed = min(1 + self.reserve[priority], self.burst)
+
+        with self.condition:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    self._roll_day()
+                    if self.used >= self.daily_quota * self.quota_share[priority]:
+                        self._reject(priority, f"Daily RAWG quota reached for {PRIORITIES[priority]} requests "
+                                               f"({self.used}/{self.daily_quota})")
+
+                    now = time.monotonic()
+                    self._refill(now)
+                    ahead = any(self.waiting[:priority])
+                    if now >= self.blocked_until and not ahead and self.tokens >= needed:
+                        break
+
+                    if now >= deadline:
+                        self._reject(priority, "Timed out waiting for a RAWG request slot")
+                    # A more urgent request notifies when it is done
+                    ready_at = deadline if ahead else max(self.blocked_until, now + (needed - self.tokens) / self.rate)
+                    self.condition.wait(min(ready_at, deadline) - now)
+
+                self.tokens -= 1
+                self.used += 1
+                self.unsaved += 1
+                waited = time.monotonic() - start
+                counts = self.counts[PRIORITIES[priority]]
+                counts["requests"] += 1
+                counts["waited"] += waited
+                counts["max_wait"] = max(counts["max_wait"], waited)
+            finally:
+                self.waiting[priority] -= 1
+                self.condition.notify_all()
+
+        if self.unsaved >= 20 or time.monotonic() - self.saved_at >= 30:
+            self.save()
+
+    # RAWG answered 429: stop every class until retry_after has passed
+    def throttle(self, retry_after):
+        with self.condition:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self.tokens = 0.0
+            self.throttled += 1
+            self.condition.notify_all()
+
+    # Add this process's unsaved requests to the count on disk
+    def save(self):
+        with self.condition:
+            day, unsaved = self.day, self.unsaved
+            self.unsaved = 0
+            self.saved_at = time.monotonic()
+        if not self.quota_path or not unsaved:
+            return
+
+        with quota_file_lock:
+            data = self._read_quota_file()
+            entry = data.get(self.quota_key)
+            on_disk = int(entry.get("used", 0)) if isinstance(entry, dict) and entry.get("day") == day else 0
+
+            used = on_disk + unsaved
+            data[self.quota_key] = {"day": day, "used": used}
+            try:
+                temp_path = self.quota_path + ".tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(temp_path, self.quota_path)
+            except OSError as e:
+                print(f"Error saving RAWG quota: {e}")
+                return
+
+        # Other processes' requests count too
+        with self.condition:
+            if self.day == day:
+                self.used = max(self.used, used + self.unsaved)
+
+    def metrics(self):
+        with self.condition:
+            self._roll_day()
+            self._refill(time.monotonic())
+            return {
+                "day": self.day,
+                "used": self.used,
+                "daily_quota": self.daily_quota,
+                "remaining": max(0, self.daily_quota - self.used),
+                "tokens": round(self.tokens, 2),
+                "throttled": self.throttled,
+                "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 1),
+                "classes": {name: dict(counts) for name, counts in self.counts.items()},
+            }
@@ -0,0 +1,275 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+import rate_limit
+from rate_limit import ENRICHMENT, INTERACTIVE, REFRESH
+
+# RAWG API Key (replace with your own from rawg.io)
+PLACEHOLDER_KEY = "X"
+API_KEY = os.environ.get("RAWG_API_KEY", PLACEHOLDER_KEY)
+# Point at a local stand-in with RAWG_BASE_URL=http://127.0.0.1:8766/api/games (see rawg_stub.py)
+BASE_URL = os.environ.get("RAWG_BASE_URL", "https://api.rawg.io/api/games")
+
+# When set, every successful response and cover download is saved here for rawg_stub.py to replay
+RECORD_DIR = os.environ.get("RAWG_RECORD_DIR") or None
+
+# One pooled session for every RAWG call (keep-alive instead of a new TLS handshake per request)
+session = requests.Session()
+
+RAWG_HOST = "api.rawg.io"
+QUOTA_PATH = os.environ.get("RAWG_QUOTA_PATH", "rawg_quota.json")
+# Rate, burst and daily quota of endpoints that are not RAWG: effectively no limit
+UNMETERED = 10 ** 9
+
+
+# Scheduler for an endpoint and key. RAWG itself is metered against the
+# daily quota of that key; a stand-in such as rawg_stub.py only gets its
+# 429 Retry-After honoured, so load tests measure the backend rather than
+# the token bucket and never spend the real quota.
+def make_scheduler(base_url, api_key):
+    if urlsplit(base_url).hostname != RAWG_HOST:
+        return rate_limit.RequestScheduler(rate=UNMETERED, burst=UNMETERED, daily_quota=UNMETERED)
+    key_hash = hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:12]
+    return rate_limit.RequestScheduler(rate=float(os.environ.get("RAWG_RATE", 5)),
+                                       burst=int(os.environ.get("RAWG_BURST", 10)),
+                                       daily_quota=int(os.environ.get("RAWG_DAILY_QUOTA", 1000)),
+                                       quota_path=QUOTA_PATH, quota_key=f"{RAWG_HOST}:{key_hash}")
+
+
+# Every API request waits for a token here; covers come from RAWG's media CDN and are not metered
+scheduler = make_scheduler(BASE_URL, API_KEY)
+atexit.register(lambda: scheduler.save())
+
+# Seconds to stay off the API after a 429 without a usable Retry-After
+DEFAULT_RETRY_AFTER = 30
+
+
+# Parsed detail responses by RAWG id, revalidated with conditional requests
+detail_cache = OrderedDict()  # rawg_id -> (etag, last_modified, details)
+detail_cache_lock = threading.Lock()
+DETAIL_CACHE_SIZE = 1000
+
+
+# Recent search results, so a prefetched term costs nothing when it is added
+search_cache = OrderedDict()  # (term, page_size) -> (fetched_at, results)
+search_cache_lock = threading.Lock()
+SEARCH_CACHE_SIZE = 100
+SEARCH_CACHE_TTL = 600
+
+
+class RawgError(Exception):
+    pass
+
+
+# Refused locally: the class's daily quota is used up or no request slot freed up in time
+class RateLimitError(RawgError):
+    pass
+
+
+# False while RAWG itself would be called with the placeholder key; a
+# stand-in endpoint needs no key
+def is_configured():
+    return urlsplit(BASE_URL).hostname != RAWG_HOST or (bool(API_KEY) and API_KEY != PLACEHOLDER_KEY)
+
+
+# Switch endpoint, key or recording at runtime; None leaves a setting unchanged
+def configure(base_url=None, api_key=None, record_dir=None):
+    global BASE_URL, API_KEY, RECORD_DIR, scheduler
+    if base_url is not None:
+        BASE_URL = base_url.rstrip("/")
+    if api_key is not None:
+        API_KEY = api_key
+    if base_url is not None or api_key is not None:
+        scheduler.save()
+        scheduler = make_scheduler(BASE_URL, API_KEY)
+    if record_dir is not None:
+        RECORD_DIR = record_dir or None
+    with search_cache_lock:
+        search_cache.clear()
+    with detail_cache_lock:
+        detail_cache.clear()
+
+
+# Fixture file name for an API request: path plus sorted params, without the key
+def fixture_key(path, params):
+    query = urlencode(sorted((name, str(value)) for name, value in (params or {}).items() if name != "key"))
+    return hashlib.sha1(f"{path}?{query}".encode("utf-8")).hexdigest()
+
+
+# Fixture file name for a cover URL, keeping its extension
+def media_key(url):
+    extension = os.path.splitext(urlsplit(url).path)[1].lower() or ".jpg"
+    return hashlib.sha1(url.encode("utf-8")).hexdigest() + extension
+
+
+def _record_response(url, params, response):
+    directory = os.path.join(RECORD_DIR, "api")
+    os.makedirs(directory, exist_ok=True)
+    path = urlsplit(url).path
+    fixture = {
+        "path": path,
+        "params": {name: value for name, value in (params or {}).items() if name != "key"},
+        "headers": {name: response.headers[name] for name in ("ETag", "Last-Modified") if name in response.headers},
+        "body": response.json(),
+    }
+    with open(os.path.join(directory, fixture_key(path, params) + ".json"), "w", encoding="utf-8") as f:
+        json.dump(fixture, f, ensure_ascii=False)
+
+
+def _record_image(url, data):
+    directory = os.path.join(RECORD_DIR, "media")
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, media_key(url)), "wb") as f:
+        f.write(data)
+
+
+def _retry_after(response):
+    try:
+        return max(1.0, float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER  # An HTTP date; not worth parsing
+
+
+# GET a RAWG endpoint through the scheduler at the given priority. With
+# etag/last_modified the request is conditional and returns None when RAWG
+# answers 304 Not Modified. A 429 pauses every class and is retried once.
+# Network failures (refused, timed out) are raised as RawgError too.
+def get_json(url, params=None, etag=None, last_modified=None, timeout=10, priority=INTERACTIVE):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    for _attempt in range(2):
+        try:
+            scheduler.acquire(priority)
+        except rate_limit.Rejected as e:
+            raise RateLimitError(str(e)) from None
+
+        try:
+            response = session.get(url, params={"key": API_KEY, **(params or {})}, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            # Not str(e): it includes the request URL, and with it the API key
+            raise RawgError(f"Could not connect to game database ({type(e).__name__})") from e
+        if response.status_code != 429:
+            break
+        scheduler.throttle(_retry_after(response))
+    else:
+        raise RateLimitError("RAWG is rate limiting requests; try again later")
+
+    if response.status_code == 304:
+        return None
+    if response.status_code != 200:
+        raise RawgError(f"Error {response.status_code}: Could not connect to game database")
+    if RECORD_DIR:
+        _record_response(url, params, response)
+    return response
+
+
+# Download a cover over the shared session; returns the bytes, or None on an error status
+def get_image(url, timeout=10):
+    response = session.get(url, timeout=timeout)
+    if response.status_code != 200:
+        return None
+    if RECORD_DIR:
+        _record_image(url, response.content)
+    return response.content
+
+
+# Search results for a name, best match first
+def search_games(game_name, page_size=10, priority=INTERACTIVE):
+    key = (game_name.strip().lower(), page_size)
+    with search_cache_lock:
+        cached = search_cache.get(key)
+    if cached and time.time() - cached[0] < SEARCH_CACHE_TTL:
+        return cached[1]
+
+    response = get_json(BASE_URL, {"search": game_name, "page_size": page_size}, priority=priority)
+    results = response.json().get("results") or []
+
+    with search_cache_lock:
+        search_cache[key] = (time.time(), results)
+        search_cache.move_to_end(key)
+        if len(search_cache) > SEARCH_CACHE_SIZE:
+            search_cache.popitem(last=False)
+    return results
+
+
+# Warm the search cache for a name on a background thread. Speculative, so it
+# only uses spare capacity; the add itself is interactive if this lost out.
+def prefetch_search(game_name, page_size=10):
+    def fetch():
+        try:
+            search_games(game_name, page_size, priority=ENRICHMENT)
+        except Exception as e:
+            print(f"Error prefetching suggestions: {e}")
+
+    threading.Thread(target=fetch, daemon=True).start()
+
+
+# Pick the result whose name matches exactly (ignoring case), if any
+def exact_match(games, game_name):
+    wanted = game_name.strip().lower()
+    for game in games:
+        if game.get("name", "").strip().lower() == wanted:
+            return game
+    return None
+
+
+# Convert a RAWG game object to the columns we store
+def parse_game(game):
+    platforms = ", ".join([p['platform']['name'] for p in game.get('platforms') or [] if 'platform' in p][:3])
+    genres = ", ".join([g['name'] for g in game.get('genres') or []][:3])
+
+    return {
+        "name": game["name"],
+        "release_date": game.get("released") or "N/A",
+        "rating": game.get("rating", 0.0),
+        "image_url": game.get("background_image") or "",
+        "platform": platforms,
+        "genre": genres,
+        "rawg_id": game.get("id"),
+        "slug": game.get("slug")
+    }
+
+
+# Details for one game by RAWG id (or slug): a single cacheable request,
+# revalidated with If-None-Match when we have seen the game before. Callers
+# that keep validators themselves (refresh) pass them for games not cached
+# yet; a 304 for one of those returns None.
+def get_game(rawg_id, priority=INTERACTIVE, etag=None, last_modified=None):
+    with detail_cache_lock:
+        cached = detail_cache.get(rawg_id)
+    if cached:
+        etag, last_modified, details = cached
+    else:
+        details = None
+
+    response = get_json(f"{BASE_URL}/{rawg_id}", etag=etag, last_modified=last_modified, priority=priority)
+    if response is not None:
+        details = parse_game(response.json())
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+    with detail_cache_lock:
+        detail_cache[rawg_id] = (etag, last_modified, details)
+        detail_cache.move_to_end(rawg_id)
+        if len(detail_cache) > DETAIL_CACHE_SIZE:
+            detail_cache.popitem(last=False)
+    return details
+
+
+# (etag, last_modified) get_game last saw for a game, to store alongside it
+def detail_validators(rawg_id):
+    with detail_cache_lock:
+        cached = detail_cache.get(rawg_id)
+    return cached[:2] if cached else (None, None)
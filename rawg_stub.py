@@ -0,0 +1,231 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qsl, urlsplit
+
+from PIL import Image
+
+import rawg
+
+GENRES = ["Action", "Adventure", "RPG", "Shooter", "Puzzle", "Strategy", "Indie", "Platformer", "Racing", "Sports"]
+PLATFORMS = ["PC", "PlayStation 5", "PlayStation 4", "Xbox Series S/X", "Xbox One", "Nintendo Switch", "macOS"]
+
+PLACEHOLDER_SIZE = (600, 338)
+
+
+# Local stand-in for the RAWG games API. Requests recorded with
+# RAWG_RECORD_DIR (see rawg.py) are replayed from `fixtures_dir`; anything
+# else gets a deterministic synthetic answer, so searches and detail lookups
+# work for any name or id. Covers are served from the recorded files or as
+# generated placeholders. Latency and failures can be injected per request.
+#
+#   python rawg_stub.py --fixtures fixtures --latency 80 --jitter 40 --error-rate 0.02
+#   RAWG_BASE_URL=http://127.0.0.1:8766/api/games python main.py
+class RawgStub:
+    def __init__(self, fixtures_dir=None, host="127.0.0.1", port=8766, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 error_status=503, seed=None):
+        self.fixtures_dir = fixtures_dir
+        self.host = host
+        self.port = port
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+        self.counts = {"requests": 0, "replayed": 0, "synthetic": 0, "images": 0, "not_modified": 0, "errors": 0}
+        self.counts_lock = threading.Lock()
+        self.placeholders = {}
+        self.issued = {}  # synthetic id -> name handed out by a search, so detail lookups agree
+        self.issued_lock = threading.Lock()
+        self.server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/api/games"
+
+    def _count(self, name):
+        with self.counts_lock:
+            self.counts[name] += 1
+
+    def stats(self):
+        with self.counts_lock:
+            return dict(self.counts)
+
+    # Sleep for the configured latency; returns True when this request should fail
+    def _delay_and_roll(self):
+        with self.random_lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            fail = self.random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _media_url(self, key):
+        return f"http://{self.host}:{self.port}/media/{key}"
+
+    def _fixture(self, path, params):
+        if not self.fixtures_dir:
+            return None
+        fixture_path = os.path.join(self.fixtures_dir, "api", rawg.fixture_key(path, params) + ".json")
+        if not os.path.exists(fixture_path):
+            return None
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # Point recorded cover URLs at this server so covers replay offline too
+    def _rewrite_images(self, body):
+        games = body.get("results", []) if "results" in body else [body]
+        for game in games:
+            if game.get("background_image"):
+                game["background_image"] = self._media_url(rawg.media_key(game["background_image"]))
+        return body
+
+    def _synthetic_game(self, game_id, name=None):
+        with self.issued_lock:
+            if name is None:
+                name = self.issued.get(game_id, f"Game {game_id}")
+            elif len(self.issued) < 100_000:
+                self.issued[game_id] = name
+        pick = random.Random(game_id)
+        return {
+            "id": game_id,
+            "slug": name.lower().replace(" ", "-"),
+            "name": name,
+            "released": f"{pick.randint(1995, 2026)}-{pick.randint(1, 12):02d}-{pick.randint(1, 28):02d}",
+            "rating": round(pick.uniform(2.5, 5.0), 2),
+            "background_image": self._media_url(f"synthetic-{game_id}.jpg"),
+            "platforms": [{"platform": {"name": platform}} for platform in pick.sample(PLATFORMS, pick.randint(1, 3))],
+            "genres": [{"name": genre} for genre in pick.sample(GENRES, pick.randint(1, 3))],
+        }
+
+    def _synthetic_search(self, term, page_size):
+        base_id = zlib.crc32(term.lower().encode("utf-8")) % 1_000_000 * 10
+        names = [term.title()] + [f"{term.title()} {number}" for number in range(2, page_size + 1)]
+        return {"count": len(names), "results": [self._synthetic_game(base_id + index, name)
+                                                 for index, name in enumerate(names)]}
+
+    # (body, headers) for an API path, replayed when recorded
+    def api_response(self, path, params):
+        fixture = self._fixture(path, params)
+        if fixture is not None:
+            self._count("replayed")
+            return self._rewrite_images(fixture["body"]), fixture.get("headers", {})
+
+        self._count("synthetic")
+        lookup = path[len("/api/games"):].strip("/")
+        if not lookup:
+            page_size = int(params.get("page_size", 10))
+            return self._synthetic_search(params.get("search", ""), max(1, min(page_size, 40))), {}
+        if lookup.isdigit():
+            return self._synthetic_game(int(lookup)), {}
+        return self._synthetic_game(zlib.crc32(lookup.encode("utf-8")) % 1_000_000,
+                                    lookup.replace("-", " ").title()), {}
+
+    def image(self, key):
+        if self.fixtures_dir:
+            recorded = os.path.join(self.fixtures_dir, "media", os.path.basename(key))
+            if os.path.exists(recorded):
+                with open(recorded, "rb") as f:
+                    return f.read()
+
+        data = self.placeholders.get(key)
+        if data is None:
+            color = tuple(hashlib.sha1(key.encode("utf-8")).digest()[:3])
+            buffer = BytesIO()
+            Image.new("RGB", PLACEHOLDER_SIZE, color).save(buffer, "JPEG", quality=70)
+            data = buffer.getvalue()
+            if len(self.placeholders) < 1000:
+                self.placeholders[key] = data
+        return data
+
+    def _handler(self):
+        stub = self
+
+        class StubHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._count("requests")
+                if stub._delay_and_roll():
+                    stub._count("errors")
+                    headers = {"Retry-After": "1"} if stub.error_status == 429 else None
+                    self._send(stub.error_status, b'{"error": "injected failure"}', "application/json", headers)
+                    return
+
+                url = urlsplit(self.path)
+                if url.path.startswith("/media/"):
+                    stub._count("images")
+                    self._send(200, stub.image(url.path[len("/media/"):]), "image/jpeg")
+                elif url.path.startswith("/api/games"):
+                    body, headers = stub.api_response(url.path, dict(parse_qsl(url.query)))
+                    data = json.dumps(body).encode("utf-8")
+                    etag = headers.get("ETag") or f'"{hashlib.sha1(data).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        stub._count("not_modified")
+                        self._send(304, b"", None, {"ETag": etag})
+                    else:
+                        self._send(200, data, "application/json", {**headers, "ETag": etag})
+                else:
+                    self.send_error(404)
+
+            def _send(self, status, data, content_type, headers=None):
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return StubHandler
+
+    # Serve on a daemon thread; returns the base URL to hand to rawg.configure()
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.port = self.server.server_address[1]  # Resolves port=0 to the one picked
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local RAWG stand-in.")
+    parser.add_argument("--fixtures", help="directory recorded with RAWG_RECORD_DIR")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0, help="added latency per request, in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="random extra latency up to this many ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    stub = RawgStub(args.fixtures, args.host, args.port, args.latency, args.jitter, args.error_rate,
+                    args.error_status, args.seed)
+    print(f"RAWG_BASE_URL={stub.start()}")
+    try:
+        while True:
+            time.sleep(60)
+            print(stub.stats())
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
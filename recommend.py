@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+
+import numpy as np
+
+import analytics
+import changelog
+
+# Platforms matter, but less than genres
+PLATFORM_WEIGHT = 0.5
+
+# Rating assumed for completed games that were never rated
+DEFAULT_RATING = 2.5
+
+# More changed rows than this since the last ranking trigger a full reload
+MAX_INCREMENTAL_CHANGES = 1000
+
+
+# Per-combo dot products with a taste profile and squared norms, computed on
+# the sparse (combo, tag) pairs so no combos x tags matrix is materialized
+def _combo_terms(tag_index, combo_weights, feature_value):
+    profile = np.zeros(len(tag_index.names), dtype=np.float64)
+    np.add.at(profile, tag_index.pair_tags, combo_weights[tag_index.pair_combos] * feature_value)
+
+    dots = np.zeros(tag_index.combo_count, dtype=np.float64)
+    np.add.at(dots, tag_index.pair_combos, profile[tag_index.pair_tags] * feature_value)
+    norms = np.bincount(tag_index.pair_combos, minlength=tag_index.combo_count) * feature_value ** 2
+    return dots, norms, float(profile @ profile)
+
+
+# Ranks Backlog games by cosine similarity between their genre/platform
+# vector and a profile built from completed games, weighted by rating and
+# playtime. Arrays are loaded once; later status, rating and playtime edits
+# are read from the change log and patched in place.
+class Recommender:
+    def __init__(self, db_path="games.db"):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.library = None
+        self.checkpoint = 0
+        self.scores = None
+
+    def _reload(self, conn):
+        self.checkpoint = changelog.current_checkpoint(conn)
+        self.library = analytics.load_library(self.db_path)
+        self.scores = None
+
+    # Patch changed rows in place; returns False when a full reload is needed
+    def _apply_changes(self, conn):
+        # Checkpoint first, and only changes up to it: a write landing in between is left for the next call
+        checkpoint = changelog.current_checkpoint(conn)
+        if checkpoint == self.checkpoint:
+            return True
+        # A restored (older) database, or entries since our checkpoint pruned after an export
+        oldest = conn.execute("SELECT MIN(seq) FROM game_changes").fetchone()[0]
+        if checkpoint < self.checkpoint or oldest is None or oldest > self.checkpoint + 1:
+            return False
+
+        changed = [row[0] for row in conn.execute("""SELECT DISTINCT game_id FROM game_changes
+                                                     WHERE seq > ? AND seq <= ?""", (self.checkpoint, checkpoint))]
+        if not changed:
+            return True
+        if len(changed) > MAX_INCREMENTAL_CHANGES:
+            return False
+
+        rows = conn.execute(f"""SELECT id, COALESCE(rating, 0), COALESCE(playtime, 0),
+                                       CASE status WHEN 'Backlog' THEN 0 WHEN 'Playing' THEN 1
+                                                   WHEN 'Completed' THEN 2 ELSE -1 END,
+                                       COALESCE(genre, ''), COALESCE(platform, '')
+                                FROM games WHERE id IN ({', '.join('?' * len(changed))})""", changed).fetchall()
+        if len(rows) != len(changed):
+            return False  # Deleted rows
+
+        library = self.library
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        positions = np.searchsorted(library.ids, ids)
+        if np.any(positions >= len(library.ids)) or np.any(library.ids[np.minimum(positions, len(library) - 1)] != ids):
+            return False  # Inserted rows
+
+        for position, (_, rating, playtime, status, genre, platform) in zip(positions, rows):
+            genre_combo = library.genres.combo_ids.get(genre)
+            platform_combo = library.platforms.combo_ids.get(platform)
+            if genre_combo is None or platform_combo is None:
+                return False  # A tag combination the index has not seen
+
+            library.rating[position] = rating
+            library.playtime[position] = playtime
+            library.status[position] = status
+            library.genres.row_combo[position] = genre_combo
+            library.platforms.row_combo[position] = platform_combo
+
+        self.checkpoint = checkpoint
+        self.scores = None
+        return True
+
+    # Bring the arrays up to date with the database
+    def _sync(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if self.library is None or not self._apply_changes(conn):
+                self._reload(conn)
+        finally:
+            conn.close()
+
+    def _score(self):
+        library = self.library
+        completed = library.status == analytics.COMPLETED
+        rating = np.where(library.rating > 0, library.rating, DEFAULT_RATING)
+        weights = np.where(completed, rating / 5.0 * (1.0 + np.log1p(library.playtime)), 0.0)
+
+        genre_weights = np.bincount(library.genres.row_combo, weights=weights, minlength=library.genres.combo_count)
+        platform_weights = np.bincount(library.platforms.row_combo, weights=weights,
+                                       minlength=library.platforms.combo_count)
+        genre_dots, genre_norms, genre_profile = _combo_terms(library.genres, genre_weights, 1.0)
+        platform_dots, platform_norms, platform_profile = _combo_terms(library.platforms, platform_weights,
+                                                                       PLATFORM_WEIGHT)
+
+        dots = genre_dots[library.genres.row_combo] + platform_dots[library.platforms.row_combo]
+        norms = np.sqrt((genre_norms[library.genres.row_combo] + platform_norms[library.platforms.row_combo])
+                        * (genre_profile + platform_profile))
+        scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+        # Only Backlog games are candidates
+        scores[library.status != analytics.BACKLOG] = -1.0
+        return scores
+
+    # Top `limit` Backlog games as [(game_id, score), ...], best first
+    def rank(self, limit=20):
+        with self.lock:
+            self._sync()
+            if self.scores is None:
+                self.scores = self._score()
+
+            scores = self.scores
+            candidates = int(np.count_nonzero(scores >= 0))
+            limit = min(limit, candidates)
+            if limit <= 0:
+                return []
+
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(int(self.library.ids[i]), float(scores[i])) for i in top]
+
+    # Force a full reload on the next ranking
+    def invalidate(self):
+        with self.lock:
+            self.library = None
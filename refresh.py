@@ -0,0 +1,168 @@
+import datetime
+import json
+import sqlite3
+import threading
+import time
+
+import rawg
+
+# Refresh bookkeeping lives outside games so a no-op refresh never touches
+# the row (no date_modified bump, no change-log entry)
+SCHEMA = '''CREATE TABLE IF NOT EXISTS rawg_refresh (
+            game_id INTEGER PRIMARY KEY,
+            refreshed_at TEXT,
+            etag TEXT,
+            last_modified TEXT)'''
+
+REFRESH_COLUMNS = ["release_date", "rating", "image_url", "platform", "genre", "rawg_id", "slug"]
+
+
+def init_refresh(conn):
+    conn.execute(SCHEMA)
+
+
+# Background job that re-fetches RAWG metadata for stale rows in priority
+# order: recently viewed, unreleased or undated, missing cover, then oldest.
+# Each run is capped at `budget` requests and writes in small batches.
+class RefreshScheduler:
+    def __init__(self, db_path="games.db", budget=50, interval_minutes=30, stale_days=30, batch_size=20,
+                 on_image_changed=None):
+        self.db_path = db_path
+        self.budget = budget
+        self.interval = interval_minutes * 60
+        self.stale_days = stale_days
+        self.batch_size = batch_size
+        self.on_image_changed = on_image_changed
+
+        self.recently_viewed = {}  # game_id -> time.time() of the last view
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    # Called by the UI when a game is shown; bumps it to the front of the queue
+    def note_viewed(self, game_id):
+        with self.lock:
+            self.recently_viewed[int(game_id)] = time.time()
+            if len(self.recently_viewed) > 200:
+                oldest = min(self.recently_viewed, key=self.recently_viewed.get)
+                del self.recently_viewed[oldest]
+
+    def pick_candidates(self, conn, limit):
+        now = datetime.datetime.now()
+        with self.lock:
+            viewed = json.dumps(list(self.recently_viewed))
+
+        # Priorities 0-2 are retried after a day, the rest once older than stale_days
+        return conn.execute("""SELECT g.id, g.name, g.release_date, g.rating, g.image_url, g.platform, g.genre,
+                                      g.rawg_id, g.slug, r.etag, r.last_modified,
+                                      CASE WHEN g.id IN (SELECT value FROM json_each(:viewed)) THEN 0
+                                           WHEN g.release_date IS NULL OR g.release_date IN ('', 'N/A')
+                                                OR g.release_date > :today THEN 1
+                                           WHEN g.image_url IS NULL OR g.image_url = '' THEN 2
+                                           ELSE 3 END AS priority
+                               FROM games AS g LEFT JOIN rawg_refresh AS r ON r.game_id = g.id
+                               WHERE g.name IS NOT NULL AND g.name != ''
+                                 AND (r.refreshed_at IS NULL
+                                      OR r.refreshed_at < CASE WHEN priority < 3 THEN :retry ELSE :stale END)
+                               ORDER BY priority, r.refreshed_at IS NOT NULL, r.refreshed_at
+                               LIMIT :limit""",
+                            {"viewed": viewed,
+                             "today": now.strftime("%Y-%m-%d"),
+                             "retry": (now - datetime.timedelta(days=1)).isoformat(timespec="seconds"),
+                             "stale": (now - datetime.timedelta(days=self.stale_days)).isoformat(timespec="seconds"),
+                             "limit": limit}).fetchall()
+
+    # Look a row up on RAWG; returns (details or None, etag, last_modified).
+    # Rows with a stored RAWG id cost one detail request through
+    # rawg.get_game (shared with interactive lookups); the rest fall back to
+    # an exact-name search, which also backfills the id and slug.
+    def fetch(self, candidate):
+        game_id, name, *_, rawg_id, slug, etag, last_modified, _priority = candidate
+        if rawg_id:
+            details = rawg.get_game(rawg_id, rawg.REFRESH, etag, last_modified)
+            return (details, *rawg.detail_validators(rawg_id))
+
+        response = rawg.get_json(rawg.BASE_URL, {"search": name, "page_size": 5}, etag, last_modified,
+                                 priority=rawg.REFRESH)
+        if response is None:
+            return None, etag, last_modified  # 304 Not Modified
+
+        game = rawg.exact_match(response.json().get("results") or [], name)
+        details = rawg.parse_game(game) if game else None
+        return details, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    def write_batch(self, conn, updates, refreshed):
+        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        with conn:
+            # OR IGNORE: a new release date must not collide with another copy under dedupe's unique index
+            conn.executemany(f"""UPDATE OR IGNORE games SET {', '.join(f'{column} = ?' for column in REFRESH_COLUMNS)},
+                                 date_modified = ? WHERE id = ?""",
+                             [[details[column] for column in REFRESH_COLUMNS] + [current_date, game_id]
+                              for game_id, details in updates])
+            conn.executemany("""INSERT INTO rawg_refresh (game_id, refreshed_at, etag, last_modified)
+                                VALUES (?, ?, ?, ?)
+                                ON CONFLICT (game_id) DO UPDATE SET refreshed_at = excluded.refreshed_at,
+                                                                    etag = excluded.etag,
+                                                                    last_modified = excluded.last_modified""",
+                             refreshed)
+        updates.clear()
+        refreshed.clear()
+
+    # Refresh up to `budget` rows; returns the number of rows whose data changed
+    def run_once(self):
+        conn = sqlite3.connect(self.db_path)
+        changed = 0
+        try:
+            updates = []
+            refreshed = []
+            for candidate in self.pick_candidates(conn, self.budget):
+                if self.stopped.is_set():
+                    break
+
+                game_id = candidate[0]
+                stored = dict(zip(REFRESH_COLUMNS, candidate[2:9]))
+                try:
+                    details, etag, last_modified = self.fetch(candidate)
+                except rawg.RateLimitError as e:
+                    print(f"Stopping metadata refresh: {e}")
+                    break
+                except Exception as e:
+                    print(f"Error refreshing game {game_id}: {e}")
+                    continue
+
+                if details and any(details[column] != stored[column] for column in REFRESH_COLUMNS):
+                    updates.append((game_id, details))
+                    changed += 1
+                    if details["image_url"] != stored["image_url"] and details["image_url"] and self.on_image_changed:
+                        self.on_image_changed(game_id, details["image_url"])
+
+                refreshed.append((game_id, datetime.datetime.now().isoformat(timespec="seconds"), etag, last_modified))
+                if len(refreshed) >= self.batch_size:
+                    self.write_batch(conn, updates, refreshed)
+
+            if refreshed:
+                self.write_batch(conn, updates, refreshed)
+        finally:
+            conn.close()
+        return changed
+
+    def _run(self):
+        delay = 60  # Let startup finish before the first run
+        while not self.stopped.wait(delay):
+            # Every request would fail (and count against the quota) until a key is set
+            if not rawg.is_configured():
+                delay = self.interval
+                continue
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Error refreshing metadata: {e}")
+            delay = self.interval
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,127 @@
+import datetime
+
+# Append-only play session log. Rollup tables are kept current by triggers,
+# so every time-series query reads at most one row per day or per game.
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS play_sessions (
+       id INTEGER PRIMARY KEY AUTOINCREMENT,
+       game_id INTEGER NOT NULL,
+       started_at TEXT NOT NULL,
+       duration REAL NOT NULL)''',
+    '''CREATE INDEX IF NOT EXISTS idx_play_sessions_game ON play_sessions (game_id, started_at)''',
+    '''CREATE TABLE IF NOT EXISTS playtime_daily (
+       day TEXT PRIMARY KEY,
+       hours REAL NOT NULL DEFAULT 0,
+       sessions INTEGER NOT NULL DEFAULT 0)''',
+    '''CREATE TABLE IF NOT EXISTS playtime_by_game (
+       game_id INTEGER PRIMARY KEY,
+       hours REAL NOT NULL DEFAULT 0,
+       sessions INTEGER NOT NULL DEFAULT 0,
+       last_played TEXT)''',
+    # Games merged into another one by dedupe; their sessions count for merged_into
+    '''CREATE TABLE IF NOT EXISTS merged_games (
+       game_id INTEGER PRIMARY KEY,
+       merged_into INTEGER NOT NULL)''',
+    '''CREATE INDEX IF NOT EXISTS idx_merged_games_into ON merged_games (merged_into)''',
+    '''CREATE TRIGGER IF NOT EXISTS play_sessions_rollup AFTER INSERT ON play_sessions
+       BEGIN
+           INSERT INTO playtime_daily (day, hours, sessions)
+           VALUES (SUBSTR(NEW.started_at, 1, 10), NEW.duration, 1)
+           ON CONFLICT (day) DO UPDATE SET hours = hours + excluded.hours, sessions = sessions + 1;
+
+           INSERT INTO playtime_by_game (game_id, hours, sessions, last_played)
+           VALUES (NEW.game_id, NEW.duration, 1, NEW.started_at)
+           ON CONFLICT (game_id) DO UPDATE SET hours = hours + excluded.hours,
+                                               sessions = sessions + 1,
+                                               last_played = MAX(COALESCE(last_played, ''), excluded.last_played);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS play_sessions_no_update BEFORE UPDATE ON play_sessions
+       BEGIN
+           SELECT RAISE(ABORT, 'play_sessions is append-only');
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS play_sessions_no_delete BEFORE DELETE ON play_sessions
+       BEGIN
+           SELECT RAISE(ABORT, 'play_sessions is append-only');
+       END''',
+]
+
+
+# Create the session log and rollup tables on an open connection
+def init_sessions(conn):
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+def _timestamp(moment=None):
+    return (moment or datetime.datetime.now()).isoformat(timespec="seconds")
+
+
+# Append a session; the caller owns the transaction
+def log_session(conn, game_id, hours, started_at=None):
+    conn.execute("INSERT INTO play_sessions (game_id, started_at, duration) VALUES (?, ?, ?)",
+                 (int(game_id), _timestamp(started_at), hours))
+
+
+# Total hours played between two dates (inclusive), read from the daily rollup
+def hours_between(conn, start_date, end_date):
+    row = conn.execute("SELECT SUM(hours) FROM playtime_daily WHERE day BETWEEN ? AND ?",
+                       (start_date.isoformat(), end_date.isoformat())).fetchone()
+    return row[0] or 0.0
+
+
+def hours_this_month(conn, today=None):
+    today = today or datetime.date.today()
+    return hours_between(conn, today.replace(day=1), today)
+
+
+def hours_last_days(conn, days=7, today=None):
+    today = today or datetime.date.today()
+    return hours_between(conn, today - datetime.timedelta(days=days - 1), today)
+
+
+# [(day, hours, sessions), ...] for the last `days` days that had any play
+def daily_series(conn, days=30, today=None):
+    today = today or datetime.date.today()
+    start = today - datetime.timedelta(days=days - 1)
+    return conn.execute("SELECT day, hours, sessions FROM playtime_daily WHERE day BETWEEN ? AND ? ORDER BY day",
+                        (start.isoformat(), today.isoformat())).fetchall()
+
+
+# (hours, sessions, last_played) logged for one game
+def game_totals(conn, game_id):
+    row = conn.execute("SELECT hours, sessions, last_played FROM playtime_by_game WHERE game_id = ?",
+                       (int(game_id),)).fetchone()
+    return row or (0.0, 0, None)
+
+
+# Credit a merged-away game's sessions to the game that absorbed it. The log
+# is append-only, so the mapping is recorded and the per-game rollup folded.
+# The caller owns the transaction.
+def merge_game(conn, from_id, into_id):
+    conn.execute("UPDATE merged_games SET merged_into = ? WHERE merged_into = ?", (into_id, from_id))
+    conn.execute("INSERT OR REPLACE INTO merged_games (game_id, merged_into) VALUES (?, ?)", (from_id, into_id))
+
+    row = conn.execute("SELECT hours, sessions, last_played FROM playtime_by_game WHERE game_id = ?",
+                       (from_id,)).fetchone()
+    if row:
+        conn.execute("""INSERT INTO playtime_by_game (game_id, hours, sessions, last_played) VALUES (?, ?, ?, ?)
+                        ON CONFLICT (game_id) DO UPDATE SET hours = hours + excluded.hours,
+                                                            sessions = sessions + excluded.sessions,
+                                                            last_played = MAX(COALESCE(last_played, ''),
+                                                                              excluded.last_played)""",
+                     (into_id, *row))
+        conn.execute("DELETE FROM playtime_by_game WHERE game_id = ?", (from_id,))
+
+
+# Recompute both rollups from the full log (repair after manual edits)
+def rebuild_rollups(conn):
+    with conn:
+        conn.execute("DELETE FROM playtime_daily")
+        conn.execute("DELETE FROM playtime_by_game")
+        conn.execute("""INSERT INTO playtime_daily (day, hours, sessions)
+                        SELECT SUBSTR(started_at, 1, 10), SUM(duration), COUNT(*)
+                        FROM play_sessions GROUP BY SUBSTR(started_at, 1, 10)""")
+        conn.execute("""INSERT INTO playtime_by_game (game_id, hours, sessions, last_played)
+                        SELECT COALESCE(m.merged_into, s.game_id), SUM(s.duration), COUNT(*), MAX(s.started_at)
+                        FROM play_sessions AS s LEFT JOIN merged_games AS m ON m.game_id = s.game_id
+                        GROUP BY COALESCE(m.merged_into, s.game_id)""")
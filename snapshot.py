@@ -0,0 +1,151 @@
+import gc
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"GBLSNAP\x00"
+# Bump when the file layout or the formatted row layout changes
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sII")  # magic, format version, metadata length
+
+SEPARATOR = "\x1f"
+
+
+# Formatted list rows and id orderings from a previous session, in one file:
+#
+#   header | JSON metadata | ids (int64) | one int32 position array per view |
+#   None field indexes (int64) | UTF-8 fields
+#
+# The arrays are read straight out of a read-only memory map and the rows
+# are split out of the fields in one pass on first use, so a cold start
+# paints the list without running SQL or formatting a single date. The file
+# records the changelog checkpoint and game count it was written at; it is
+# only used while the database still has both.
+class ListSnapshot:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, meta_length = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Not a list snapshot: {path}")
+        meta = json.loads(self._map[HEADER.size:HEADER.size + meta_length])
+        base = _body_start(meta_length)
+
+        self.checkpoint = meta["checkpoint"]
+        self.games = meta["games"]
+        self.ids = np.frombuffer(self._map, dtype=np.int64, count=meta["ids"][1], offset=base + meta["ids"][0])
+        self.views = {tuple(key): np.frombuffer(self._map, dtype=np.int32, count=count, offset=base + offset)
+                      for key, offset, count in meta["views"]}
+        self._nulls = np.frombuffer(self._map, dtype=np.int64, count=meta["nulls"][1], offset=base + meta["nulls"][0])
+        self._text = (base + meta["text"][0], meta["text"][1])
+        self._width = meta["width"]
+        self._loaded = False
+
+    def matches(self, checkpoint, games):
+        return self.checkpoint == checkpoint and self.games == games
+
+    # Ids of a saved view; None when the view was not saved. The first call
+    # adds every game's row and search text to the given dicts.
+    def load_view(self, key, rows, search_texts):
+        positions = self.views.get(key)
+        if positions is None:
+            return None
+
+        if not self._loaded:
+            # Millions of new objects and none of them cyclic: collector passes would only cost time
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                offset, length = self._text
+                fields = self._map[offset:offset + length].decode("utf-8").split(SEPARATOR)
+                for index in self._nulls.tolist():
+                    fields[index] = None
+                ids = self.ids.tolist()
+                width = self._width
+                rows.update(zip(ids, zip(*(fields[column::width] for column in range(width - 1)))))
+                search_texts.update(zip(ids, fields[width - 1::width]))
+            finally:
+                if collecting:
+                    gc.enable()
+            self._loaded = True
+
+        return self.ids[positions].tolist()
+
+    def close(self):
+        self.ids = None
+        self.views = {}
+        self._nulls = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # An array still points into the map; it is released with it
+
+
+# Open the snapshot at `path` if it was written at this checkpoint and game
+# count; None when it is missing, unreadable or stale
+def load(path, checkpoint, games):
+    try:
+        snapshot = ListSnapshot(path)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    if not snapshot.matches(checkpoint, games):
+        snapshot.close()
+        return None
+    return snapshot
+
+
+def _body_start(meta_length):
+    end = HEADER.size + meta_length
+    return end + -end % 8
+
+
+def _field(value):
+    if value is None:
+        return ""
+    text = str(value)
+    if SEPARATOR in text:
+        raise ValueError("List value contains a snapshot separator")
+    return text
+
+
+# Write rows ({id: formatted row}), search texts ({id: text}) and views
+# ({(filter, sort, term): [id, ...]}) to `path`, replacing it atomically.
+# Raises ValueError for values that contain the separator characters.
+def save(path, rows, search_texts, views, checkpoint, games):
+    ids = np.array(sorted(rows), dtype=np.int64)
+    positions = {game_id: index for index, game_id in enumerate(ids.tolist())}
+    width = len(next(iter(rows.values()))) + 1
+    fields = [field for game_id in ids.tolist() for field in (*rows[game_id], search_texts[game_id])]
+    nulls = np.array([index for index, field in enumerate(fields) if field is None], dtype=np.int64)
+    text = SEPARATOR.join(map(_field, fields)).encode("utf-8")
+    view_arrays = [(list(key), np.array([positions[game_id] for game_id in view_ids], dtype=np.int32))
+                   for key, view_ids in views.items()]
+
+    # Array offsets are relative to the body, which starts 8-byte aligned after the metadata
+    body = []
+    offset = 0
+    arrays = [ids] + [array for _, array in view_arrays] + [nulls]
+    for data, alignment in [(array.tobytes(), 8) for array in arrays] + [(text, 1)]:
+        offset += -offset % alignment
+        body.append((offset, data))
+        offset += len(data)
+
+    meta = json.dumps({"checkpoint": checkpoint, "games": games, "width": width, "ids": [body[0][0], len(ids)],
+                       "views": [[key, view_offset, len(array)]
+                                 for (key, array), (view_offset, _) in zip(view_arrays, body[1:-2])],
+                       "nulls": [body[-2][0], len(nulls)], "text": [body[-1][0], len(text)]}).encode("utf-8")
+    base = _body_start(len(meta))
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)))
+        f.write(meta)
+        for data_offset, data in body:
+            f.write(b"\x00" * (base + data_offset - f.tell()))
+            f.write(data)
+    os.replace(temp_path, path)
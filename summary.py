@@ -0,0 +1,176 @@
+import contextlib
+
+STATUSES = ["Backlog", "Playing", "Completed"]
+
+SUMMARY_COLUMNS = ["games", "completed", "playtime", "rating_sum", "rating_count"]
+
+
+# JSON escapes applied (in order) to turn "a, b" into '["a"," b"]'
+JSON_ESCAPES = [("'\\'", "'\\\\'"), ("'\"'", "'\\\"'"), ("char(9)", "'\\t'"), ("char(10)", "'\\n'"),
+                ("char(13)", "'\\r'"), ("','", "'\",\"'")]
+
+# Whitespace str.strip() removes around a tag
+WHITESPACE = "char(32, 9, 10, 11, 12, 13)"
+
+
+# Tags of a comma separated column (genre / platform) as rows of json_each,
+# split the same way analytics.TagIndex splits them. Values that still do
+# not make valid JSON count as a single tag rather than failing the write
+# that fired the trigger.
+def _tags(column):
+    escaped = f"COALESCE({column}, '')"
+    for old, new in JSON_ESCAPES:
+        escaped = f"REPLACE({escaped}, {old}, {new})"
+    as_json = f"""'["' || {escaped} || '"]'"""
+    return f"json_each(CASE WHEN json_valid({as_json}) THEN {as_json} ELSE json_array({column}) END)"
+
+
+# Every (dimension, value) a games row counts towards
+def _keys(row):
+    return f"""SELECT 'all' AS dimension, '' AS value
+               UNION ALL SELECT 'status', COALESCE({row}.status, '')
+               UNION ALL SELECT 'genre', TRIM(value, {WHITESPACE})
+                                 FROM {_tags(f'{row}.genre')} WHERE TRIM(value, {WHITESPACE}) != ''
+               UNION ALL SELECT 'platform', TRIM(value, {WHITESPACE})
+                                 FROM {_tags(f'{row}.platform')} WHERE TRIM(value, {WHITESPACE}) != ''"""
+
+
+# Add (sign=1) or remove (sign=-1) one row's contribution
+def _apply(row, sign):
+    return f"""INSERT INTO game_summary (dimension, value, games, completed, playtime, rating_sum, rating_count)
+               SELECT dimension, value, {sign}, {sign} * ({row}.status IS 'Completed'),
+                      {sign} * COALESCE({row}.playtime, 0),
+                      {sign} * (CASE WHEN COALESCE({row}.rating, 0) > 0 THEN {row}.rating ELSE 0 END),
+                      {sign} * (COALESCE({row}.rating, 0) > 0)
+               FROM ({_keys(row)}) WHERE 1
+               ON CONFLICT (dimension, value) DO UPDATE SET games = games + excluded.games,
+                                                            completed = completed + excluded.completed,
+                                                            playtime = playtime + excluded.playtime,
+                                                            rating_sum = rating_sum + excluded.rating_sum,
+                                                            rating_count = rating_count + excluded.rating_count;"""
+
+
+# Exact totals for the whole table (or the rows matching `condition`), computed from scratch
+def _expected(condition="1"):
+    totals = """COUNT(*), TOTAL(g.status IS 'Completed'), TOTAL(COALESCE(g.playtime, 0)),
+                TOTAL(CASE WHEN COALESCE(g.rating, 0) > 0 THEN g.rating ELSE 0 END), TOTAL(COALESCE(g.rating, 0) > 0)"""
+    tag_queries = [f"""SELECT '{column}', TRIM(t.value, {WHITESPACE}), {totals}
+                       FROM games AS g, {_tags(f'g.{column}')} AS t
+                       WHERE {condition} AND TRIM(t.value, {WHITESPACE}) != '' GROUP BY 2"""
+                   for column in ("genre", "platform")]
+    return " UNION ALL ".join([f"SELECT 'all', '', {totals} FROM games AS g WHERE {condition}",
+                               f"""SELECT 'status', COALESCE(g.status, ''), {totals} FROM games AS g
+                                   WHERE {condition} GROUP BY 2"""]
+                              + tag_queries)
+
+
+# Dashboard aggregates kept exact by triggers on games: one row for the
+# whole library ('all'), one per status, genre and platform. Every
+# dashboard number is then a primary-key lookup, however big games gets.
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS game_summary (
+       dimension TEXT NOT NULL,
+       value TEXT NOT NULL,
+       games INTEGER NOT NULL DEFAULT 0,
+       completed INTEGER NOT NULL DEFAULT 0,
+       playtime REAL NOT NULL DEFAULT 0,
+       rating_sum REAL NOT NULL DEFAULT 0,
+       rating_count INTEGER NOT NULL DEFAULT 0,
+       PRIMARY KEY (dimension, value)) WITHOUT ROWID''',
+    f'''CREATE TRIGGER IF NOT EXISTS game_summary_insert AFTER INSERT ON games
+        BEGIN
+            {_apply('NEW', 1)}
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS game_summary_delete AFTER DELETE ON games
+        BEGIN
+            {_apply('OLD', -1)}
+        END''',
+    # Only edits to summarized columns pay for the trigger (not date_modified bumps)
+    f'''CREATE TRIGGER IF NOT EXISTS game_summary_update AFTER UPDATE OF status, genre, platform, playtime, rating
+        ON games
+        BEGIN
+            {_apply('OLD', -1)}
+            {_apply('NEW', 1)}
+        END''',
+]
+
+
+# Create the summary table and triggers; fills it when it is new
+def init_summary(conn):
+    created = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'game_summary'").fetchone()
+    for statement in SCHEMA:
+        conn.execute(statement)
+    if not created:
+        rebuild_summary(conn)
+
+
+# For bulk inserts: inside one transaction, drop the per-row insert trigger,
+# then add every row inserted in the block with one aggregate pass and put
+# the trigger back. A failure rolls the DDL back with the rows.
+@contextlib.contextmanager
+def bulk_insert(conn):
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM games").fetchone()[0]
+    conn.execute("DROP TRIGGER IF EXISTS game_summary_insert")
+    yield
+    conn.execute(f"""INSERT INTO game_summary (dimension, value, {', '.join(SUMMARY_COLUMNS)})
+                     SELECT * FROM ({_expected('g.id > ?')}) WHERE 1
+                     ON CONFLICT (dimension, value) DO UPDATE SET
+                         {', '.join(f'{column} = {column} + excluded.{column}' for column in SUMMARY_COLUMNS)}""",
+                 (last_id,) * 4)
+    conn.execute(SCHEMA[1])
+
+
+# Recompute the summary from the games table (repair after manual edits)
+def rebuild_summary(conn):
+    with conn:
+        conn.execute("DELETE FROM game_summary")
+        conn.execute(f"INSERT INTO game_summary (dimension, value, {', '.join(SUMMARY_COLUMNS)}) {_expected()}")
+
+
+# Rows whose stored totals differ from a fresh computation:
+# [(dimension, value, stored, expected), ...]; empty when the summary is exact
+def verify_summary(conn, tolerance=1e-6):
+    stored = {(row[0], row[1]): row[2:] for row in conn.execute(
+        f"SELECT dimension, value, {', '.join(SUMMARY_COLUMNS)} FROM game_summary WHERE games != 0")}
+    expected = {(row[0], row[1]): row[2:] for row in conn.execute(_expected())}
+
+    mismatches = []
+    for key in sorted(set(stored) | set(expected)):
+        have = stored.get(key, (0,) * len(SUMMARY_COLUMNS))
+        want = expected.get(key, (0,) * len(SUMMARY_COLUMNS))
+        if any(abs(a - b) > tolerance for a, b in zip(have, want)):
+            mismatches.append((key[0], key[1], have, want))
+    return mismatches
+
+
+def _row(conn, dimension, value):
+    row = conn.execute(f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM game_summary WHERE dimension = ? AND value = ?",
+                       (dimension, value)).fetchone()
+    return dict(zip(SUMMARY_COLUMNS, row or (0,) * len(SUMMARY_COLUMNS)))
+
+
+# Library-wide totals: games, completed, playtime, rating_sum, rating_count
+def totals(conn):
+    return _row(conn, "all", "")
+
+
+# Number of games per status, in STATUSES order
+def status_counts(conn):
+    counts = dict(conn.execute("SELECT value, games FROM game_summary WHERE dimension = 'status'"))
+    return {status: counts.get(status, 0) for status in STATUSES}
+
+
+# Average of the rated games (unrated games have rating 0)
+def average_rating(conn):
+    row = totals(conn)
+    return row["rating_sum"] / row["rating_count"] if row["rating_count"] else 0.0
+
+
+# [(tag, games, completed, completion rate), ...] for 'genre' or 'platform', most games first
+def top_tags(conn, dimension, limit=None):
+    rows = conn.execute("""SELECT value, games, completed FROM game_summary
+                           WHERE dimension = ? AND games > 0 ORDER BY games DESC, value LIMIT ?""",
+                        (dimension, -1 if limit is None else limit)).fetchall()
+    return [(value, games, completed, completed / games) for value, games, completed in rows]
@@ -0,0 +1,294 @@
+import csv
+import datetime
+import json
+import os
+
+import dedupe
+
+# Columns written by exports, in table order
+EXPORT_COLUMNS = ["id", "name", "status", "release_date", "rating", "image_url", "platform", "genre",
+                  "playtime", "notes", "date_added", "date_modified", "rawg_id", "slug"]
+
+# Columns accepted on import; "name" and "status" are required
+IMPORT_COLUMNS = ["name", "status", "release_date", "rating", "image_url", "platform", "genre", "playtime", "notes",
+                  "rawg_id", "slug"]
+REQUIRED_COLUMNS = ["name", "status"]
+DEFAULTS = {"release_date": "N/A", "rating": 0.0, "image_url": "", "platform": "", "genre": "",
+            "playtime": 0.0, "notes": ""}
+
+BATCH_SIZE = 5000
+
+
+# Coerce a numeric field; typed formats pass numbers straight through
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Text formats give the RAWG id as a string (or empty)
+def _rawg_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Row of IMPORT_COLUMNS + date_added, date_modified, name_key for a dict record, with defaults filled in
+def normalize_record(record, current_date):
+    values = {column: record.get(column, DEFAULTS.get(column)) for column in IMPORT_COLUMNS}
+    for column in DEFAULTS:
+        if values[column] is None:
+            values[column] = DEFAULTS[column]
+    values["rating"] = _number(values["rating"])
+    values["playtime"] = _number(values["playtime"])
+    values["rawg_id"] = _rawg_id(values["rawg_id"])
+    return [values[column] for column in IMPORT_COLUMNS] + [current_date, current_date, dedupe.name_key(values["name"])]
+
+
+# Insert normalized rows, ignoring ones the unique index rejects; returns the number inserted
+def insert_rows(conn, rows):
+    return conn.executemany(f"""INSERT OR IGNORE INTO games
+                                ({', '.join(IMPORT_COLUMNS)}, date_added, date_modified, name_key)
+                                VALUES ({', '.join('?' * (len(IMPORT_COLUMNS) + 3))})""", rows).rowcount
+
+
+def existing_names(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM games")}
+
+
+# Insert dict records in batches, skipping names that already exist (and,
+# once dedupe has added its unique index, rows with the same normalized name
+# and release year).
+# Returns (imported, skipped).
+def import_records(conn, records):
+    current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+    existing = existing_names(conn)
+
+    imported = 0
+    skipped = 0
+    batch = []
+
+    def write_batch():
+        nonlocal imported, skipped
+        inserted = insert_rows(conn, batch)
+        imported += inserted
+        skipped += len(batch) - inserted
+        batch.clear()
+
+    with conn:
+        for record in records:
+            name = record.get("name")
+            if not name or name in existing:
+                skipped += 1
+                continue
+            existing.add(name)
+
+            batch.append(normalize_record(record, current_date))
+            if len(batch) >= BATCH_SIZE:
+                write_batch()
+
+        if batch:
+            write_batch()
+
+    return imported, skipped
+
+
+def _check_columns(columns):
+    for column in REQUIRED_COLUMNS:
+        if column not in columns:
+            raise ValueError(f"Required column '{column}' not found")
+
+
+def _select_rows(conn):
+    return conn.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM games")
+
+
+# CSV. write_csv/parse_csv work on open text streams (stdin/stdout for the CLI).
+def write_csv(conn, file):
+    count = 0
+    writer = csv.writer(file)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in _select_rows(conn):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def export_csv(conn, file_path):
+    with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+        return write_csv(conn, csvfile)
+
+
+def parse_csv(file):
+    reader = csv.reader(file)
+    try:
+        header = [column.lower() for column in next(reader)]
+    except StopIteration:
+        raise ValueError("CSV file is empty")
+    _check_columns(header)
+
+    for row in reader:
+        yield dict(zip(header, row))
+
+
+def read_csv(file_path):
+    with open(file_path, "r", encoding="utf-8", newline="") as file:
+        yield from parse_csv(file)
+
+
+def import_csv(conn, file_path):
+    return import_records(conn, read_csv(file_path))
+
+
+# JSON Lines: one typed object per line, no text-to-number parsing
+def write_jsonl(conn, file):
+    count = 0
+    for row in _select_rows(conn):
+        file.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def export_jsonl(conn, file_path):
+    with open(file_path, "w", encoding="utf-8") as file:
+        return write_jsonl(conn, file)
+
+
+def parse_jsonl(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_jsonl(file_path):
+    with open(file_path, "r", encoding="utf-8") as file:
+        yield from parse_jsonl(file)
+
+
+def import_jsonl(conn, file_path):
+    return import_records(conn, read_jsonl(file_path))
+
+
+# Parquet: columnar, typed and compressed (requires pyarrow)
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet support requires the 'pyarrow' package")
+    return pyarrow
+
+
+PARQUET_TYPES = {"id": "int64", "rating": "float64", "playtime": "float64", "rawg_id": "int64"}
+
+
+def export_parquet(conn, file_path):
+    pa = _pyarrow()
+    schema = pa.schema([(column, getattr(pa, PARQUET_TYPES.get(column, "string"))())
+                        for column in EXPORT_COLUMNS])
+
+    count = 0
+    cursor = _select_rows(conn)
+    with pa.parquet.ParquetWriter(file_path, schema, compression="zstd") as writer:
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            writer.write_batch(pa.record_batch([pa.array(column, type=field.type)
+                                                for column, field in zip(columns, schema)], schema=schema))
+            count += len(rows)
+    return count
+
+
+def read_parquet(file_path):
+    pa = _pyarrow()
+    parquet_file = pa.parquet.ParquetFile(file_path)
+    _check_columns(parquet_file.schema_arrow.names)
+    for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE):
+        yield from batch.to_pylist()
+
+
+def import_parquet(conn, file_path):
+    return import_records(conn, read_parquet(file_path))
+
+
+# SQLite: copy the whole database, or merge another games.db in one statement
+def export_sqlite(conn, file_path):
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    conn.execute("VACUUM INTO ?", (file_path,))
+    return conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+
+def import_sqlite(conn, file_path):
+    conn.execute("ATTACH DATABASE ? AS source", (file_path,))
+    try:
+        source_total = conn.execute("SELECT COUNT(*) FROM source.games").fetchone()[0]
+        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        # Older databases may predate some columns (rawg_id, slug)
+        source_columns = {row[1] for row in conn.execute("PRAGMA source.table_info(games)")}
+        columns = ", ".join(column for column in IMPORT_COLUMNS if column in source_columns)
+        dedupe.register_functions(conn)
+
+        with conn:
+            # Same rule as the other formats: names already in the library are skipped,
+            # and the first row wins when the source itself has duplicates
+            cursor = conn.execute(f"""INSERT OR IGNORE INTO main.games ({columns}, date_added, date_modified, name_key)
+                                      SELECT {columns}, COALESCE(date_added, :today), COALESCE(date_modified, :today),
+                                             dedupe_name_key(name)
+                                      FROM source.games
+                                      WHERE id IN (SELECT MIN(id) FROM source.games
+                                                   WHERE name IS NOT NULL AND name != '' GROUP BY name)
+                                        AND name NOT IN (SELECT name FROM main.games WHERE name IS NOT NULL)""",
+                                  {"today": current_date})
+            imported = cursor.rowcount
+    finally:
+        conn.execute("DETACH DATABASE source")
+
+    return imported, source_total - imported
+
+
+# Registry of formats by file extension: (label, exporter, importer)
+FORMATS = {}
+
+
+def register_format(extension, label, exporter=None, importer=None):
+    FORMATS[extension.lower()] = (label, exporter, importer)
+
+
+register_format(".csv", "CSV Files", export_csv, import_csv)
+register_format(".jsonl", "JSON Lines", export_jsonl, import_jsonl)
+register_format(".parquet", "Parquet Files", export_parquet, import_parquet)
+register_format(".db", "SQLite Database", export_sqlite, import_sqlite)
+
+# Formats that can be streamed through stdin/stdout: name -> (writer, parser)
+STREAM_FORMATS = {"csv": (write_csv, parse_csv), "jsonl": (write_jsonl, parse_jsonl)}
+
+
+def _handler(file_path, position):
+    extension = os.path.splitext(file_path)[1].lower()
+    handler = FORMATS.get(extension, FORMATS[".csv"])[position]
+    if handler is None:
+        raise ValueError(f"Unsupported file type: {extension}")
+    return handler
+
+
+# Export the games table to file_path, picking the format from its extension
+def export_games(conn, file_path):
+    return _handler(file_path, 1)(conn, file_path)
+
+
+# Import file_path into the games table; returns (imported, skipped)
+def import_games(conn, file_path):
+    return _handler(file_path, 2)(conn, file_path)
+
+
+# File dialog filetypes for every registered format
+def filetypes(export=False):
+    position = 1 if export else 2
+    types = [(entry[0], f"*{extension}") for extension, entry in FORMATS.items() if entry[position]]
+    return types + [("All Files", "*.*")]
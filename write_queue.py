@@ -0,0 +1,114 @@
+import atexit
+import datetime
+import sqlite3
+import threading
+
+import sessions
+
+
+# Default scheduler: run callback after delay_ms on a timer thread
+def timer_schedule(delay_ms, callback):
+    timer = threading.Timer(delay_ms / 1000, callback)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+# Write-behind queue for small per-game edits (status changes, playtime).
+# Edits to the same row are coalesced and committed together in a single
+# transaction a short time after the first one arrives. Pending edits are
+# also flushed at interpreter exit.
+class WriteBehindQueue:
+    def __init__(self, db_path="games.db", delay_ms=300, schedule=timer_schedule, on_flush=None):
+        self.db_path = db_path
+        self.delay_ms = delay_ms
+        self.schedule = schedule
+        self.on_flush = on_flush
+        self.lock = threading.Lock()
+
+        self.fields = {}    # game_id -> {column: value}, last write wins
+        self.playtime = {}  # game_id -> hours to add, summed
+        self.sessions = []  # (game_id, hours, started_at), one per logged session
+        self.scheduled = False
+
+        atexit.register(self.flush)
+
+    def _schedule_flush(self):
+        if not self.scheduled:
+            self.scheduled = True
+            self.schedule(self.delay_ms, self.flush)
+
+    # Queue column updates for one or more games
+    def set_fields(self, game_ids, **fields):
+        with self.lock:
+            for game_id in game_ids:
+                self.fields.setdefault(int(game_id), {}).update(fields)
+            self._schedule_flush()
+
+    # Queue playtime to be added to one or more games, logging a play session for each
+    def add_playtime(self, game_ids, hours):
+        started_at = datetime.datetime.now()
+        with self.lock:
+            for game_id in game_ids:
+                game_id = int(game_id)
+                self.playtime[game_id] = self.playtime.get(game_id, 0) + hours
+                self.sessions.append((game_id, hours, started_at))
+            self._schedule_flush()
+
+    # Hours queued for a game but not yet written
+    def pending_playtime(self, game_id):
+        with self.lock:
+            return self.playtime.get(int(game_id), 0)
+
+    def has_pending(self):
+        with self.lock:
+            return bool(self.fields or self.playtime)
+
+    # Write every pending edit in one transaction
+    def flush(self):
+        with self.lock:
+            fields, self.fields = self.fields, {}
+            playtime, self.playtime = self.playtime, {}
+            logged, self.sessions = self.sessions, []
+            self.scheduled = False
+
+        if not fields and not playtime:
+            return 0
+
+        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        game_ids = set(fields) | set(playtime)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                for game_id in game_ids:
+                    updates = dict(fields.get(game_id, {}))
+                    assignments = [f"{column} = ?" for column in updates]
+                    params = list(updates.values())
+
+                    if game_id in playtime:
+                        assignments.append("playtime = COALESCE(playtime, 0) + ?")
+                        params.append(playtime[game_id])
+
+                    assignments.append("date_modified = ?")
+                    params.extend([current_date, game_id])
+
+                    conn.execute(f"UPDATE games SET {', '.join(assignments)} WHERE id = ?", params)
+
+                for game_id, hours, started_at in logged:
+                    sessions.log_session(conn, game_id, hours, started_at)
+        except sqlite3.Error:
+            # Put the edits back so the next flush retries them
+            with self.lock:
+                for game_id, updates in fields.items():
+                    self.fields[game_id] = {**updates, **self.fields.get(game_id, {})}
+                for game_id, hours in playtime.items():
+                    self.playtime[game_id] = self.playtime.get(game_id, 0) + hours
+                self.sessions[:0] = logged
+            raise
+        finally:
+            conn.close()
+
+        if self.on_flush:
+            self.on_flush(game_ids)
+        return len(game_ids)